@@ -4,12 +4,15 @@ Wedding Management System with Beautiful UI.
 Includes per-card Reset for ingredients and invitees, enhanced metrics, and pretty menus.
 """
 
+import json
 import os
-import time
-from typing import List, Dict
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from core import startup  # first, so the cold-start clock covers the imports below
 
-import pandas as pd
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
 from config import (
     APP_TITLE,
@@ -18,8 +21,30 @@ from config import (
     INVITEE_LISTS,
     DELIVERY_STATUS,
     TRAVEL_OPTIONS,
+    MENU_CATEGORIES,
+    COUNTER_FLUSH_IDLE_SECONDS,
+    DATA_WATCH_ENV_VAR,
+    DIAGNOSTICS_ENV_VAR,
+    DIAGNOSTICS_QUERY_PARAM,
+    METRICS_FILE_ENV_VAR,
+    METRICS_PORT_ENV_VAR,
+    UPLOAD_POLL_SECONDS,
+    UPLOAD_PREVIEW_ROWS,
+)
+from core import (
+    coalesce,
+    ingest,
+    instrumentation,
+    log,
+    metrics,
+    prebuilt,
+    profiler,
+    reports,
+    upload,
+    watcher,
 )
-from database import WeddingDatabase
+from core.menu import Dish, parse_menu
+from core.storage import WeddingDatabase
 from utils import (
     render_header,
     render_footer,
@@ -30,10 +55,12 @@ from utils import (
     validate_ingredient_input,
     validate_invitee_input,
     format_quantity_display,
-    render_metric_box,
+    render_metrics_panel,
     render_wedding_theme_background,
 )
 
+startup.mark("imports")
+
 # ---------------------------------------------------------------------
 # Streamlit page config
 # ---------------------------------------------------------------------
@@ -44,236 +71,140 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# ---------------------------------------------------------------------
+# Rerun profiling: named sections are timed and their widgets counted
+# ---------------------------------------------------------------------
+def widgets_this_run() -> int:
+    ctx = get_script_run_ctx()
+    ids = getattr(getattr(ctx, "shared", ctx), "widget_ids_this_run", None)
+    if ids is None:
+        return 0
+    return len(ids.snapshot()) if hasattr(ids, "snapshot") else len(ids)
+
+
+st.session_state["rerun_profile"] = profiler.begin_rerun(
+    widgets_this_run,
+    capture=st.session_state.pop("profile_next_rerun", False),
+    previous=st.session_state.pop("rerun_profile", None),
+)
+
+
+@contextmanager
+def app_section(name: str) -> Iterator[None]:
+    """Time a part of the page and attribute its database calls to it."""
+    instrumentation.set_scope(name)
+    with st.session_state["rerun_profile"].section(name):
+        yield
+
+
 # ---------------------------------------------------------------------
 # Database init (cached)
 # ---------------------------------------------------------------------
+logger = log.get_logger("app")
+
+
+@st.cache_resource
+def start_logging() -> None:
+    """JSON-lines logs via a background queue listener (see core.log)."""
+    log.setup()
+
+
+start_logging()
+
+
+@st.cache_resource
+def prepare_database() -> prebuilt.Prepared:
+    """Install the prebuilt database if it matches data/ (see core.prebuilt)."""
+    return prebuilt.prepare()
+
+
+prepared = prepare_database()
+
+
 @st.cache_resource
-def init_db() -> WeddingDatabase:
-    return WeddingDatabase()
+def init_db() -> instrumentation.InstrumentedDatabase:
+    return instrumentation.instrument(WeddingDatabase())
 
 
 db = init_db()
 
+
+@st.cache_resource
+def start_metrics_exporter() -> None:
+    """Prometheus /metrics side port and/or text file, if configured."""
+    port = os.environ.get(METRICS_PORT_ENV_VAR)
+    path = os.environ.get(METRICS_FILE_ENV_VAR)
+    if not port and not path:
+        return
+    # Unwrapped database: scrapes should not show up in the call statistics
+    metrics.register_collector(metrics.event_collector(WeddingDatabase()))
+    try:
+        if port:
+            metrics.start_http_server(int(port))
+        if path:
+            metrics.start_file_writer(path)
+    except (OSError, ValueError) as e:
+        logger.error("starting metrics exporter failed: %s", e)
+
+
+start_metrics_exporter()
+
+# Count this rerun's database calls (closing the previous one if st.rerun()
+# cut it short); tabs below attribute their calls with set_scope().
+st.session_state["diagnostics_run"] = instrumentation.begin_run(
+    st.session_state.pop("diagnostics_run", None)
+)
+
 # ---------------------------------------------------------------------
 # Theme
 # ---------------------------------------------------------------------
-render_wedding_theme_background()
-render_header()
+with app_section("Header"):
+    render_wedding_theme_background()
+    render_header()
+startup.mark("first_paint")
 
 # ---------------------------------------------------------------------
-# CSV mappings
+# One-time CSV -> DB load (cached)
 # ---------------------------------------------------------------------
-csv_files_ingredients = {
-    "Local-List": "data/ingredients/Local-List.csv",
-    "Reception-Raasan": "data/ingredients/Reception-Raasan.csv",
-    "Reception-Tent": "data/ingredients/Reception-Tent.csv",
-    "Reception-Extras": "data/ingredients/Reception-Extras.csv",
-    "Reception-Pakoda": "data/ingredients/Reception-Pakoda.csv",
-    "Reception-Coffee": "data/ingredients/Reception-Coffee.csv",
-    "Home-Raasan": "data/ingredients/Home-Raasan.csv",
-    "Home-Dessert": "data/ingredients/Home-Dessert.csv",
-    "Home-Tent": "data/ingredients/Home-Tent.csv",
-}
+@st.cache_resource
+def load_initial_data() -> None:
+    """Load CSV files into SQLite once per deployment, unless already there."""
+    if prepared.state != "stale":
+        return
+    results = ingest.load_initial_data(
+        db, on_error=lambda path, e: st.warning(f"Could not load {path}: {e}")
+    )
+    if all(results.values()):
+        prebuilt.stamp(db.db_path, prepared.fingerprint)
 
-csv_files_invitees = {
-    "Invitee-List-Poite-03.12.25": "data/invitees/Invitee-List-Poite-03.12.25.csv",
-    "Invitee-List-Barati-05.12.25": "data/invitees/Invitee-List-Barati-05.12.25.csv",
-    "Invitee-List-Boubhaat-07.12.25": "data/invitees/Invitee-List-Boubhaat-07.12.25.csv",
-    "Invitee-List-Return-06.12.25": "data/invitees/Invitee-List-Return-06.12.25.csv",
-}
 
-menu_csv = "data/menus/Menus-List.csv"
+with app_section("Data load"):
+    load_initial_data()
+
 
-# ---------------------------------------------------------------------
-# One-time CSV -> DB load (cached)
-# ---------------------------------------------------------------------
 @st.cache_resource
-def load_initial_data() -> None:
-    """Load CSV files into SQLite once per deployment."""
-    # Ingredients
-    for list_name, path in csv_files_ingredients.items():
-        if os.path.exists(path):
-            try:
-                df = pd.read_csv(path)
-                df.columns = df.columns.str.strip()
-                db.load_ingredient_list(list_name, df)
-                time.sleep(0.05)
-            except Exception as e:
-                st.warning(f"Could not load {path}: {e}")
-
-    # Invitees
-    for list_name, path in csv_files_invitees.items():
-        if os.path.exists(path):
-            try:
-                df = pd.read_csv(path)
-                df.columns = df.columns.str.strip()
-                db.load_invitee_list(list_name, df)
-                time.sleep(0.05)
-            except Exception as e:
-                st.warning(f"Could not load {path}: {e}")
-
-    # Menus
-    if os.path.exists(menu_csv):
-        try:
-            df = pd.read_csv(menu_csv)
-            df.columns = df.columns.str.strip()
-            db.load_menu_data(df)
-        except Exception as e:
-            st.warning(f"Could not load {menu_csv}: {e}")
+def start_data_watcher() -> Optional[watcher.DataWatcher]:
+    """Re-ingest CSVs edited in data/ while the app runs (WEDDING_WATCH_DATA=1)."""
+    if os.environ.get(DATA_WATCH_ENV_VAR) != "1":
+        return None
+    return watcher.DataWatcher(db).start()
 
 
-load_initial_data()
+data_watcher = start_data_watcher()
 
 # ---------------------------------------------------------------------
 # MENU helper functions
 # ---------------------------------------------------------------------
-VEG_KEYWORDS = [
-    "paneer",
-    "mushroom",
-    "veg",
-    "sabji",
-    "dal",
-    "daal",
-    "bhaat",
-    "rice",
-    "saag",
-    "kophi",
-    "gobi",
-    "chutney",
-    "salad",
-    "upma",
-    "luchi",
-    "puri",
-    "roti",
-    "jeera rice",
-    "palak",
-    "mix veg",
-    "gulab jamun",
-    "paayesh",
-    "payesh",
-    "halwa",
-    "rosogolla",
-    "ice cream",
-    "jalebi",
-    "dahi vada",
-    "manchurian",
-    "papdi chat",
-    "veg cutlet",
-    "snacks",
-    "desserts",
-]
-
-NONVEG_KEYWORDS = [
-    "chicken",
-    "fish",
-    "macher",
-    "maacher",
-    "egg",
-    "mutton",
-    "pakoda",
-]
-
-
-def split_menu_items(raw: str) -> List[str]:
-    if not raw:
-        return []
-    parts: List[str] = []
-    for line in str(raw).splitlines():
-        for piece in line.split(","):
-            item = piece.strip()
-            if item:
-                parts.append(item)
-    return parts
-
-
-def detect_veg_flag(item: str) -> str:
-    name = item.lower()
-    if any(k in name for k in NONVEG_KEYWORDS):
-        return "non-veg"
-    if any(k in name for k in VEG_KEYWORDS):
-        return "veg"
-    return "veg"
-
-
-def classify_menu_item(item: str) -> str:
-    name = item.lower()
-    if any(k in name for k in ["jalebi", "halwa", "rosogolla", "ice cream", "payesh", "paayesh", "dessert"]):
-        return "Desserts"
-    if any(
-        k in name
-        for k in [
-            "snacks",
-            "chowmein",
-            "manchurian",
-            "pakoda",
-            "pani puri",
-            "papdi chat",
-            "cutlet",
-            "starter",
-        ]
-    ):
-        return "Starters"
-    if any(
-        k in name
-        for k in [
-            "salad",
-            "chutney",
-            "papad",
-            "dahi vada",
-            "fruit",
-            "sides",
-        ]
-    ):
-        return "Sides"
-    if any(k in name for k in ["roti", "puri", "palak puri", "bread"]):
-        return "Breads"
-    if any(
-        k in name
-        for k in [
-            "chicken",
-            "fish",
-            "macher",
-            "maacher",
-            "rice",
-            "jeera rice",
-            "kofta",
-            "matar paneer",
-            "dal fry",
-        ]
-    ):
-        return "Main course"
-    return "Sabjis"
-
-
-def build_menu_structure(raw: str) -> Dict[str, List[Dict[str, str]]]:
-    items = split_menu_items(raw)
-    menu_struct: Dict[str, List[Dict[str, str]]] = {
-        "Main course": [],
-        "Sabjis": [],
-        "Starters": [],
-        "Breads": [],
-        "Desserts": [],
-        "Sides": [],
-    }
-    for item in items:
-        category = classify_menu_item(item)
-        veg_flag = detect_veg_flag(item)
-        menu_struct.setdefault(category, []).append(
-            {"name": item, "veg_flag": veg_flag}
-        )
-    return menu_struct
-
-
 def render_menu_item_row(
     category: str,
     idx: int,
-    item: Dict[str, str],
+    item: Dish,
     date: str,
     meal: str,
     menu_items_list: List[str],
 ) -> None:
-    icon = "🟢" if item["veg_flag"] == "veg" else "🔴"
-    label = f"{icon} {item['name']}"
+    icon = "🟢" if item.veg_flag == "veg" else "🔴"
+    label = f"{icon} {item.name}"
 
     col1, col2, col3 = st.columns([6, 1, 1])
     with col1:
@@ -296,21 +227,9 @@ def render_menu_item_row(
             key=f"btn_del_{category}_{idx}_{date}_{meal}",
             help="Delete item",
         ):
-            original = item["name"]
+            original = item.name
             menu_items_list[:] = [x for x in menu_items_list if x != original]
-            updated_raw = ", ".join(menu_items_list)
-            conn = db.get_connection()
-            cur = conn.cursor()
-            cur.execute(
-                """
-                UPDATE menus
-                SET menu_items = ?
-                WHERE date = ? AND meal = ?
-                """,
-                (updated_raw, date, meal),
-            )
-            conn.commit()
-            conn.close()
+            db.update_menu_items(date, meal, ", ".join(menu_items_list))
             st.rerun()
 
     if st.session_state.get(edit_key):
@@ -318,7 +237,7 @@ def render_menu_item_row(
         with ec1:
             new_name = st.text_input(
                 "New name",
-                value=item["name"],
+                value=item.name,
                 key=new_name_key,
             )
         with ec2:
@@ -326,39 +245,468 @@ def render_menu_item_row(
                 "Save",
                 key=f"btn_save_{category}_{idx}_{date}_{meal}",
             ):
-                original = item["name"]
+                original = item.name
                 for i, v in enumerate(menu_items_list):
                     if v == original:
                         menu_items_list[i] = new_name
                         break
-                updated_raw = ", ".join(menu_items_list)
-                conn = db.get_connection()
-                cur = conn.cursor()
-                cur.execute(
-                    """
-                    UPDATE menus
-                    SET menu_items = ?
-                    WHERE date = ? AND meal = ?
-                    """,
-                    (updated_raw, date, meal),
-                )
-                conn.commit()
-                conn.close()
+                db.update_menu_items(date, meal, ", ".join(menu_items_list))
                 st.session_state[edit_key] = False
                 st.rerun()
 
 
+# ---------------------------------------------------------------------
+# Counter click coalescing
+# ---------------------------------------------------------------------
+def pending_counter_deltas() -> coalesce.PendingDeltas:
+    return st.session_state.setdefault(
+        "pending_counter_deltas", coalesce.PendingDeltas()
+    )
+
+
+def queue_counter_delta(
+    list_name: str, name: str, field: str, delta: int, error: str = ""
+) -> None:
+    """Button callback: buffer a ➕/➖ click instead of writing it."""
+    if error:
+        st.session_state["counter_error"] = error
+    else:
+        pending_counter_deltas().add((list_name, name, field), delta)
+
+
+def counter_refusal(
+    list_name: str, name: str, field: str, delta: int, error
+) -> str:
+    """Why the database refused a buffered counter change."""
+    prefix = f"Could not apply {delta:+d} to {field} for {name}: "
+    if error is not None:
+        return prefix + f"database error ({error}). Please try again."
+    if db.get_invitee(list_name, name) is None:
+        return prefix + "the guest is no longer on this list."
+    return prefix + (
+        "the count would go out of range (lunch at least 1, bus + car at most "
+        "To SAKTI), possibly after a change by someone else."
+    )
+
+
+def flush_counter_deltas() -> bool:
+    """
+    Write all buffered clicks, one combined delta per counter. Returns
+    False if the database refused any of them.
+    """
+    seen = seen_guest_versions()
+    applied = True
+    for (list_name, name, field), delta, value, error in coalesce.flush(
+        db, pending_counter_deltas()
+    ):
+        if value is None:
+            applied = False
+            st.session_state["counter_error"] = counter_refusal(
+                list_name, name, field, delta, error
+            )
+        elif (list_name, name) in seen:
+            # Our own write: the row the user is looking at is still current
+            seen[(list_name, name)] += 1
+    return applied
+
+
+def autoflush_counter_deltas() -> None:
+    """
+    Flush once the clicks pause. A refused change reruns the whole app: a
+    fragment rerun would neither show the error nor replace the optimistic
+    value with the stored one.
+    """
+    if pending_counter_deltas().is_due(COUNTER_FLUSH_IDLE_SECONDS):
+        if not flush_counter_deltas():
+            st.rerun(scope="app")
+
+
+def render_counter_autoflush() -> None:
+    """While clicks are buffered, poll for the idle window and then flush."""
+    fragment = getattr(st, "fragment", None)
+    if not len(pending_counter_deltas()):
+        return
+    if fragment is None:
+        if pending_counter_deltas().is_due(COUNTER_FLUSH_IDLE_SECONDS):
+            flush_counter_deltas()
+        return
+
+    fragment(run_every=COUNTER_FLUSH_IDLE_SECONDS)(autoflush_counter_deltas)()
+
+
+# ---------------------------------------------------------------------
+# Write conflicts (row versions)
+# ---------------------------------------------------------------------
+def seen_guest_versions() -> dict:
+    """(list_name, guest name) -> row version shown on the last render."""
+    return st.session_state.setdefault("seen_guest_versions", {})
+
+
+def save_ingredient_qty(
+    row_key: str, list_name: str, item_name: str, unit: str, expected_version,
+    quantity: Optional[float] = None,
+) -> None:
+    """
+    Write a quantity edit unless the row changed since it was opened. The
+    quantity is read from the editor's widget state, which is already
+    updated when the callback runs; `quantity` overrides it.
+    """
+    if quantity is None:
+        quantity = float(st.session_state[f"new_qty_val_{row_key}"])
+    result = db.update_ingredient(
+        list_name, item_name, quantity, unit, expected_version=expected_version
+    )
+    if result.conflict:
+        st.session_state[f"qty_conflict_{row_key}"] = {
+            "current": result.current,
+            "quantity": quantity,
+        }
+    else:
+        st.session_state.pop(f"qty_conflict_{row_key}", None)
+        st.session_state[f"edit_qty_{row_key}"] = False
+
+
+def discard_ingredient_qty(row_key: str) -> None:
+    st.session_state.pop(f"qty_conflict_{row_key}", None)
+    st.session_state.pop(f"new_qty_val_{row_key}", None)
+    st.session_state[f"edit_qty_{row_key}"] = False
+
+
+def save_guest_transport(
+    list_name: str, guest: dict, bus: int, car: int, expected_version
+) -> None:
+    """Write Bus/Car counts unless the guest changed since they were read."""
+    result = db.update_invitee(
+        list_name,
+        guest["name"],
+        guest["lunch"],
+        int(guest.get("to_sakti") or 0),
+        None,
+        bus,
+        car,
+        expected_version=expected_version,
+    )
+    conflict_key = f"guest_conflict_{list_name}_{guest['name']}"
+    if result.conflict:
+        st.session_state[conflict_key] = {
+            "current": result.current,
+            "bus": bus,
+            "car": car,
+        }
+    else:
+        st.session_state.pop(conflict_key, None)
+
+
+def discard_guest_transport(list_name: str, name: str, widget_keys: tuple) -> None:
+    st.session_state.pop(f"guest_conflict_{list_name}_{name}", None)
+    for key in widget_keys:
+        st.session_state.pop(key, None)
+
+
+def render_conflict_prompt(
+    message: str, key: str, overwrite: tuple, keep_theirs: tuple
+) -> None:
+    """Alert plus Overwrite / Keep theirs buttons; each action is (callback, args)."""
+    render_alert(message, "warning")
+    o_col, k_col, _ = st.columns([1, 1, 3])
+    with o_col:
+        st.button(
+            "Overwrite", key=f"overwrite_{key}", on_click=overwrite[0], args=overwrite[1]
+        )
+    with k_col:
+        st.button(
+            "Keep theirs", key=f"keep_{key}", on_click=keep_theirs[0], args=keep_theirs[1]
+        )
+
+
+# ---------------------------------------------------------------------
+# CSV upload (checked in the rerun, written on a background thread)
+# ---------------------------------------------------------------------
+UPLOAD_KINDS = {
+    "ingredients": "📦 Ingredient list",
+    "invitees": "👥 Guest list",
+    "menus": "🍽️ Menus",
+}
+
+
+def upload_preview(kind: str, list_name: str, uploaded) -> upload.UploadPreview:
+    """Validation and diff of an uploaded file, computed once per file and list."""
+    key = (kind, list_name, uploaded.file_id)
+    cached = st.session_state.get("upload_preview")
+    if cached is None or cached[0] != key:
+        with st.spinner(f"Checking {uploaded.name}..."):
+            uploaded.seek(0)
+            cached = (key, upload.preview(db, kind, list_name, uploaded, uploaded.name))
+        st.session_state["upload_preview"] = cached
+    return cached[1]
+
+
+def start_list_upload(preview: upload.UploadPreview) -> None:
+    st.session_state["upload_job"] = upload.start_upload(db, preview)
+    # The diff is against the list being replaced; recompute it afterwards
+    st.session_state.pop("upload_preview", None)
+
+
+def dismiss_upload_job() -> None:
+    st.session_state.pop("upload_job", None)
+
+
+def render_upload_status(job: upload.UploadJob) -> None:
+    if not job.done:
+        st.progress(
+            job.progress,
+            text=f"Writing {job.list_name}: {job.rows_written:,} of {job.rows:,} rows",
+        )
+        return
+    if job.state == "done":
+        st.success(f"Replaced {job.list_name} with {job.rows:,} rows.")
+    else:
+        st.error(f"Upload of {job.list_name} failed: {job.error}")
+    st.button("OK", key="upload_job_dismiss", on_click=dismiss_upload_job)
+
+
+def render_upload_job() -> None:
+    """This session's background upload; polled by a fragment while it runs."""
+    job = st.session_state.get("upload_job")
+    if job is None:
+        return
+    fragment = getattr(st, "fragment", None)
+    if job.done or fragment is None:
+        render_upload_status(job)
+        return
+
+    @fragment(run_every=UPLOAD_POLL_SECONDS)
+    def poll() -> None:
+        if job.done:
+            st.rerun()  # whole app, so every tab shows the new list
+        render_upload_status(job)
+
+    poll()
+
+
+def render_upload_preview(preview: upload.UploadPreview, target: str) -> None:
+    report = preview.report
+    if report.ok:
+        st.success(report.summary())
+    else:
+        st.warning(report.summary())
+    if report.rejected:
+        with st.expander(f"Rejected rows ({report.rows_rejected})"):
+            st.dataframe(
+                [
+                    {
+                        "row": r.row,
+                        "reason": r.reason,
+                        **{k: "" if v is None else str(v) for k, v in r.values.items()},
+                    }
+                    for r in report.rejected
+                ],
+                hide_index=True,
+            )
+    if not preview.can_load:
+        return
+
+    counts = preview.counts()
+    render_metrics_panel(
+        [
+            ("Added", counts["added"], "➕"),
+            ("Removed", counts["removed"], "➖"),
+            ("Changed", counts["changed"], "✏️"),
+            ("Unchanged", counts["unchanged"], "✅"),
+        ],
+        columns=4,
+    )
+    if preview.changes:
+        with st.expander(f"Changes ({len(preview.changes)})", expanded=True):
+            st.dataframe(
+                [
+                    {
+                        "row": c.key,
+                        "change": c.change,
+                        "details": ", ".join(
+                            f"{field}: {old} → {new}" for field, (old, new) in c.fields.items()
+                        ),
+                    }
+                    for c in preview.changes[:UPLOAD_PREVIEW_ROWS]
+                ],
+                hide_index=True,
+            )
+            if len(preview.changes) > UPLOAD_PREVIEW_ROWS:
+                st.caption(f"First {UPLOAD_PREVIEW_ROWS} of {len(preview.changes)} shown.")
+    st.caption(
+        "Replacing a list starts its tracking over: deliveries, travel and "
+        "headcount changes made in the app are reset to the uploaded values."
+    )
+    job = st.session_state.get("upload_job")
+    st.button(
+        f"Replace {target} with {len(preview.frame):,} rows",
+        key="upload_start",
+        type="primary",
+        disabled=job is not None and not job.done,
+        on_click=start_list_upload,
+        args=(preview,),
+    )
+
+
+# ---------------------------------------------------------------------
+# Diagnostics (hidden sidebar panel)
+# ---------------------------------------------------------------------
+def diagnostics_enabled() -> bool:
+    return (
+        os.environ.get(DIAGNOSTICS_ENV_VAR) == "1"
+        or st.query_params.get(DIAGNOSTICS_QUERY_PARAM) == "1"
+    )
+
+
+def render_diagnostics_panel(this_run: dict) -> None:
+    """Database call statistics for this process; this_run is calls per scope."""
+    snapshot = instrumentation.snapshot()
+    snapshot["slow_queries"] = db.slow_query_log.entries()
+    snapshot["errors_by_class"] = log.error_counts()
+    with st.sidebar.expander("🩺 Diagnostics", expanded=True):
+        st.caption(
+            f"This rerun: {sum(this_run.values())} database calls · "
+            f"{snapshot['reruns']} reruns recorded"
+        )
+        if data_watcher is not None:
+            snapshot["data_watcher"] = data_watcher.status()
+            st.caption(
+                f"Data watcher ({data_watcher.backend}): "
+                f"{data_watcher.reloads} reloads, {data_watcher.failures} failed"
+            )
+        st.markdown("**Calls per rerun by tab / action**")
+        st.dataframe(
+            [
+                {
+                    "scope": scope,
+                    "this rerun": this_run.get(scope, 0),
+                    "mean": s["mean_calls_per_rerun"],
+                    "max": s["max_calls_per_rerun"],
+                    "top method": next(iter(s["top_methods"]), ""),
+                }
+                for scope, s in snapshot["scopes"].items()
+            ],
+            hide_index=True,
+        )
+        st.markdown("**Database methods**")
+        st.dataframe(
+            sorted(
+                (
+                    {
+                        "method": name,
+                        "calls": m["calls"],
+                        "mean ms": m["mean_ms"],
+                        "p95 ms": m["p95_ms"],
+                        "max ms": m["max_ms"],
+                        "rows": m["rows"],
+                        "errors": m["errors"],
+                        "retries": m["retries"],
+                    }
+                    for name, m in snapshot["methods"].items()
+                ),
+                key=lambda r: -r["calls"] * r["mean ms"],
+            ),
+            hide_index=True,
+        )
+        if snapshot["errors_by_class"]:
+            st.markdown("**Failures by error class**")
+            st.dataframe(
+                [
+                    {"error class": error_class, "operation": op, "count": count}
+                    for error_class, ops in snapshot["errors_by_class"].items()
+                    for op, count in ops.items()
+                ],
+                hide_index=True,
+            )
+        st.markdown(
+            f"**Slow queries** (over {db.slow_query_log.threshold_ms:g} ms, newest first)"
+        )
+        if snapshot["slow_queries"]:
+            st.dataframe(
+                [
+                    {
+                        "method": q["method"],
+                        "ms": q["duration_ms"],
+                        "full scan": "⚠️" if q["full_scan"] else "",
+                        "plan": " / ".join(q["plan"]),
+                        "sql": q["sql"],
+                    }
+                    for q in reversed(snapshot["slow_queries"])
+                ],
+                hide_index=True,
+            )
+        else:
+            st.caption("None recorded.")
+        st.markdown("**Rerun sections** (wall time and widgets per rerun)")
+        st.dataframe(
+            [
+                {
+                    "section": name,
+                    "last ms": round(s["last_ms"], 1),
+                    "mean ms": round(s["mean_ms"], 1),
+                    "p95 ms": round(s["p95_ms"], 1),
+                    "widgets": s["mean_widgets"],
+                }
+                for name, s in profiler.summary().items()
+            ],
+            hide_index=True,
+        )
+        snapshot["reruns_profiled"] = profiler.history()
+        d1, d2 = st.columns(2)
+        with d1:
+            st.download_button(
+                "Download JSON",
+                json.dumps(snapshot, indent=2),
+                file_name="db-diagnostics.json",
+                mime="application/json",
+            )
+        with d2:
+            st.button("Reset", key="diagnostics_reset", on_click=reset_diagnostics)
+        p1, p2 = st.columns(2)
+        with p1:
+            st.button(
+                "Profile next rerun",
+                key="profile_next_rerun_btn",
+                on_click=request_rerun_profile,
+            )
+        with p2:
+            if st.session_state.get("last_rerun_prof"):
+                st.download_button(
+                    "Download .prof",
+                    st.session_state["last_rerun_prof"],
+                    file_name="rerun.prof",
+                    mime="application/octet-stream",
+                )
+
+
+def request_rerun_profile() -> None:
+    st.session_state["profile_next_rerun"] = True
+
+
+def reset_diagnostics() -> None:
+    instrumentation.reset()
+    profiler.clear()
+    db.slow_query_log.clear()
+    log.reset_error_counts()
+
+
 # ---------------------------------------------------------------------
 # Tabs
 # ---------------------------------------------------------------------
-tab1, tab2, tab3, tab4 = st.tabs(
-    ["📦 Track Ingredients", "👥 Track Invitees", "🍽️ Menu Planning", "🔍 Global Search"]
+tab1, tab2, tab3, tab4, tab5 = st.tabs(
+    [
+        "📦 Track Ingredients",
+        "👥 Track Invitees",
+        "🍽️ Menu Planning",
+        "🔍 Global Search",
+        "📤 Upload Lists",
+    ]
 )
 
 # ---------------------------------------------------------------------
 # TAB 1: INGREDIENTS
 # ---------------------------------------------------------------------
-with tab1:
+with tab1, app_section("Ingredients tab"):
     st.markdown("### 📦 Ingredient Delivery Tracking")
     render_decorative_line()
 
@@ -378,31 +726,21 @@ with tab1:
         ingredients = db.get_ingredients(selected_list)
 
         if ingredients:
-            total_items = len(ingredients)
-            completed_items = [i for i in ingredients if i["status"] == "Completed"]
-            incomplete_items = [i for i in ingredients if i["status"] == "Incomplete"]
-
-            s1, s2, s3 = st.columns(3)
-            with s1:
-                render_metric_box("Total Items", str(total_items), "📊")
-            with s2:
-                render_metric_box("Completed Items", str(len(completed_items)), "✅")
-            with s3:
-                render_metric_box("Incomplete Items", str(len(incomplete_items)), "⚠️")
-
-            total_qty = sum(float(i["quantity"]) for i in ingredients)
-            total_incomplete_qty = sum(
-                float(i.get("delivered_quantity") or 0.0) for i in incomplete_items
+            summary = reports.ingredient_summary(ingredients)
+            completed_items = summary.completed
+            incomplete_items = summary.incomplete
+
+            render_metrics_panel(
+                [
+                    ("Total Items", summary.total_items, "📊"),
+                    ("Completed Items", len(completed_items), "✅"),
+                    ("Incomplete Items", len(incomplete_items), "⚠️"),
+                    ("Total Quantity", summary.total_qty, "📦"),
+                    ("Completed Qty", summary.completed_qty, "✅"),
+                    ("Incomplete Qty", summary.incomplete_qty, "⚠️"),
+                ],
+                columns=3,
             )
-            total_complete_qty = total_qty - total_incomplete_qty
-
-            q1, q2, q3 = st.columns(3)
-            with q1:
-                render_metric_box("Total Quantity", str(total_qty), "📦")
-            with q2:
-                render_metric_box("Completed Qty", str(total_complete_qty), "✅")
-            with q3:
-                render_metric_box("Incomplete Qty", str(total_incomplete_qty), "⚠️")
 
             # Compact expanders for completed/incomplete lists
             e1, e2 = st.columns(2)
@@ -447,25 +785,14 @@ with tab1:
                     search_term = ""
                     st.session_state[f"local_search_{selected_list}"] = ""
 
-            if search_term:
-                filtered = [
-                    i
-                    for i in ingredients
-                    if search_term.lower() in i["item_name"].lower()
-                ]
-            else:
-                filtered = ingredients
+            filtered = reports.filter_by_name(ingredients, search_term, "item_name")
 
             if filtered:
-                incomplete_filtered = [
-                    i for i in filtered if i["status"] == "Incomplete"
-                ]
-                completed_filtered = [i for i in filtered if i["status"] == "Completed"]
-                other_filtered = [
-                    i
-                    for i in filtered
-                    if i["status"] not in ("Incomplete", "Completed")
-                ]
+                (
+                    incomplete_filtered,
+                    completed_filtered,
+                    other_filtered,
+                ) = reports.split_by_status(filtered)
 
                 def render_ingredient_cards(items, section_key_prefix: str):
                     for idx, ing in enumerate(items):
@@ -525,6 +852,9 @@ with tab1:
                                     st.session_state[
                                         f"edit_qty_{row_key}"
                                     ] = True
+                                    st.session_state[
+                                        f"edit_qty_version_{row_key}"
+                                    ] = ing.get("version")
 
                             with col6:
                                 if st.button(
@@ -569,27 +899,51 @@ with tab1:
                             ):
                                 new_q_col1, new_q_col2 = st.columns([2, 1])
                                 with new_q_col1:
-                                    new_qty_val = st.number_input(
+                                    st.number_input(
                                         f"New quantity for {ing['item_name']}",
                                         min_value=0.0,
                                         value=float(ing["quantity"]),
                                         key=f"new_qty_val_{row_key}",
                                     )
                                 with new_q_col2:
-                                    if st.button(
+                                    st.button(
                                         "Update",
                                         key=f"update_qty_{row_key}",
-                                    ):
-                                        db.update_ingredient(
+                                        on_click=save_ingredient_qty,
+                                        args=(
+                                            row_key,
                                             selected_list,
                                             ing["item_name"],
-                                            new_qty_val,
                                             ing["unit"],
-                                        )
-                                        st.session_state[
-                                            f"edit_qty_{row_key}"
-                                        ] = False
-                                        st.rerun()
+                                            st.session_state.get(
+                                                f"edit_qty_version_{row_key}"
+                                            ),
+                                        ),
+                                    )
+
+                            qty_conflict = st.session_state.get(
+                                f"qty_conflict_{row_key}"
+                            )
+                            if qty_conflict:
+                                theirs = qty_conflict["current"]
+                                render_conflict_prompt(
+                                    f"{ing['item_name']} was changed to "
+                                    f"{format_quantity_display(theirs['quantity'], theirs['unit'])}"
+                                    " by someone else while you were editing.",
+                                    f"qty_{row_key}",
+                                    overwrite=(
+                                        save_ingredient_qty,
+                                        (
+                                            row_key,
+                                            selected_list,
+                                            ing["item_name"],
+                                            theirs["unit"],
+                                            theirs["version"],
+                                            qty_conflict["quantity"],
+                                        ),
+                                    ),
+                                    keep_theirs=(discard_ingredient_qty, (row_key,)),
+                                )
 
                             st.divider()
 
@@ -643,7 +997,7 @@ with tab1:
 # ---------------------------------------------------------------------
 # TAB 2: INVITEES
 # ---------------------------------------------------------------------
-with tab2:
+with tab2, app_section("Invitees tab"):
     st.markdown("### 👥 Invitee Management")
     render_decorative_line()
 
@@ -654,47 +1008,48 @@ with tab2:
             options=list(INVITEE_LISTS.keys()),
             format_func=lambda k: INVITEE_LISTS[k],
             key="invitee_list_selector",
+            on_change=flush_counter_deltas,
         )
     with c2:
-        if st.button("🔄 Refresh", key="refresh_invitees"):
+        if st.button(
+            "🔄 Refresh", key="refresh_invitees", on_click=flush_counter_deltas
+        ):
             st.rerun()
 
     if selected_inv_list:
-        invitees = db.get_invitees(selected_inv_list)
-        total_headcount = db.get_total_headcount(selected_inv_list)
+        pending = pending_counter_deltas()
+        render_counter_autoflush()
+        if st.session_state.get("counter_error"):
+            render_alert(st.session_state.pop("counter_error"), "error")
 
-        is_barati = (
-            "Barati" in selected_inv_list
-            or "Barati" in INVITEE_LISTS.get(selected_inv_list, "")
-        )
+        # Optimistic view: stored values plus clicks not yet written
+        invitees = pending.apply(db.get_invitees(selected_inv_list), selected_inv_list)
+        total_headcount = sum(int(g["lunch"]) for g in invitees)
+
+        is_barati = reports.is_barati_list(selected_inv_list)
 
         if is_barati:
-            total_to_sakti = sum(int(g.get("to_sakti") or 0) for g in invitees)
-            total_bus = sum(int(g.get("bus_sakti") or 0) for g in invitees)
-            total_car = sum(int(g.get("car_sakti") or 0) for g in invitees)
-            total_unsure = max(total_to_sakti - total_bus - total_car, 0)
-
-            c1m, c2m, c3m, c4m = st.columns(4)
-            with c1m:
-                render_metric_box("Total Guests", str(len(invitees)), "👥")
-            with c2m:
-                render_metric_box("Total Headcount", str(total_headcount), "🍽️")
-            with c3m:
-                render_metric_box("People to Sakti", str(total_to_sakti), "🧳")
-            with c4m:
-                render_metric_box(
-                    "Sakti Bus/Car/Unsure",
-                    f"Bus: {total_bus} | Car: {total_car} | Unsure: {total_unsure}",
-                    "🚌",
-                )
+            summary = reports.invitee_summary(invitees, total_headcount)
+            render_metrics_panel(
+                [
+                    ("Total Guests", summary.total_guests, "👥"),
+                    ("Total Headcount", summary.total_headcount, "🍽️"),
+                    ("People to Sakti", summary.to_sakti, "🧳"),
+                    (
+                        "Sakti Bus/Car/Unsure",
+                        f"Bus: {summary.bus} | Car: {summary.car} | Unsure: {summary.unsure}",
+                        "🚌",
+                    ),
+                ]
+            )
         else:
-            s1, s2, s3 = st.columns(3)
-            with s1:
-                render_metric_box("Total Guests", str(len(invitees)), "👥")
-            with s2:
-                render_metric_box("Total Headcount", str(total_headcount), "🍽️")
-            with s3:
-                render_metric_box("Barati Special", "No", "✨")
+            render_metrics_panel(
+                [
+                    ("Total Guests", len(invitees), "👥"),
+                    ("Total Headcount", total_headcount, "🍽️"),
+                    ("Barati Special", "No", "✨"),
+                ]
+            )
 
         st.divider()
 
@@ -712,18 +1067,9 @@ with tab2:
                 inv_search = ""
                 st.session_state[f"invitee_search_{selected_inv_list}"] = ""
 
-        if inv_search:
-            filtered_inv = [
-                g for g in invitees if inv_search.lower() in g["name"].lower()
-            ]
-        else:
-            filtered_inv = invitees
+        filtered_inv = reports.filter_by_name(invitees, inv_search, "name")
 
         if filtered_inv:
-            is_barati = (
-                "Barati" in selected_inv_list
-                or "Barati" in INVITEE_LISTS.get(selected_inv_list, "")
-            )
             for idx, guest in enumerate(filtered_inv):
                 with st.container():
                     if is_barati:
@@ -736,38 +1082,22 @@ with tab2:
 
                         # Lunch - / count / +
                         with col2:
-                            if st.button(
+                            st.button(
                                 "➖",
                                 key=f"lunch_minus_{idx}_{selected_inv_list}",
-                            ):
-                                if guest["lunch"] > 1:
-                                    db.update_invitee(
-                                        selected_inv_list,
-                                        guest["name"],
-                                        guest["lunch"] - 1,
-                                        guest.get("to_sakti"),
-                                        None,
-                                        guest.get("bus_sakti"),
-                                        guest.get("car_sakti"),
-                                    )
-                                    st.rerun()
+                                on_click=queue_counter_delta,
+                                args=(selected_inv_list, guest["name"], "lunch", -1),
+                                disabled=guest["lunch"] <= 1,
+                            )
                         with col3:
                             st.write(f"**{guest['lunch']}**")
                         with col4:
-                            if st.button(
+                            st.button(
                                 "➕",
                                 key=f"lunch_plus_{idx}_{selected_inv_list}",
-                            ):
-                                db.update_invitee(
-                                    selected_inv_list,
-                                    guest["name"],
-                                    guest["lunch"] + 1,
-                                    guest.get("to_sakti"),
-                                    None,
-                                    guest.get("bus_sakti"),
-                                    guest.get("car_sakti"),
-                                )
-                                st.rerun()
+                                on_click=queue_counter_delta,
+                                args=(selected_inv_list, guest["name"], "lunch", 1),
+                            )
 
                         # Sakti count
                         current_sakti = int(guest.get("to_sakti") or 0)
@@ -776,46 +1106,30 @@ with tab2:
                         with col5:
                             s1c, s2c, s3c = st.columns([0.8, 1.4, 0.8])
                             with s1c:
-                                if st.button(
+                                st.button(
                                     "➖",
                                     key=f"sakti_minus_{idx}_{selected_inv_list}",
-                                ):
-                                    if current_sakti > 0:
-                                        new_sakti = current_sakti - 1
-                                        if current_bus + current_car > new_sakti:
-                                            render_alert(
-                                                "Reduce Bus/Car first before reducing Sakti.",
-                                                "error",
-                                            )
-                                        else:
-                                            db.update_invitee(
-                                                selected_inv_list,
-                                                guest["name"],
-                                                guest["lunch"],
-                                                new_sakti,
-                                                None,
-                                                current_bus,
-                                                current_car,
-                                            )
-                                            st.rerun()
+                                    on_click=queue_counter_delta,
+                                    args=(
+                                        selected_inv_list,
+                                        guest["name"],
+                                        "to_sakti",
+                                        -1,
+                                        "Reduce Bus/Car first before reducing Sakti."
+                                        if current_bus + current_car > current_sakti - 1
+                                        else "",
+                                    ),
+                                    disabled=current_sakti <= 0,
+                                )
                             with s2c:
                                 st.write(f"Sakti: **{current_sakti}**")
                             with s3c:
-                                if st.button(
+                                st.button(
                                     "➕",
                                     key=f"sakti_plus_{idx}_{selected_inv_list}",
-                                ):
-                                    new_sakti = current_sakti + 1
-                                    db.update_invitee(
-                                        selected_inv_list,
-                                        guest["name"],
-                                        guest["lunch"],
-                                        new_sakti,
-                                        None,
-                                        current_bus,
-                                        current_car,
-                                    )
-                                    st.rerun()
+                                    on_click=queue_counter_delta,
+                                    args=(selected_inv_list, guest["name"], "to_sakti", 1),
+                                )
 
                         # Bus / Car inputs, Unsure derived
                         with col6:
@@ -837,24 +1151,32 @@ with tab2:
                                     key=f"car_{idx}_{selected_inv_list}",
                                 )
 
-                            if (new_bus, new_car) != (current_bus, current_car):
+                            guest_key = (selected_inv_list, guest["name"])
+                            guest_conflict = st.session_state.get(
+                                f"guest_conflict_{selected_inv_list}_{guest['name']}"
+                            )
+                            if guest_conflict:
+                                pass  # wait for the conflict prompt below
+                            elif (new_bus, new_car) != (current_bus, current_car):
                                 if new_bus + new_car > current_sakti:
                                     render_alert(
                                         "Bus + Car cannot exceed Sakti.",
                                         "error",
                                     )
                                 else:
-                                    db.update_invitee(
+                                    flush_counter_deltas()
+                                    save_guest_transport(
                                         selected_inv_list,
-                                        guest["name"],
-                                        guest["lunch"],
-                                        current_sakti,
-                                        None,
+                                        guest,
                                         new_bus,
                                         new_car,
+                                        seen_guest_versions().get(
+                                            guest_key, guest["version"]
+                                        ),
                                     )
                                     st.rerun()
 
+                            seen_guest_versions()[guest_key] = guest["version"]
                             unsure = max(current_sakti - new_bus - new_car, 0)
                             st.write(f"Unsure: **{unsure}**")
 
@@ -864,9 +1186,43 @@ with tab2:
                                 "Reset",
                                 key=f"reset_guest_{idx}_{selected_inv_list}",
                             ):
+                                pending.discard(selected_inv_list, guest["name"])
                                 db.reset_invitee(selected_inv_list, guest["name"])
                                 st.rerun()
 
+                        if guest_conflict:
+                            theirs = guest_conflict["current"]
+                            render_conflict_prompt(
+                                f"{guest['name']} was changed by someone else "
+                                f"(now Bus {theirs['bus_sakti'] or 0}, "
+                                f"Car {theirs['car_sakti'] or 0}, "
+                                f"Sakti {theirs['to_sakti'] or 0}). "
+                                f"Overwrite with Bus {guest_conflict['bus']}, "
+                                f"Car {guest_conflict['car']}?",
+                                f"guest_{idx}_{selected_inv_list}",
+                                overwrite=(
+                                    save_guest_transport,
+                                    (
+                                        selected_inv_list,
+                                        theirs,
+                                        guest_conflict["bus"],
+                                        guest_conflict["car"],
+                                        theirs["version"],
+                                    ),
+                                ),
+                                keep_theirs=(
+                                    discard_guest_transport,
+                                    (
+                                        selected_inv_list,
+                                        guest["name"],
+                                        (
+                                            f"bus_{idx}_{selected_inv_list}",
+                                            f"car_{idx}_{selected_inv_list}",
+                                        ),
+                                    ),
+                                ),
+                            )
+
                     else:
                         # Non-Barati layout (unchanged)
                         col1, col2, col3, col4, col5 = st.columns(
@@ -875,35 +1231,28 @@ with tab2:
                         with col1:
                             st.write(f"**{guest['name']}**")
                         with col2:
-                            if st.button(
+                            st.button(
                                 "➖",
                                 key=f"lunch_minus_simple_{idx}_{selected_inv_list}",
-                            ):
-                                if guest["lunch"] > 1:
-                                    db.update_invitee(
-                                        selected_inv_list,
-                                        guest["name"],
-                                        guest["lunch"] - 1,
-                                    )
-                                    st.rerun()
+                                on_click=queue_counter_delta,
+                                args=(selected_inv_list, guest["name"], "lunch", -1),
+                                disabled=guest["lunch"] <= 1,
+                            )
                         with col3:
                             st.write(f"**{guest['lunch']}**")
                         with col4:
-                            if st.button(
+                            st.button(
                                 "➕",
                                 key=f"lunch_plus_simple_{idx}_{selected_inv_list}",
-                            ):
-                                db.update_invitee(
-                                    selected_inv_list,
-                                    guest["name"],
-                                    guest["lunch"] + 1,
-                                )
-                                st.rerun()
+                                on_click=queue_counter_delta,
+                                args=(selected_inv_list, guest["name"], "lunch", 1),
+                            )
                         with col5:
                             if st.button(
                                 "Reset",
                                 key=f"reset_guest_simple_{idx}_{selected_inv_list}",
                             ):
+                                pending.discard(selected_inv_list, guest["name"])
                                 db.reset_invitee(selected_inv_list, guest["name"])
                                 st.rerun()
 
@@ -931,12 +1280,7 @@ with tab2:
                 if not ok:
                     render_alert(msg, "error")
                 else:
-                    is_barati_now = (
-                        "Barati" in selected_inv_list
-                        or "Barati"
-                        in INVITEE_LISTS.get(selected_inv_list, "")
-                    )
-                    if is_barati_now:
+                    if is_barati:
                         s1c, s2c, s3c = st.columns(3)
                         with s1c:
                             to_sakti = st.number_input(
@@ -993,7 +1337,7 @@ with tab2:
 # ---------------------------------------------------------------------
 # TAB 3: MENU (pretty, editable)
 # ---------------------------------------------------------------------
-with tab3:
+with tab3, app_section("Menu tab"):
     st.markdown("### 🍽️ Menu Planning & Details")
     render_decorative_line()
 
@@ -1020,29 +1364,21 @@ with tab3:
             menu_row = db.get_menu(selected_date, selected_meal)
             if menu_row:
                 st.divider()
-                m1, m2 = st.columns(2)
-                with m1:
-                    render_metric_box("Date", selected_date, "📅")
-                with m2:
-                    render_metric_box(
-                        "Headcount", str(menu_row["headcount"]), "🍽️"
-                    )
+                render_metrics_panel(
+                    [
+                        ("Date", selected_date, "📅"),
+                        ("Headcount", menu_row["headcount"], "🍽️"),
+                    ]
+                )
 
                 st.divider()
                 st.markdown("#### 📋 Menu Items (Beautiful View)")
 
-                raw_menu_text = menu_row["menu_items"]
-                working_items = split_menu_items(raw_menu_text)
-                structured_menu = build_menu_structure(raw_menu_text)
-
-                for category in [
-                    "Main course",
-                    "Sabjis",
-                    "Starters",
-                    "Breads",
-                    "Desserts",
-                    "Sides",
-                ]:
+                parsed_menu = parse_menu(menu_row["menu_items"])
+                working_items = list(parsed_menu.items)
+                structured_menu = parsed_menu.by_category
+
+                for category in MENU_CATEGORIES:
                     items = structured_menu.get(category, [])
                     if not items:
                         continue
@@ -1061,15 +1397,9 @@ with tab3:
 
                 st.divider()
                 st.markdown("#### 📄 Download Text Menu")
-                text = (
-                    f"Date: {selected_date}\n"
-                    f"Meal: {selected_meal}\n"
-                    f"Headcount: {menu_row['headcount']}\n\n"
-                    f"Menu:\n{menu_row['menu_items']}"
-                )
                 st.download_button(
                     "📄 Download",
-                    data=text,
+                    data=reports.menu_text(selected_date, selected_meal, menu_row),
                     file_name=f"Menu_{selected_date}_{selected_meal}.txt",
                 )
         else:
@@ -1078,7 +1408,7 @@ with tab3:
 # ---------------------------------------------------------------------
 # TAB 4: GLOBAL SEARCH (unchanged)
 # ---------------------------------------------------------------------
-with tab4:
+with tab4, app_section("Global search tab"):
     st.markdown("### 🔍 Global Search")
     render_decorative_line()
 
@@ -1090,10 +1420,7 @@ with tab4:
             res = db.search_ingredients(term)
             if res:
                 st.success(f"Found {len(res)} ingredient(s).")
-                by_list = {}
-                for r in res:
-                    by_list.setdefault(r["list_name"], []).append(r)
-                for lst, items in by_list.items():
+                for lst, items in reports.group_by_list(res).items():
                     label = INGREDIENT_LISTS.get(lst, lst)
                     with st.expander(f"📦 {label} ({len(items)})"):
                         for r in items:
@@ -1117,10 +1444,7 @@ with tab4:
             res = db.search_invitees(term)
             if res:
                 st.success(f"Found {len(res)} guest(s).")
-                by_list = {}
-                for r in res:
-                    by_list.setdefault(r["list_name"], []).append(r)
-                for lst, items in by_list.items():
+                for lst, items in reports.group_by_list(res).items():
                     label = INVITEE_LISTS.get(lst, lst)
                     with st.expander(f"👥 {label} ({len(items)})"):
                         for r in items:
@@ -1134,5 +1458,66 @@ with tab4:
     else:
         render_empty_state("Enter a search term to begin.", "🔍")
 
-st.divider()
-render_footer()
+# ---------------------------------------------------------------------
+# TAB 5: UPLOAD LISTS
+# ---------------------------------------------------------------------
+with tab5, app_section("Upload tab"):
+    st.markdown("### 📤 Upload a List")
+    render_decorative_line()
+    render_upload_job()
+
+    c1, c2 = st.columns(2)
+    with c1:
+        upload_kind = st.radio(
+            "List type",
+            options=list(UPLOAD_KINDS),
+            format_func=UPLOAD_KINDS.get,
+            horizontal=True,
+            key="upload_kind",
+        )
+    with c2:
+        if upload_kind == "ingredients":
+            upload_list = st.selectbox(
+                "List to replace",
+                options=list(INGREDIENT_LISTS.keys()),
+                format_func=lambda k: INGREDIENT_LISTS[k],
+                key="upload_ingredient_list",
+            )
+            upload_target = INGREDIENT_LISTS[upload_list]
+        elif upload_kind == "invitees":
+            upload_list = st.selectbox(
+                "List to replace",
+                options=list(INVITEE_LISTS.keys()),
+                format_func=lambda k: INVITEE_LISTS[k],
+                key="upload_invitee_list",
+            )
+            upload_target = INVITEE_LISTS[upload_list]
+        else:
+            upload_list, upload_target = "menus", "all menus"
+            st.caption("A menu upload replaces every date and meal.")
+
+    uploaded_csv = st.file_uploader(
+        "CSV file (see md_files/CSV_SPECIFICATIONS.md for the columns)",
+        type=["csv"],
+        key=f"upload_file_{upload_kind}",
+    )
+    if uploaded_csv is not None:
+        try:
+            preview = upload_preview(upload_kind, upload_list, uploaded_csv)
+        except Exception as e:
+            st.error(f"Could not read {uploaded_csv.name}: {e}")
+        else:
+            render_upload_preview(preview, upload_target)
+
+with app_section("Footer"):
+    st.divider()
+    render_footer()
+rerun_profile = st.session_state.pop("rerun_profile")
+profiler.finish_rerun(rerun_profile)
+metrics.RERUN_SECONDS.observe(rerun_profile.total_ms / 1000.0)
+if rerun_profile.cprofile is not None:
+    st.session_state["last_rerun_prof"] = rerun_profile.prof_bytes()
+calls_this_run = instrumentation.end_run(st.session_state.pop("diagnostics_run"))
+if diagnostics_enabled():
+    render_diagnostics_panel(calls_this_run)
+startup.mark("first_run")
@@ -0,0 +1,123 @@
+"""
+Benchmark: initial CSV load of many list files, sequential vs parallel
+
+Generates --lists ingredient lists and as many invitee lists (plus a menu
+file) of --rows rows each (generate_event_data.py, real-data quirks
+included), then times core.ingest.load_initial_data into a fresh SQLite
+file for each worker count in --workers, with parser threads or, with
+--processes, parser processes. Each case reports the best and the median
+of --repeat runs, in seconds. With --cache the pre-parsed CSV cache
+(core.csvcache) is on: the first run of the first case fills it and every
+later run reads it, so the median shows warm starts.
+
+Usage:
+    python benchmarks/bench_ingest.py [--lists 100] [--rows 1000]
+        [--workers 1,2,4,8] [--processes] [--cache] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.generate_event_data import generate  # noqa: E402
+from core.ingest import Source, load_initial_data  # noqa: E402
+from core.storage import WeddingDatabase  # noqa: E402
+
+
+def sources_for(files: dict) -> list:
+    sources = []
+    for name, path in files.items():
+        if name == "Menus-List":
+            sources.append(Source("menus", "menus", path))
+        elif path.parent.name == "invitees":
+            sources.append(Source("invitees", name, path))
+        else:
+            sources.append(Source("ingredients", name, path))
+    return sources
+
+
+def time_load(
+    workdir: Path, sources: list, workers: int, processes: bool, cache: bool
+) -> float:
+    db_path = workdir / f"ingest-{workers}-{int(processes)}.db"
+    if db_path.exists():
+        db_path.unlink()
+    db = WeddingDatabase(str(db_path))
+    start = time.perf_counter()
+    results = load_initial_data(
+        db,
+        sources=sources,
+        workers=workers,
+        processes=processes,
+        cache_dir=workdir / "cache" if cache else None,
+        on_report=lambda name, report: None,
+    )
+    elapsed = time.perf_counter() - start
+    if not all(results.values()):
+        raise SystemExit(f"load failed: {[n for n, ok in results.items() if not ok]}")
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--lists", type=int, default=100, help="ingredient and invitee lists each")
+    parser.add_argument("--rows", type=int, default=1000, help="rows per list")
+    parser.add_argument("--workers", default="1,2,4,8", help="comma-separated pool sizes")
+    parser.add_argument("--processes", action="store_true", help="parser processes, not threads")
+    parser.add_argument("--cache", action="store_true", help="use the pre-parsed CSV cache")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", type=Path, help="write the report to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = generate(
+            Path(tmp) / "data",
+            ingredient_lists=args.lists,
+            ingredient_rows_per_list=args.rows,
+            invitee_lists=args.lists,
+            barati_lists=0,
+            invitee_rows_per_list=args.rows,
+            menu_row_count=min(args.rows, 300),
+            seed=args.seed,
+        )
+        sources = sources_for(files)
+        report = {
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "files": len(sources),
+            "rows_per_file": args.rows,
+            "mode": "processes" if args.processes else "threads",
+            "cache": args.cache,
+            "workers": {},
+        }
+        print(
+            f"{len(sources)} files x {args.rows} rows, parser {report['mode']}"
+            + (", pre-parsed cache" if args.cache else "")
+        )
+        print(f"{'workers':<10}{'best s':>10}{'median s':>10}")
+        for workers in (int(w) for w in args.workers.split(",") if w.strip()):
+            runs = [
+                time_load(Path(tmp), sources, workers, args.processes, args.cache)
+                for _ in range(args.repeat)
+            ]
+            best, median = min(runs), statistics.median(runs)
+            report["workers"][str(workers)] = {"best_s": best, "median_s": median}
+            print(f"{workers:<10}{best:>10.3f}{median:>10.3f}")
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""
+Benchmark: compiled menu classifier vs. the original keyword scans
+
+Compares the per-dish `any(k in name for k in [...])` implementation that
+used to live in app.py against core.menu (cold cache, warm cache and the
+batch API), after checking that both produce identical results.
+
+Usage:
+    python benchmarks/bench_menu_classifier.py [--repeat 20]
+"""
+
+import argparse
+import csv
+import random
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from core import menu as menu_engine  # noqa: E402
+from config import MENU_CATEGORY_KEYWORDS, NONVEG_KEYWORDS  # noqa: E402
+
+MENU_CSV = ROOT / "data" / "menus" / "Menus-List.csv"
+
+
+# ---------------------------------------------------------------------
+# Baseline: the original app.py implementation, kept verbatim
+# ---------------------------------------------------------------------
+LEGACY_NONVEG_KEYWORDS = ["chicken", "fish", "macher", "maacher", "egg", "mutton", "pakoda"]
+
+
+def legacy_detect_veg_flag(item: str) -> str:
+    name = item.lower()
+    if any(k in name for k in LEGACY_NONVEG_KEYWORDS):
+        return "non-veg"
+    return "veg"
+
+
+def legacy_classify_menu_item(item: str) -> str:
+    name = item.lower()
+    if any(k in name for k in ["jalebi", "halwa", "rosogolla", "ice cream", "payesh", "paayesh", "dessert"]):
+        return "Desserts"
+    if any(
+        k in name
+        for k in [
+            "snacks",
+            "chowmein",
+            "manchurian",
+            "pakoda",
+            "pani puri",
+            "papdi chat",
+            "cutlet",
+            "starter",
+        ]
+    ):
+        return "Starters"
+    if any(k in name for k in ["salad", "chutney", "papad", "dahi vada", "fruit", "sides"]):
+        return "Sides"
+    if any(k in name for k in ["roti", "puri", "palak puri", "bread"]):
+        return "Breads"
+    if any(
+        k in name
+        for k in [
+            "chicken",
+            "fish",
+            "macher",
+            "maacher",
+            "rice",
+            "jeera rice",
+            "kofta",
+            "matar paneer",
+            "dal fry",
+        ]
+    ):
+        return "Main course"
+    return "Sabjis"
+
+
+# ---------------------------------------------------------------------
+# Corpus
+# ---------------------------------------------------------------------
+def load_menu_dishes() -> list:
+    dishes = []
+    with MENU_CSV.open(newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            dishes.extend(menu_engine.split_menu_items(row.get("Menu Items") or ""))
+    return dishes
+
+
+def synthetic_dishes(count: int, seed: int = 7) -> list:
+    """Random dish names stitched from keywords and filler words."""
+    rng = random.Random(seed)
+    keywords = [k for ks in MENU_CATEGORY_KEYWORDS.values() for k in ks] + NONVEG_KEYWORDS
+    filler = ["aloo", "kasa", "bhaja", "special", "masala", "(2 kg)", "jhal", "fry"]
+    dishes = []
+    for _ in range(count):
+        words = rng.sample(filler, 2) + rng.sample(keywords, rng.randint(0, 2))
+        rng.shuffle(words)
+        dishes.append(" ".join(words).title())
+    return dishes
+
+
+def check_equivalence(dishes: list) -> None:
+    for dish in dishes:
+        expected = (legacy_classify_menu_item(dish), legacy_detect_veg_flag(dish))
+        actual = menu_engine.classify_dish(dish)
+        if expected != actual:
+            raise SystemExit(f"Mismatch for {dish!r}: legacy={expected} engine={actual}")
+
+
+def run(repeat: int) -> None:
+    real = load_menu_dishes()
+    synthetic = synthetic_dishes(5000)
+    check_equivalence(real + synthetic)
+    print(f"Equivalence OK on {len(real)} menu dishes + {len(synthetic)} synthetic dishes\n")
+
+    def legacy():
+        for d in synthetic:
+            legacy_classify_menu_item(d)
+            legacy_detect_veg_flag(d)
+
+    def engine_cold():
+        menu_engine._classify_normalized.cache_clear()
+        for d in synthetic:
+            menu_engine.classify_dish(d)
+
+    def engine_warm():
+        for d in synthetic:
+            menu_engine.classify_dish(d)
+
+    def engine_batch():
+        menu_engine.classify_menu(synthetic)
+
+    engine_warm()
+    cases = [
+        ("legacy any() scans", legacy),
+        ("engine, cold cache", engine_cold),
+        ("engine, warm cache", engine_warm),
+        ("engine, batch API", engine_batch),
+    ]
+    baseline = None
+    print(f"{'case':<22}{'best ms':>10}{'us/dish':>10}{'speedup':>10}")
+    for name, fn in cases:
+        best = min(timeit.repeat(fn, number=1, repeat=repeat))
+        baseline = baseline or best
+        print(
+            f"{name:<22}{best * 1000:>10.2f}"
+            f"{best * 1e6 / len(synthetic):>10.2f}{baseline / best:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    run(parser.parse_args().repeat)
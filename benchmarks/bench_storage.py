@@ -0,0 +1,223 @@
+"""
+Benchmark: WeddingDatabase operations at 1k, 10k and 100k rows
+
+For every size it generates one ingredient list, one Barati invitee list and
+a menu file of that many rows (generate_event_data.py, real-data quirks
+included), ingests them into a fresh SQLite file in a temporary directory,
+then times the read and write paths the app uses: get, search, update,
+reset and headcount.
+
+Bulk operations (ingest, get, global search) are timed per call; point
+operations (update, reset, searches within a list) are timed as the mean of
+a batch of calls. Each case reports the best and the median of --repeat
+runs in milliseconds per call.
+
+Usage:
+    python benchmarks/bench_storage.py [--sizes 1000,10000] [--json out.json]
+    python benchmarks/bench_storage.py --baseline old.json --fail-on-regression
+"""
+
+import argparse
+import json
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.generate_event_data import MAX_MENU_ROWS, generate  # noqa: E402
+from core.ingest import read_csv  # noqa: E402
+from core.storage import WeddingDatabase  # noqa: E402
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+
+# ---------------------------------------------------------------------
+# Timing
+# ---------------------------------------------------------------------
+def measure(fn, repeat: int, calls: int = 1) -> dict:
+    """ms per call of fn(i) for i in range(calls): best and median of repeat runs."""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for i in range(calls):
+            fn(i)
+        runs.append((time.perf_counter() - start) * 1000.0 / calls)
+    return {"best_ms": min(runs), "median_ms": statistics.median(runs), "calls": calls}
+
+
+def bench_size(rows: int, repeat: int, calls: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    pick = lambda names: [rng.choice(names) for _ in range(calls)]  # noqa: E731
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        files = generate(
+            Path(tmp) / "data",
+            ingredient_lists=1,
+            ingredient_rows_per_list=rows,
+            invitee_lists=1,
+            barati_lists=1,
+            invitee_rows_per_list=rows,
+            menu_row_count=min(rows, MAX_MENU_ROWS),
+            seed=seed,
+        )
+        ingredient_list, invitee_list, _ = files  # generation order
+        ingredients = read_csv(files[ingredient_list])
+        invitees = read_csv(files[invitee_list])
+        menus = read_csv(files["Menus-List"])
+        item_names = list(ingredients["Item Name"])
+        guest_names = [n for n in invitees["Name"] if not n.endswith("Total")]
+        menu_keys = list(menus.dropna(subset=["Date"])[["Date", "Meal"]].itertuples(index=False))
+        db = WeddingDatabase(str(Path(tmp) / "bench.db"))
+
+        # Ingredients
+        results["ingredients/ingest"] = measure(
+            lambda _: db.load_ingredient_list(ingredient_list, ingredients), repeat
+        )
+        results["ingredients/get"] = measure(
+            lambda _: db.get_ingredients(ingredient_list), repeat
+        )
+        results["ingredients/search"] = measure(
+            lambda _: db.search_ingredients("12"), repeat
+        )
+        targets = pick(item_names)
+        results["ingredients/search_in_list"] = measure(
+            lambda i: db.search_ingredients(targets[i], ingredient_list), repeat, calls
+        )
+        results["ingredients/update"] = measure(
+            lambda i: db.update_ingredient_status(ingredient_list, targets[i], "Completed"),
+            repeat,
+            calls,
+        )
+        results["ingredients/reset"] = measure(
+            lambda i: db.reset_ingredient(ingredient_list, targets[i]), repeat, calls
+        )
+
+        # Invitees
+        results["invitees/ingest"] = measure(
+            lambda _: db.load_invitee_list(invitee_list, invitees), repeat
+        )
+        results["invitees/get"] = measure(lambda _: db.get_invitees(invitee_list), repeat)
+        results["invitees/search"] = measure(lambda _: db.search_invitees("12"), repeat)
+        targets = pick(guest_names)
+        results["invitees/search_in_list"] = measure(
+            lambda i: db.search_invitees(targets[i], invitee_list), repeat, calls
+        )
+        results["invitees/update"] = measure(
+            lambda i: db.update_invitee(invitee_list, targets[i], 2), repeat, calls
+        )
+        results["invitees/increment"] = measure(
+            lambda i: db.increment_invitee_count(invitee_list, targets[i], "lunch", 1),
+            repeat,
+            calls,
+        )
+        results["invitees/reset"] = measure(
+            lambda i: db.reset_invitee(invitee_list, targets[i]), repeat, calls
+        )
+        results["invitees/headcount"] = measure(
+            lambda _: db.get_total_headcount(invitee_list), repeat
+        )
+
+        # Menus (there is no menu search or reset in the storage API)
+        results["menus/ingest"] = measure(lambda _: db.load_menu_data(menus), repeat)
+        results["menus/dates"] = measure(lambda _: db.get_all_dates(), repeat)
+        targets = pick(menu_keys)
+        results["menus/get"] = measure(lambda i: db.get_menu(*targets[i]), repeat, calls)
+        results["menus/update"] = measure(
+            lambda i: db.update_menu_items(*targets[i], "Luchi, Dal Fry"), repeat, calls
+        )
+    return results
+
+
+# ---------------------------------------------------------------------
+# Report
+# ---------------------------------------------------------------------
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _flatten(report: dict) -> dict:
+    """Comparable timings as {"case@rows": best ms}."""
+    return {
+        f"{case}@{rows}": r["best_ms"]
+        for rows, cases in report["sizes"].items()
+        for case, r in cases.items()
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float, min_ms: float) -> list:
+    """Return the cases that got slower than tolerance (fraction) and min_ms."""
+    regressions = []
+    old = _flatten(baseline)
+    for name, ms in _flatten(report).items():
+        if name in old and ms - old[name] > max(min_ms, old[name] * tolerance):
+            regressions.append((name, old[name], ms))
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(s) for s in DEFAULT_SIZES),
+        help="comma-separated row counts",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case")
+    parser.add_argument("--calls", type=int, default=50, help="calls per point-op run")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", type=Path, help="write the report to this file")
+    parser.add_argument("--baseline", type=Path, help="earlier --json report to compare to")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--min-ms", type=float, default=0.5)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "repeat": args.repeat,
+        "sizes": {},
+    }
+    for rows in sizes:
+        print(f"\n{rows} rows")
+        print(f"{'case':<28}{'best ms':>11}{'median ms':>11}")
+        report["sizes"][str(rows)] = cases = {}
+        for case, r in bench_size(rows, args.repeat, args.calls, args.seed).items():
+            cases[case] = r
+            print(f"{case:<28}{r['best_ms']:>11.3f}{r['median_ms']:>11.3f}")
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+
+    if args.baseline:
+        regressions = compare(
+            report, json.loads(args.baseline.read_text()), args.tolerance, args.min_ms
+        )
+        for name, old_ms, new_ms in regressions:
+            print(f"REGRESSION {name}: {old_ms:.3f} ms -> {new_ms:.3f} ms")
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
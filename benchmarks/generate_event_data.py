@@ -0,0 +1,213 @@
+"""
+Synthetic event data generator for load and scale testing
+
+Writes seeded CSVs in the layout of `data/` and the shapes described in
+md_files/CSV_SPECIFICATIONS.md: ingredient lists, basic and Barati invitee
+lists (with `To SAKTI` and `Travel By`) and one menu file. Rows are streamed
+straight to disk, so millions of rows and hundreds of lists are fine.
+
+By default the files also carry the quirks of the real data: "Sl No."
+instead of "Index", a duplicated index, the trailing space in "Travel By ",
+"Not" as a travel mode, a "Total" summary row, blank separator rows and
+multi-line menu items. Pass --clean to leave them out.
+
+Usage:
+    python benchmarks/generate_event_data.py OUT_DIR [--ingredient-lists 9]
+        [--ingredient-rows 1000] [--invitee-lists 4] [--barati-lists 1]
+        [--invitee-rows 1000] [--menu-rows 300] [--seed 7] [--clean]
+
+The generated directory can be loaded like the real one, e.g. with
+core.ingest.read_csv() and WeddingDatabase.load_*().
+"""
+
+import argparse
+import csv
+import datetime
+import random
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+INGREDIENT_HEADER = ["Index", "Item Name", "Quantity", "Unit"]
+INVITEE_HEADER = ["Index", "Name", "Lunch"]
+BARATI_HEADER = INVITEE_HEADER + ["To SAKTI", "Travel By"]
+MENU_HEADER = ["Date", "Meal", "Headcount", "Menu Items"]
+
+MEALS = ("Breakfast", "Lunch", "Dinner")
+TRAVEL_MODES = ("Bus", "Car", "Not")
+FIRST_DATE = datetime.date(2025, 12, 3)
+# Dates are DD/MM/YY, so (date, meal) pairs repeat after a century
+MAX_MENU_ROWS = 36524 * len(MEALS)
+
+INGREDIENTS = {
+    "kg": ["Rice", "Atta", "Maida", "Sugar", "Salt", "Potato", "Onion", "Dal", "Chicken"],
+    "g": ["Haldi", "Jeera", "Elaichi", "Tej Patta", "Garam Masala", "Coffee"],
+    "ltr": ["Mustard Oil", "Refined Oil", "Milk", "Ghee"],
+    "pc": ["Balti", "Kadhai", "Gas Chula", "Handa", "Plate", "Glass"],
+    "packet": ["Papad", "Agarbatti", "Tissue"],
+}
+VARIANTS = ["", "Premium", "Local", "Small", "Large", "Gobinda Bhog", "Fresh"]
+FIRST_NAMES = [
+    "Tabu", "Minti", "Rubi", "Mousumi", "Rana", "Bapi", "Sonali", "Tapas",
+    "Mithu", "Sanjay", "Rina", "Dipu", "Papai", "Jhuma", "Bablu", "Shyamal",
+]
+RELATIONS = ["", "Di", "Da", "Mama", "Kaku", "Pishi", "Boudi", "Jethu"]
+DISHES = [
+    "Luchi", "Aloo Chochori", "Upma", "Jeera Rice", "Dal Fry", "Matar Paneer",
+    "Chicken Kasa", "Maacher Jhal", "Fish Fry", "Roti", "Palak Puri", "Salad",
+    "Papad", "Tomato Chutney", "Rosogolla", "Payesh", "Jalebi", "Ice Cream",
+    "Chowmein", "Veg Cutlet", "Kofta", "Aloo Posto", "Begun Bhaja",
+]
+
+
+# ---------------------------------------------------------------------
+# Row generators
+# ---------------------------------------------------------------------
+def _unique(base: str, seen: Dict[str, int]) -> str:
+    """Return base, or base plus a running number once base was used."""
+    count = seen.get(base, 0)
+    seen[base] = count + 1
+    return base if count == 0 else f"{base} {count + 1}"
+
+
+def ingredient_rows(count: int, rng: random.Random, quirks: bool = True) -> Iterator[list]:
+    seen: Dict[str, int] = {}
+    units = list(INGREDIENTS)
+    duplicate_at = rng.randrange(1, count) if quirks and count > 2 else -1
+    index = 0
+    for i in range(count):
+        unit = rng.choice(units)
+        name = " ".join(w for w in (rng.choice(INGREDIENTS[unit]), rng.choice(VARIANTS)) if w)
+        quantity = rng.choice((rng.randint(1, 50), round(rng.uniform(0.5, 10), 1)))
+        if unit in ("g", "ltr") and rng.random() < 0.5:
+            quantity = rng.choice((100, 250, 500))
+        index = index if i == duplicate_at else index + 1
+        yield [index, _unique(name, seen), quantity, unit]
+
+
+def invitee_rows(
+    count: int, rng: random.Random, barati: bool = False, quirks: bool = True
+) -> Iterator[list]:
+    seen: Dict[str, int] = {}
+    total = 0
+    for i in range(count):
+        relation = rng.choice(RELATIONS)
+        name = " ".join(w for w in (rng.choice(FIRST_NAMES), relation) if w)
+        if rng.random() < 0.6:
+            name += rng.choice((" family", " Family"))
+        lunch = rng.randint(1, 8) if "family" in name.lower() else rng.randint(1, 2)
+        total += lunch
+        row = [i + 1, _unique(name, seen), lunch]
+        if barati:
+            travel = rng.choice(TRAVEL_MODES if quirks else TRAVEL_MODES[:2])
+            row += [0 if travel == "Not" else rng.randint(0, lunch), travel]
+        yield row
+    if quirks:
+        yield ["", f"{total} Total", ""] + (["", ""] if barati else [])
+
+
+def menu_rows(count: int, rng: random.Random, quirks: bool = True) -> Iterator[list]:
+    if count > MAX_MENU_ROWS:
+        raise ValueError(f"at most {MAX_MENU_ROWS} unique (date, meal) rows fit DD/MM/YY")
+    for i in range(count):
+        day, meal = divmod(i, len(MEALS))
+        if quirks and meal == 0 and i:
+            yield ["", "", "", ""]
+        date = FIRST_DATE + datetime.timedelta(days=day)
+        dishes = rng.sample(DISHES, rng.randint(3, 8))
+        separator = "\n" if quirks and rng.random() < 0.1 else ", "
+        yield [date.strftime("%d/%m/%y"), MEALS[meal], rng.randint(20, 400), separator.join(dishes)]
+
+
+# ---------------------------------------------------------------------
+# Files
+# ---------------------------------------------------------------------
+def write_csv(path: Path, header: List[str], rows: Iterator[list]) -> int:
+    """Stream rows to path (UTF-8, comma separated). Returns data rows written."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow(row)
+            written += 1
+    return written
+
+
+def generate(
+    out_dir: Path,
+    ingredient_lists: int = 9,
+    ingredient_rows_per_list: int = 1000,
+    invitee_lists: int = 4,
+    barati_lists: int = 1,
+    invitee_rows_per_list: int = 1000,
+    menu_row_count: int = 300,
+    seed: int = 7,
+    quirks: bool = True,
+) -> Dict[str, Path]:
+    """
+    Write a data directory under out_dir (ingredients/, invitees/, menus/).
+    The first `barati_lists` invitee lists get the Barati columns.
+    Returns {list name: csv path}; the menu file is keyed "Menus-List".
+    """
+    rng = random.Random(seed)
+    files: Dict[str, Path] = {}
+
+    for n in range(ingredient_lists):
+        name = f"Synthetic-Ingredients-{n + 1:03d}"
+        header = list(INGREDIENT_HEADER)
+        if quirks and n % 9 == 1:
+            header[0] = "Sl No."
+        path = out_dir / "ingredients" / f"{name}.csv"
+        write_csv(path, header, ingredient_rows(ingredient_rows_per_list, rng, quirks))
+        files[name] = path
+
+    for n in range(invitee_lists):
+        barati = n < barati_lists
+        date = (FIRST_DATE + datetime.timedelta(days=n)).strftime("%d.%m.%y")
+        name = f"Invitee-List-{'Barati' if barati else 'Synthetic'}-{n + 1:03d}-{date}"
+        header = list(BARATI_HEADER if barati else INVITEE_HEADER)
+        if barati and quirks:
+            header[-1] = "Travel By "
+        path = out_dir / "invitees" / f"{name}.csv"
+        write_csv(path, header, invitee_rows(invitee_rows_per_list, rng, barati, quirks))
+        files[name] = path
+
+    path = out_dir / "menus" / "Menus-List.csv"
+    write_csv(path, MENU_HEADER, menu_rows(menu_row_count, rng, quirks))
+    files["Menus-List"] = path
+    return files
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("out_dir", type=Path)
+    parser.add_argument("--ingredient-lists", type=int, default=9)
+    parser.add_argument("--ingredient-rows", type=int, default=1000, help="rows per list")
+    parser.add_argument("--invitee-lists", type=int, default=4)
+    parser.add_argument("--barati-lists", type=int, default=1)
+    parser.add_argument("--invitee-rows", type=int, default=1000, help="rows per list")
+    parser.add_argument("--menu-rows", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--clean", action="store_true", help="no real-data quirks")
+    args = parser.parse_args()
+
+    files = generate(
+        args.out_dir,
+        args.ingredient_lists,
+        args.ingredient_rows,
+        args.invitee_lists,
+        args.barati_lists,
+        args.invitee_rows,
+        args.menu_rows,
+        args.seed,
+        not args.clean,
+    )
+    size = sum(p.stat().st_size for p in files.values())
+    print(f"Wrote {len(files)} files ({size / 1e6:.1f} MB) to {args.out_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+"""
+Load test: N concurrent volunteer sessions against one SQLite file
+
+Each session (a thread, or a process with --processes) runs a weighted mix
+of the operations volunteers perform: reading a list, marking an
+ingredient's status, tapping a guest's lunch ➕/➖ and searching. All
+sessions share one WeddingDatabase file seeded with generated data
+(generate_event_data.py).
+
+WeddingDatabase swallows errors, so every call is followed by
+pop_last_error()/pop_retry_count() to classify it. Failed calls whose error
+is "database is locked" are retried up to --retries times with exponential
+backoff, as an application-level write retry would.
+
+The report gives throughput, p50/p95/p99 latency per operation (including
+retries), calls that still failed, the share of attempts that hit
+"database is locked" and retry counts. Use --timeout to try a shorter
+SQLite busy timeout than config.DB_TIMEOUT.
+
+Usage:
+    python benchmarks/load_test.py [--sessions 8] [--duration 10] [--processes]
+        [--mix read=40,status=20,increment=25,search=15] [--timeout 30]
+        [--retries 3] [--rows 1000] [--json out.json]
+"""
+
+import argparse
+import json
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.generate_event_data import generate  # noqa: E402
+from config import DB_TIMEOUT, DELIVERY_STATUS  # noqa: E402
+from core.ingest import read_csv  # noqa: E402
+from core.storage import WeddingDatabase  # noqa: E402
+
+DEFAULT_MIX = "read=40,status=20,increment=25,search=15"
+SEARCH_TERMS = ("ta", "rice", "family", "di", "oil", "mi", "da", "salt")
+RETRY_BACKOFF_SECONDS = 0.01
+
+
+# ---------------------------------------------------------------------
+# Sessions
+# ---------------------------------------------------------------------
+def parse_mix(mix: str) -> Dict[str, int]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in OPERATIONS:
+            raise SystemExit(f"unknown operation {name!r}; choose from {sorted(OPERATIONS)}")
+        weights[name.strip()] = int(weight or 1)
+    return weights
+
+
+def _read(db: WeddingDatabase, rng: random.Random, data: dict) -> None:
+    if rng.random() < 0.5:
+        db.get_ingredients(data["ingredient_list"])
+    else:
+        db.get_invitees(data["invitee_list"])
+
+
+def _status(db: WeddingDatabase, rng: random.Random, data: dict) -> None:
+    status = rng.choice(list(DELIVERY_STATUS))
+    delivered = rng.uniform(0, 5) if status == "Incomplete" else 0.0
+    db.update_ingredient_status(
+        data["ingredient_list"], rng.choice(data["items"]), status, delivered
+    )
+
+
+def _increment(db: WeddingDatabase, rng: random.Random, data: dict) -> None:
+    db.increment_invitee_count(
+        data["invitee_list"], rng.choice(data["guests"]), "lunch", rng.choice((1, -1))
+    )
+
+
+def _search(db: WeddingDatabase, rng: random.Random, data: dict) -> None:
+    term = rng.choice(SEARCH_TERMS)
+    if rng.random() < 0.5:
+        db.search_ingredients(term)
+    else:
+        db.search_invitees(term)
+
+
+OPERATIONS = {"read": _read, "status": _status, "increment": _increment, "search": _search}
+
+
+def run_session(
+    session: int, db_path: str, data: dict, config: dict
+) -> List[Tuple[str, float, str, int, int]]:
+    """
+    Run one session until the deadline. Returns one sample per operation:
+    (name, latency ms, final outcome "ok" | "locked" | "error", retries,
+    attempts that hit "database is locked").
+    """
+    db = WeddingDatabase(db_path, timeout=config["timeout"])
+    rng = random.Random(config["seed"] * 1000 + session)
+    names = list(config["mix"])
+    weights = [config["mix"][n] for n in names]
+    samples = []
+
+    deadline = config["start_at"] + config["duration"]
+    while time.time() < config["start_at"]:
+        time.sleep(0.001)
+    while time.time() < deadline:
+        name = rng.choices(names, weights)[0]
+        retries = locked_hits = 0
+        start = time.perf_counter()
+        while True:
+            OPERATIONS[name](db, rng, data)
+            error = db.pop_last_error()
+            retries += db.pop_retry_count()
+            locked = error is not None and "locked" in str(error)
+            locked_hits += locked
+            if not locked or retries >= config["retries"]:
+                break
+            retries += 1
+            time.sleep(RETRY_BACKOFF_SECONDS * 2 ** (retries - 1))
+        latency_ms = (time.perf_counter() - start) * 1000.0
+        outcome = "ok" if error is None else ("locked" if locked else "error")
+        samples.append((name, latency_ms, outcome, retries, locked_hits))
+    return samples
+
+
+def run_threads(sessions: int, db_path: str, data: dict, config: dict) -> list:
+    results: List[list] = [[] for _ in range(sessions)]
+
+    def target(i: int) -> None:
+        results[i] = run_session(i, db_path, data, config)
+
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return [s for r in results for s in r]
+
+
+def run_processes(sessions: int, db_path: str, data: dict, config: dict) -> list:
+    with ProcessPoolExecutor(max_workers=sessions) as pool:
+        futures = [
+            pool.submit(run_session, i, db_path, data, config) for i in range(sessions)
+        ]
+        return [s for f in futures for s in f.result()]
+
+
+# ---------------------------------------------------------------------
+# Setup and report
+# ---------------------------------------------------------------------
+def seed_database(workdir: Path, rows: int, seed: int) -> Tuple[str, dict]:
+    files = generate(
+        workdir / "data",
+        ingredient_lists=1,
+        ingredient_rows_per_list=rows,
+        invitee_lists=1,
+        barati_lists=1,
+        invitee_rows_per_list=rows,
+        menu_row_count=30,
+        seed=seed,
+        quirks=False,
+    )
+    ingredient_list, invitee_list, _ = files  # generation order
+    db_path = str(workdir / "load_test.db")
+    db = WeddingDatabase(db_path)
+    ingredients = read_csv(files[ingredient_list])
+    invitees = read_csv(files[invitee_list])
+    db.load_ingredient_list(ingredient_list, ingredients)
+    db.load_invitee_list(invitee_list, invitees)
+    return db_path, {
+        "ingredient_list": ingredient_list,
+        "invitee_list": invitee_list,
+        "items": list(ingredients["Item Name"]),
+        "guests": list(invitees["Name"]),
+    }
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(samples: list, wall_seconds: float) -> dict:
+    groups: Dict[str, list] = {"all": samples}
+    for sample in samples:
+        groups.setdefault(sample[0], []).append(sample)
+    summary = {}
+    for name, group in groups.items():
+        latencies = sorted(s[1] for s in group)
+        count = len(group)
+        retries = sum(s[3] for s in group)
+        locked = sum(s[4] for s in group)
+        summary[name] = {
+            "ops": count,
+            "ops_per_s": count / wall_seconds if wall_seconds else 0.0,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "max_ms": latencies[-1] if latencies else 0.0,
+            "errors": sum(1 for s in group if s[2] != "ok"),
+            "locked": locked,
+            "locked_rate": locked / (count + retries) if count else 0.0,
+            "retries": retries,
+        }
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--processes", action="store_true", help="sessions as processes")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="operation=weight,...")
+    parser.add_argument("--timeout", type=float, default=DB_TIMEOUT, help="busy timeout (s)")
+    parser.add_argument("--retries", type=int, default=3, help="retries on 'locked'")
+    parser.add_argument("--rows", type=int, default=1000, help="rows per seeded list")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", type=Path, help="write the report to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path, data = seed_database(Path(tmp), args.rows, args.seed)
+        config = {
+            "mix": parse_mix(args.mix),
+            "timeout": args.timeout,
+            "retries": args.retries,
+            "duration": args.duration,
+            "seed": args.seed,
+            # Processes need a moment to start; everyone begins together
+            "start_at": time.time() + (2.0 if args.processes else 0.2),
+        }
+        runner = run_processes if args.processes else run_threads
+        samples = runner(args.sessions, db_path, data, config)
+
+    summary = summarize(samples, args.duration)
+    report = {
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "sessions": args.sessions,
+        "mode": "processes" if args.processes else "threads",
+        "duration_s": args.duration,
+        "timeout_s": args.timeout,
+        "retries": args.retries,
+        "mix": config["mix"],
+        "results": summary,
+    }
+
+    print(
+        f"{args.sessions} {report['mode']}, {args.duration:g}s, "
+        f"busy timeout {args.timeout:g}s, up to {args.retries} retries"
+    )
+    print(
+        f"{'operation':<11}{'ops':>8}{'ops/s':>9}{'p50 ms':>9}{'p95 ms':>9}"
+        f"{'p99 ms':>9}{'errors':>8}{'locked %':>10}{'retries':>9}"
+    )
+    for name, r in summary.items():
+        print(
+            f"{name:<11}{r['ops']:>8}{r['ops_per_s']:>9.1f}{r['p50_ms']:>9.2f}"
+            f"{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['errors']:>8}"
+            f"{r['locked_rate'] * 100:>9.2f}%{r['retries']:>9}"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""
+Startup report: import cost of each module and first paint of app.py
+
+For every module it runs a fresh interpreter with `-X importtime`, sums the
+cumulative import time of everything the module pulls in (modules already
+loaded by a bare interpreter are ignored), lists the heaviest imports and
+flags heavy dependencies (pandas, streamlit, PIL) loaded at import time.
+
+If Streamlit is installed it also runs app.py once headless (AppTest, in a
+temporary working directory so the real database is untouched) and reports
+the core.startup milestones: imports, first_paint and first_run.
+
+Usage:
+    python benchmarks/startup_report.py [--json out.json]
+    python benchmarks/startup_report.py --baseline old.json --fail-on-regression
+"""
+
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_MODULES = [
+    "config",
+    "core.storage",
+    "core.ingest",
+    "core.menu",
+    "core.reports",
+    "utils",
+]
+HEAVY_MODULES = ("pandas", "streamlit", "PIL")
+
+FIRST_PAINT_SCRIPT = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+from streamlit.testing.v1 import AppTest
+start = time.perf_counter()
+at = AppTest.from_file({app!r}, default_timeout=120).run()
+run_ms = (time.perf_counter() - start) * 1000.0
+from core import startup
+print("STARTUP_REPORT " + json.dumps({{
+    "run_ms": run_ms,
+    "marks": startup.marks(),
+    "exceptions": len(at.exception),
+}}))
+"""
+
+
+def _importtime(code: str) -> dict:
+    """Run `code` with -X importtime; return {module: (self_us, cumulative_us, depth)}."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return modules
+
+
+def _wall_ms(module: str, repeat: int) -> float:
+    code = (
+        "import time; t = time.perf_counter(); "
+        f"import {module}; print((time.perf_counter() - t) * 1000.0)"
+    )
+    runs = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        runs.append(float(proc.stdout.strip().splitlines()[-1]))
+    return min(runs)
+
+
+def module_report(module: str, baseline_modules: set, repeat: int, top: int) -> dict:
+    modules = {
+        name: info
+        for name, info in _importtime(f"import {module}").items()
+        if name not in baseline_modules
+    }
+    # Nesting depth is relative to the outermost new import.
+    min_depth = min((d for _, _, d in modules.values()), default=0)
+    cumulative_us = sum(c for _, c, d in modules.values() if d == min_depth)
+    heaviest = sorted(modules.items(), key=lambda kv: kv[1][0], reverse=True)[:top]
+    return {
+        "wall_ms": _wall_ms(module, repeat),
+        "import_ms": cumulative_us / 1000.0,
+        "modules_loaded": len(modules),
+        "heavy_imports": [
+            h for h in HEAVY_MODULES if any(n == h or n.startswith(h + ".") for n in modules)
+        ],
+        "heaviest": [{"module": n, "self_ms": s / 1000.0} for n, (s, _, _) in heaviest],
+    }
+
+
+def first_paint_report() -> dict:
+    try:
+        importlib.import_module("streamlit")
+    except ImportError:
+        return {"skipped": "streamlit not installed"}
+    script = FIRST_PAINT_SCRIPT.format(root=str(ROOT), app=str(ROOT / "app.py"))
+    with tempfile.TemporaryDirectory() as workdir:
+        proc = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=workdir,
+            capture_output=True,
+            text=True,
+            env=dict(os.environ, PYTHONPATH=str(ROOT)),
+        )
+    for line in proc.stdout.splitlines():
+        if line.startswith("STARTUP_REPORT "):
+            return json.loads(line[len("STARTUP_REPORT "):])
+    return {"error": (proc.stderr or proc.stdout).strip().splitlines()[-1:]}
+
+
+def _flatten(report: dict) -> dict:
+    """Comparable timings as {metric name: ms}."""
+    flat = {f"import {m}": r["wall_ms"] for m, r in report["modules"].items()}
+    paint = report.get("first_paint", {})
+    for name, ms in paint.get("marks", {}).items():
+        flat[f"app {name}"] = ms
+    if "run_ms" in paint:
+        flat["app run"] = paint["run_ms"]
+    return flat
+
+
+def compare(report: dict, baseline: dict, tolerance: float, min_ms: float) -> list:
+    """Return the metrics that got slower than tolerance (fraction) and min_ms."""
+    regressions = []
+    old = _flatten(baseline)
+    for name, ms in _flatten(report).items():
+        if name in old and ms - old[name] > max(min_ms, old[name] * tolerance):
+            regressions.append((name, old[name], ms))
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=3, help="wall-clock runs per module")
+    parser.add_argument("--top", type=int, default=5, help="heaviest imports to list")
+    parser.add_argument("--no-app", action="store_true", help="skip the app.py first paint")
+    parser.add_argument("--json", type=Path, help="write the report to this file")
+    parser.add_argument("--baseline", type=Path, help="earlier --json report to compare to")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--min-ms", type=float, default=5.0)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    baseline_modules = set(_importtime("pass"))
+    report = {
+        "python": sys.version.split()[0],
+        "modules": {
+            m: module_report(m, baseline_modules, args.repeat, args.top) for m in args.modules
+        },
+    }
+    if not args.no_app:
+        report["first_paint"] = first_paint_report()
+
+    print(f"{'module':<16}{'wall ms':>9}{'import ms':>11}{'modules':>9}  heavy imports")
+    for module, r in report["modules"].items():
+        print(
+            f"{module:<16}{r['wall_ms']:>9.1f}{r['import_ms']:>11.1f}"
+            f"{r['modules_loaded']:>9}  {', '.join(r['heavy_imports']) or '-'}"
+        )
+        for h in r["heaviest"]:
+            print(f"{'':<18}{h['self_ms']:>7.1f} ms  {h['module']}")
+    paint = report.get("first_paint")
+    if paint:
+        print("\napp.py first run:", json.dumps(paint, indent=2))
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+
+    if args.baseline:
+        regressions = compare(
+            report, json.loads(args.baseline.read_text()), args.tolerance, args.min_ms
+        )
+        for name, old_ms, new_ms in regressions:
+            print(f"REGRESSION {name}: {old_ms:.1f} ms -> {new_ms:.1f} ms")
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
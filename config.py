@@ -48,6 +48,92 @@ MENU_DATES = {
     "07/12/25": ["Breakfast", "Lunch", "Dinner"],
 }
 
+# Menu Classification
+# Categories are checked in priority order: a dish goes into the first
+# category with a keyword contained in its (lower-cased) name, otherwise
+# into MENU_DEFAULT_CATEGORY.
+MENU_CATEGORY_KEYWORDS = {
+    "Desserts": ["jalebi", "halwa", "rosogolla", "ice cream", "payesh", "paayesh", "dessert"],
+    "Starters": [
+        "snacks",
+        "chowmein",
+        "manchurian",
+        "pakoda",
+        "pani puri",
+        "papdi chat",
+        "cutlet",
+        "starter",
+    ],
+    "Sides": ["salad", "chutney", "papad", "dahi vada", "fruit", "sides"],
+    "Breads": ["roti", "puri", "palak puri", "bread"],
+    "Main course": [
+        "chicken",
+        "fish",
+        "macher",
+        "maacher",
+        "rice",
+        "jeera rice",
+        "kofta",
+        "matar paneer",
+        "dal fry",
+    ],
+}
+MENU_DEFAULT_CATEGORY = "Sabjis"
+
+# Number of parsed menus (one per distinct menu text) kept in memory
+MENU_CACHE_SIZE = 128
+
+# Display order of menu categories
+MENU_CATEGORIES = ["Main course", "Sabjis", "Starters", "Breads", "Desserts", "Sides"]
+
+# Dishes are veg unless a non-veg keyword matches; VEG_KEYWORDS documents
+# the known veg dishes but does not change the outcome.
+VEG_KEYWORDS = [
+    "paneer",
+    "mushroom",
+    "veg",
+    "sabji",
+    "dal",
+    "daal",
+    "bhaat",
+    "rice",
+    "saag",
+    "kophi",
+    "gobi",
+    "chutney",
+    "salad",
+    "upma",
+    "luchi",
+    "puri",
+    "roti",
+    "jeera rice",
+    "palak",
+    "mix veg",
+    "gulab jamun",
+    "paayesh",
+    "payesh",
+    "halwa",
+    "rosogolla",
+    "ice cream",
+    "jalebi",
+    "dahi vada",
+    "manchurian",
+    "papdi chat",
+    "veg cutlet",
+    "snacks",
+    "desserts",
+]
+
+NONVEG_KEYWORDS = [
+    "chicken",
+    "fish",
+    "macher",
+    "maacher",
+    "egg",
+    "mutton",
+    "pakoda",
+]
+
 # Delivery Status Options
 DELIVERY_STATUS = {
     "Completed": "✓ Completed",
@@ -58,10 +144,79 @@ DELIVERY_STATUS = {
 # Travel Options for Barati
 TRAVEL_OPTIONS = ["Bus", "Car", "Not"]
 
+# Seconds without a ➕/➖ click before buffered counter changes are written
+COUNTER_FLUSH_IDLE_SECONDS = 1.5
+
+# CSV upload tab: seconds between progress updates while a list is being
+# written, and changed rows listed in the preview
+UPLOAD_POLL_SECONDS = 0.5
+UPLOAD_PREVIEW_ROWS = 200
+
 # Database Configuration
 DB_NAME = "wedding_management.db"
 DB_TIMEOUT = 30
 
+# Slow query log (core.querylog): statements slower than SLOW_QUERY_MS are
+# kept with their query plan in a ring buffer of SLOW_QUERY_LOG_SIZE entries
+# and, if SLOW_QUERY_TABLE is a table name, also stored in the database
+SLOW_QUERY_MS = 50
+SLOW_QUERY_LOG_SIZE = 200
+SLOW_QUERY_TABLE = ""
+
+# Finished reruns kept by the rerun profiler (core.profiler)
+RERUN_PROFILE_HISTORY = 100
+
+# core.ingest: rows per chunk when reading a CSV, parser threads, and the
+# file size from which a CSV is streamed on its own instead of being parsed
+# by the pool (which holds the parsed file in memory until it is written)
+INGEST_CHUNK_ROWS = 5000
+INGEST_WORKERS = 4
+INGEST_STREAM_MIN_BYTES = 32 * 1024 * 1024
+
+# Pre-parsed CSV cache (core.csvcache): validated columns of the pooled
+# CSVs, kept in this directory under data/; set WEDDING_PARSED_CACHE=0 to
+# always parse the CSVs
+PARSED_CACHE_DIR_NAME = ".cache"
+PARSED_CACHE_ENV_VAR = "WEDDING_PARSED_CACHE"
+
+# Prebuilt database under data/ (python -m core.prebuilt): copied to DB_NAME
+# on start when it was built from the current CSVs, instead of loading them
+PREBUILT_DB_NAME = "wedding_prebuilt.db"
+
+# Data file watcher (core.watcher), on when WEDDING_WATCH_DATA=1: a changed
+# CSV is re-ingested once it has been left alone for DATA_WATCH_SETTLE_SECONDS;
+# without inotify (watchdog) files are checked every DATA_WATCH_POLL_SECONDS
+DATA_WATCH_ENV_VAR = "WEDDING_WATCH_DATA"
+DATA_WATCH_POLL_SECONDS = 2.0
+DATA_WATCH_SETTLE_SECONDS = 1.0
+
+# Worker threads (and max in-flight calls) for core.async_storage
+ASYNC_DB_WORKERS = 4
+
+# JSON API (python -m core.api) defaults
+API_HOST = "127.0.0.1"
+API_PORT = 8502
+
+# Hidden sidebar Diagnostics panel: shown with ?diagnostics=1 in the URL or
+# when this environment variable is set to 1
+DIAGNOSTICS_QUERY_PARAM = "diagnostics"
+DIAGNOSTICS_ENV_VAR = "WEDDING_DIAGNOSTICS"
+
+# Prometheus metrics (core.metrics): set WEDDING_METRICS_PORT to serve
+# /metrics on METRICS_HOST, and/or WEDDING_METRICS_FILE to rewrite a
+# text-format file every METRICS_FILE_INTERVAL_SECONDS
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT_ENV_VAR = "WEDDING_METRICS_PORT"
+METRICS_FILE_ENV_VAR = "WEDDING_METRICS_FILE"
+METRICS_FILE_INTERVAL_SECONDS = 15
+
+# Structured JSON-lines logging (core.log): records go to LOG_FILE, or to
+# stderr if empty. DEBUG adds one record per successful database call;
+# WEDDING_LOG_LEVEL overrides LOG_LEVEL
+LOG_LEVEL = "INFO"
+LOG_LEVEL_ENV_VAR = "WEDDING_LOG_LEVEL"
+LOG_FILE = ""
+
 # Session State Keys
 SESSION_KEYS = {
     "db_initialized": "db_initialized",
@@ -212,6 +367,40 @@ CUSTOM_CSS = """
         font-style: italic;
     }
     
+    .metrics-panel {
+        display: grid;
+        grid-template-columns: repeat(var(--metric-columns, 3), minmax(0, 1fr));
+        gap: 16px;
+        margin-bottom: 16px;
+    }
+    
+    .metric-box {
+        background: linear-gradient(135deg, #fdf5e6 0%, #fff9f0 100%);
+        padding: 15px;
+        border-radius: 10px;
+        text-align: center;
+        border-left: 4px solid #d4af37;
+    }
+    
+    .metric-box-label {
+        font-size: 0.85em;
+        color: #2c3e50;
+        font-weight: 600;
+        margin-bottom: 5px;
+    }
+    
+    .metric-box-value {
+        font-size: 1.8em;
+        color: #c41e3a;
+        font-weight: bold;
+    }
+    
+    @media (max-width: 640px) {
+        .metrics-panel {
+            grid-template-columns: repeat(2, minmax(0, 1fr));
+        }
+    }
+    
     .streamlit-expanderHeader {
         background-color: #fdf5e6;
         border-left: 4px solid #d4af37;
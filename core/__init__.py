@@ -0,0 +1,62 @@
+"""
+Core package for Tabu weds Mousumi application
+
+Business logic shared by the Streamlit UI (app.py), scripts, tests and
+background workers:
+
+- core.storage        - WeddingDatabase, the SQLite persistence layer
+- core.async_storage  - asyncio facade over WeddingDatabase
+- core.ingest         - CSV source locations and CSV -> database loading
+- core.validation     - CSV schemas, header normalization, rejected-row reports
+- core.csvcache       - on-disk cache of parsed and validated CSVs
+- core.prebuilt       - prebuilt database build and install on start
+- core.upload         - CSV upload preview and background list replacement
+- core.watcher        - re-ingest of data/ CSVs edited while the app runs
+- core.menu           - menu parsing and dish classification
+- core.reports        - dashboard aggregations
+- core.coalesce       - per-session buffering of counter clicks
+- core.startup        - cold-start milestones
+- core.instrumentation - per-method database call statistics
+- core.querylog       - slow query log with EXPLAIN QUERY PLAN capture
+- core.profiler       - per-section rerun timings and cProfile capture
+- core.metrics        - Prometheus text-format metrics export
+- core.log            - structured JSON-lines logging and error counters
+- core.api            - JSON HTTP API (python -m core.api)
+
+Nothing in this package imports Streamlit, PIL or pandas at module import
+time; pandas is imported lazily by the functions that read CSV files.
+Submodules are loaded on first attribute access.
+"""
+
+import importlib
+
+_SUBMODULES = {
+    "storage",
+    "async_storage",
+    "ingest",
+    "validation",
+    "csvcache",
+    "prebuilt",
+    "upload",
+    "watcher",
+    "menu",
+    "reports",
+    "coalesce",
+    "startup",
+    "instrumentation",
+    "querylog",
+    "profiler",
+    "metrics",
+    "log",
+    "api",
+}
+
+__all__ = sorted(_SUBMODULES) + ["WeddingDatabase"]
+
+
+def __getattr__(name):
+    if name == "WeddingDatabase":
+        return importlib.import_module(".storage", __name__).WeddingDatabase
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,293 @@
+"""
+JSON HTTP API for Tabu weds Mousumi application
+
+A small standard-library server exposing the WeddingDatabase operations to
+handheld clients, next to (not instead of) the Streamlit UI. It uses the
+same SQLite file: every request goes through WeddingDatabase, which opens
+its own WAL connection with a busy timeout, so both processes can write
+safely.
+
+Run:
+    python -m core.api [--host 0.0.0.0] [--port 8502] [--db wedding_management.db]
+
+Endpoints (all responses are JSON):
+    GET  /api/health
+    GET  /api/lists
+    GET  /api/ingredients?list=Local-List
+    GET  /api/ingredients/search?q=rice[&list=Local-List]
+    POST /api/ingredients/status    {"list", "item", "status", "delivered_quantity"}
+    GET  /api/invitees?list=Invitee-List-Poite-03.12.25
+    GET  /api/invitees/search?q=roy[&list=...]
+    POST /api/invitees/lunch        {"list", "name", "delta"}
+    GET  /api/menus
+    GET  /api/menu?date=03/12/25&meal=Lunch
+
+Errors are {"error": message} with 400 (bad input), 404 (unknown list, item
+or guest), 409 (lunch would drop below 1) or 503 (database busy, retry).
+"""
+
+import argparse
+import json
+import math
+import sqlite3
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from config import API_HOST, API_PORT, DB_NAME, DELIVERY_STATUS, INGREDIENT_LISTS, INVITEE_LISTS
+from core import log
+from core.storage import WeddingDatabase
+
+MAX_BODY_BYTES = 64 * 1024
+# Largest |delta| one lunch request may apply (SQLite integers are 64-bit)
+MAX_LUNCH_DELTA = 1000
+
+INGREDIENT_FIELDS = (
+    "list_name", "item_name", "quantity", "unit", "delivered_quantity", "status", "version",
+)
+INVITEE_FIELDS = (
+    "list_name", "name", "lunch", "to_sakti", "travel_by", "bus_sakti", "car_sakti", "version",
+)
+
+
+class APIError(Exception):
+    """Request error reported to the client as {"error": message}."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+Response = Tuple[HTTPStatus, object]
+Handler = Callable[[WeddingDatabase, Dict[str, str], Dict], Response]
+
+
+def _slim(rows: List[Dict], fields: Tuple[str, ...]) -> List[Dict]:
+    return [{f: r.get(f) for f in fields} for r in rows]
+
+
+def _require(params: Dict, name: str) -> str:
+    value = params.get(name)
+    if value in (None, ""):
+        raise APIError(HTTPStatus.BAD_REQUEST, f"missing '{name}'")
+    return value
+
+
+def _known_list(name: str, lists: Dict[str, str]) -> str:
+    if name not in lists:
+        raise APIError(HTTPStatus.NOT_FOUND, f"unknown list '{name}'")
+    return name
+
+
+def _raise_db_error(db: WeddingDatabase) -> None:
+    """Report the error the last failed database call swallowed, if any."""
+    error = db.pop_last_error()
+    if error is None:
+        return
+    if isinstance(error, sqlite3.OperationalError):  # e.g. "database is locked"
+        raise APIError(HTTPStatus.SERVICE_UNAVAILABLE, "database busy, try again")
+    raise APIError(HTTPStatus.INTERNAL_SERVER_ERROR, "database error")
+
+
+# ---------------------------------------------------------------------
+# Handlers
+# ---------------------------------------------------------------------
+def health(db: WeddingDatabase, query: Dict[str, str], body: Dict) -> Response:
+    return HTTPStatus.OK, {"status": "ok"}
+
+
+def lists(db: WeddingDatabase, query: Dict[str, str], body: Dict) -> Response:
+    return HTTPStatus.OK, {"ingredients": INGREDIENT_LISTS, "invitees": INVITEE_LISTS}
+
+
+def get_ingredients(db: WeddingDatabase, query: Dict[str, str], body: Dict) -> Response:
+    list_name = _known_list(_require(query, "list"), INGREDIENT_LISTS)
+    rows = db.get_ingredients(list_name)
+    return HTTPStatus.OK, {"list": list_name, "items": _slim(rows, INGREDIENT_FIELDS)}
+
+
+def search_ingredients(db: WeddingDatabase, query: Dict[str, str], body: Dict) -> Response:
+    rows = db.search_ingredients(_require(query, "q"), query.get("list") or None)
+    return HTTPStatus.OK, {"items": _slim(rows, INGREDIENT_FIELDS)}
+
+
+def update_ingredient_status(db: WeddingDatabase, query: Dict[str, str], body: Dict) -> Response:
+    list_name = _known_list(_require(body, "list"), INGREDIENT_LISTS)
+    item_name = _require(body, "item")
+    status = _require(body, "status")
+    if status not in DELIVERY_STATUS:
+        raise APIError(HTTPStatus.BAD_REQUEST, f"status must be one of {list(DELIVERY_STATUS)}")
+    delivered = body.get("delivered_quantity") or 0.0
+    try:
+        if isinstance(delivered, bool):
+            raise TypeError
+        delivered = float(delivered)
+    except (TypeError, ValueError):
+        raise APIError(HTTPStatus.BAD_REQUEST, "delivered_quantity must be a number")
+    if not math.isfinite(delivered) or delivered < 0:
+        raise APIError(HTTPStatus.BAD_REQUEST, "delivered_quantity must be finite and >= 0")
+
+    if not db.update_ingredient_status(list_name, item_name, status, delivered):
+        _raise_db_error(db)
+        raise APIError(HTTPStatus.NOT_FOUND, f"unknown item '{item_name}'")
+    return HTTPStatus.OK, {
+        "list": list_name,
+        "item": item_name,
+        "status": status,
+        "delivered_quantity": delivered,
+    }
+
+
+def get_invitees(db: WeddingDatabase, query: Dict[str, str], body: Dict) -> Response:
+    list_name = _known_list(_require(query, "list"), INVITEE_LISTS)
+    rows = db.get_invitees(list_name)
+    return HTTPStatus.OK, {
+        "list": list_name,
+        "headcount": db.get_total_headcount(list_name),
+        "guests": _slim(rows, INVITEE_FIELDS),
+    }
+
+
+def search_invitees(db: WeddingDatabase, query: Dict[str, str], body: Dict) -> Response:
+    rows = db.search_invitees(_require(query, "q"), query.get("list") or None)
+    return HTTPStatus.OK, {"guests": _slim(rows, INVITEE_FIELDS)}
+
+
+def increment_lunch(db: WeddingDatabase, query: Dict[str, str], body: Dict) -> Response:
+    list_name = _known_list(_require(body, "list"), INVITEE_LISTS)
+    name = _require(body, "name")
+    delta = body.get("delta", 1)
+    if not isinstance(delta, int) or isinstance(delta, bool):
+        raise APIError(HTTPStatus.BAD_REQUEST, "delta must be an integer")
+    if abs(delta) > MAX_LUNCH_DELTA:
+        raise APIError(
+            HTTPStatus.BAD_REQUEST, f"delta must be between -{MAX_LUNCH_DELTA} and {MAX_LUNCH_DELTA}"
+        )
+
+    lunch = db.increment_invitee_count(list_name, name, "lunch", delta)
+    if lunch is None:
+        _raise_db_error(db)
+        guest = db.get_invitee(list_name, name)
+        _raise_db_error(db)
+        if guest is None:
+            raise APIError(HTTPStatus.NOT_FOUND, f"unknown guest '{name}'")
+        raise APIError(HTTPStatus.CONFLICT, "headcount cannot go below 1")
+    return HTTPStatus.OK, {"list": list_name, "name": name, "lunch": lunch}
+
+
+def get_menus(db: WeddingDatabase, query: Dict[str, str], body: Dict) -> Response:
+    return HTTPStatus.OK, {
+        "dates": {date: db.get_meals_for_date(date) for date in db.get_all_dates()}
+    }
+
+
+def get_menu(db: WeddingDatabase, query: Dict[str, str], body: Dict) -> Response:
+    menu = db.get_menu(_require(query, "date"), _require(query, "meal"))
+    if menu is None:
+        raise APIError(HTTPStatus.NOT_FOUND, "no menu for that date and meal")
+    return HTTPStatus.OK, {k: menu[k] for k in ("date", "meal", "headcount", "menu_items")}
+
+
+ROUTES: Dict[Tuple[str, str], Handler] = {
+    ("GET", "/api/health"): health,
+    ("GET", "/api/lists"): lists,
+    ("GET", "/api/ingredients"): get_ingredients,
+    ("GET", "/api/ingredients/search"): search_ingredients,
+    ("POST", "/api/ingredients/status"): update_ingredient_status,
+    ("GET", "/api/invitees"): get_invitees,
+    ("GET", "/api/invitees/search"): search_invitees,
+    ("POST", "/api/invitees/lunch"): increment_lunch,
+    ("GET", "/api/menus"): get_menus,
+    ("GET", "/api/menu"): get_menu,
+}
+
+
+# ---------------------------------------------------------------------
+# HTTP plumbing
+# ---------------------------------------------------------------------
+class WeddingAPIHandler(BaseHTTPRequestHandler):
+    """Dispatches requests to ROUTES; `db` is set by make_server()."""
+
+    db: Optional[WeddingDatabase] = None
+    server_version = "WeddingAPI/1.0"
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str) -> None:
+        url = urlparse(self.path)
+        path = url.path.rstrip("/") or "/"
+        try:
+            handler = ROUTES.get((method, path))
+            if handler is None:
+                if any(p == path for _, p in ROUTES):
+                    raise APIError(HTTPStatus.METHOD_NOT_ALLOWED, "method not allowed")
+                raise APIError(HTTPStatus.NOT_FOUND, "no such endpoint")
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            body = self._read_body() if method == "POST" else {}
+            status, payload = handler(self.db, query, body)
+        except APIError as e:
+            status, payload = e.status, {"error": e.message}
+        except Exception as e:
+            self.log_error("Unhandled error on %s %s: %r", method, path, e)
+            status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "internal error"}
+        self._send_json(status, payload)
+
+    def _read_body(self) -> Dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise APIError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "request body too large")
+        raw = self.rfile.read(length) if length else b"{}"
+        try:
+            body = json.loads(raw or b"{}")
+        except ValueError:
+            raise APIError(HTTPStatus.BAD_REQUEST, "body must be JSON")
+        if not isinstance(body, dict):
+            raise APIError(HTTPStatus.BAD_REQUEST, "body must be a JSON object")
+        return body
+
+    def _send_json(self, status: HTTPStatus, payload: object) -> None:
+        data = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def make_server(
+    db: WeddingDatabase, host: str = API_HOST, port: int = API_PORT
+) -> ThreadingHTTPServer:
+    """Build a threaded server bound to host:port serving `db`."""
+    handler = type("BoundWeddingAPIHandler", (WeddingAPIHandler,), {"db": db})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="JSON API for the wedding database")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--db", default=DB_NAME, help="SQLite file shared with the app")
+    args = parser.parse_args(argv)
+
+    log.setup()  # JSON lines through the queue listener, as in the app
+    server = make_server(WeddingDatabase(args.db), args.host, args.port)
+    print(f"Serving wedding API on http://{args.host}:{args.port}/api (db: {args.db})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
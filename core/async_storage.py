@@ -0,0 +1,80 @@
+"""
+Async storage facade for Tabu weds Mousumi application
+
+AsyncWeddingDatabase mirrors every public WeddingDatabase method as a
+coroutine. The blocking SQLite work runs on a dedicated thread pool, and
+a semaphore bounds how many calls are in flight, so async servers and
+scheduled jobs never block their event loop.
+
+Example:
+    async with AsyncWeddingDatabase() as db:
+        items, guests = await asyncio.gather(
+            db.get_ingredients("Local-List"),
+            db.get_invitees("Invitee-List-Poite-03.12.25"),
+        )
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from config import ASYNC_DB_WORKERS, DB_NAME
+from core.storage import WeddingDatabase
+
+# Methods that hand out connection objects or read per-thread state stay
+# synchronous-only (on the pool they would see a worker thread's state).
+_NOT_MIRRORED = {"get_connection", "pop_last_error", "pop_retry_count"}
+
+
+class AsyncWeddingDatabase:
+    """Awaitable view of a WeddingDatabase backed by its own thread pool."""
+
+    def __init__(
+        self,
+        db_path: str = DB_NAME,
+        max_workers: int = ASYNC_DB_WORKERS,
+        db: Optional[WeddingDatabase] = None,
+    ):
+        self.db = db if db is not None else WeddingDatabase(db_path)
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="wedding-db"
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run any blocking callable on the database thread pool."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, functools.partial(func, *args, **kwargs)
+            )
+
+    async def aclose(self) -> None:
+        """Wait for in-flight calls, then stop the thread pool."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, functools.partial(self._executor.shutdown, wait=True))
+
+    async def __aenter__(self) -> "AsyncWeddingDatabase":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+
+def _mirror(name: str):
+    sync_method = getattr(WeddingDatabase, name)
+
+    @functools.wraps(sync_method)
+    async def method(self: AsyncWeddingDatabase, *args: Any, **kwargs: Any) -> Any:
+        return await self.run(getattr(self.db, name), *args, **kwargs)
+
+    return method
+
+
+for _name, _attr in vars(WeddingDatabase).items():
+    if callable(_attr) and not _name.startswith("_") and _name not in _NOT_MIRRORED:
+        setattr(AsyncWeddingDatabase, _name, _mirror(_name))
@@ -0,0 +1,85 @@
+"""
+Click coalescing for Tabu weds Mousumi application
+
+PendingDeltas buffers ➕/➖ counter changes for one user session. The UI
+shows stored value + pending delta straight away and writes one combined
+delta per counter once the clicks pause (or the user navigates away), so
+a burst of N taps costs one database write instead of N.
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+from core.storage import WeddingDatabase
+
+# (list_name, guest name, counter field)
+CounterKey = Tuple[str, str, str]
+
+
+class PendingDeltas:
+    """Not-yet-written counter deltas of one session."""
+
+    def __init__(self) -> None:
+        self._deltas: Dict[CounterKey, int] = {}
+        self._last_change = 0.0
+
+    def __len__(self) -> int:
+        return len(self._deltas)
+
+    def add(self, key: CounterKey, delta: int, now: Optional[float] = None) -> None:
+        total = self._deltas.get(key, 0) + delta
+        if total:
+            self._deltas[key] = total
+        else:
+            self._deltas.pop(key, None)
+        self._last_change = time.monotonic() if now is None else now
+
+    def get(self, key: CounterKey) -> int:
+        return self._deltas.get(key, 0)
+
+    def discard(self, list_name: str, name: str) -> None:
+        """Forget pending changes for one guest (e.g. before a reset)."""
+        for key in [k for k in self._deltas if k[:2] == (list_name, name)]:
+            del self._deltas[key]
+
+    def is_due(self, idle_seconds: float, now: Optional[float] = None) -> bool:
+        """True once there is something pending and no click for idle_seconds."""
+        now = time.monotonic() if now is None else now
+        return bool(self._deltas) and now - self._last_change >= idle_seconds
+
+    def apply(self, rows: List[Dict], list_name: str) -> List[Dict]:
+        """Copies of invitee rows with the pending deltas added (optimistic view)."""
+        if not any(k[0] == list_name for k in self._deltas):
+            return rows
+        applied = []
+        for row in rows:
+            row = dict(row)
+            for (key_list, key_name, field), delta in self._deltas.items():
+                if key_list == list_name and key_name == row["name"]:
+                    row[field] = int(row.get(field) or 0) + delta
+            applied.append(row)
+        return applied
+
+    def drain(self) -> List[Tuple[CounterKey, int]]:
+        """Remove and return everything pending."""
+        items = list(self._deltas.items())
+        self._deltas.clear()
+        return items
+
+
+def flush(
+    db: WeddingDatabase, pending: PendingDeltas
+) -> List[Tuple[CounterKey, int, Optional[int], Optional[Exception]]]:
+    """
+    Write every pending delta with one atomic increment per counter.
+    Returns (key, delta, new value, error); new value is None when the
+    database refused the change: error is then the database error, or
+    None if the guest is gone or a bound would break.
+    """
+    results = []
+    for key, delta in pending.drain():
+        list_name, name, field = key
+        value = db.increment_invitee_count(list_name, name, field, delta)
+        error = db.pop_last_error() if value is None else None
+        results.append((key, delta, value, error))
+    return results
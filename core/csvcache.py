@@ -0,0 +1,219 @@
+"""
+Pre-parsed CSV cache for Tabu weds Mousumi application
+
+core.ingest.parse_source() turns a source CSV into typed, validated
+columns. This module keeps that result on disk (data/.cache by default),
+keyed by a hash of the CSV's bytes and of the schema, so a cold start on
+unchanged data reads binary columns instead of parsing and validating
+text again:
+
+    data/.cache/invitees-Invitee-List-Poite-03.12.25.3f9c0a1e5b2d7c44.feather
+
+Entries are Feather files, read memory-mapped, when pyarrow is installed
+and pickles otherwise. The validation report travels with the frame (in
+the Feather schema metadata, or in the pickle). An entry whose CSV or
+schema has changed simply no longer matches; it is replaced by the next
+store() for that list. Unreadable entries are deleted and count as misses.
+
+The cache directory is written by this application only: pickle entries
+are code, so do not point it at a directory others can write to.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from core.log import get_logger
+from core.validation import RejectedRow, Schema, ValidationReport
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = get_logger("csvcache")
+
+# Bump when the cached layout or validate() output changes
+FORMAT_VERSION = 1
+_REPORT_KEY = b"wedding_validation_report"
+_BLOCK = 1024 * 1024
+
+
+class _Stats:
+    """Process-wide hit/miss/store counts (read by core.metrics)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.counts = {"hits": 0, "misses": 0, "stores": 0}
+
+    def add(self, name: str) -> None:
+        with self._lock:
+            self.counts[name] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+
+_stats = _Stats()
+
+
+def cache_info() -> Dict[str, int]:
+    """{"hits", "misses", "stores"} since start."""
+    return _stats.snapshot()
+
+
+@functools.lru_cache(maxsize=None)
+def _feather() -> Any:
+    """pyarrow.feather, or None if pyarrow is not installed (imported on first use)."""
+    try:
+        import pyarrow.feather as feather
+    except ImportError:
+        return None
+    return feather
+
+
+def _suffix() -> str:
+    return ".feather" if _feather() is not None else ".pkl"
+
+
+# ---------------------------------------------------------------------
+# Keys
+# ---------------------------------------------------------------------
+def _schema_signature(schema: Schema) -> str:
+    # Check functions are identified by their reason; change it with the check
+    return repr((schema.name, schema.columns, schema.key, [r for r, _ in schema.checks]))
+
+
+def source_digest(path: Path, schema: Schema) -> str:
+    """sha256 of the CSV's bytes, the schema and FORMAT_VERSION."""
+    digest = hashlib.sha256(f"{FORMAT_VERSION}\0{_schema_signature(schema)}\0".encode())
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def entry_path(cache_dir: Path, kind: str, list_name: str, digest: str) -> Path:
+    return Path(cache_dir) / f"{kind}-{list_name}.{digest[:16]}{_suffix()}"
+
+
+def _entries(cache_dir: Path, kind: str, list_name: str) -> List[Path]:
+    prefix = f"{kind}-{list_name}."
+    return [p for p in Path(cache_dir).glob(f"{prefix}*") if p.name[len(prefix):].count(".") == 1]
+
+
+# ---------------------------------------------------------------------
+# Reports
+# ---------------------------------------------------------------------
+def _plain(value: Any) -> Any:
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+def _report_to_json(report: ValidationReport) -> str:
+    return json.dumps(report.as_dict(), default=_plain)
+
+
+def _report_from_json(text: str) -> ValidationReport:
+    data = json.loads(text)
+    report = ValidationReport(data["source"], data["schema"])
+    report.rows_in = data["rows_in"]
+    report.rows_ok = data["rows_ok"]
+    report.renamed = data["renamed"]
+    report.missing_columns = data["missing_columns"]
+    report.unknown_columns = data["unknown_columns"]
+    report.reasons = data["reasons"]
+    report.rejected = [RejectedRow(**r) for r in data["rejected"]]
+    return report
+
+
+# ---------------------------------------------------------------------
+# Load and store
+# ---------------------------------------------------------------------
+def _read(path: Path) -> Tuple["pd.DataFrame", ValidationReport]:
+    feather = _feather()
+    if feather is not None:
+        table = feather.read_table(str(path), memory_map=True)
+        report = _report_from_json(table.schema.metadata[_REPORT_KEY].decode("utf-8"))
+        return table.to_pandas(), report
+    with open(path, "rb") as f:
+        frame, report_json = pickle.load(f)
+    return frame, _report_from_json(report_json)
+
+
+def _write(path: Path, frame: "pd.DataFrame", report: ValidationReport) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        feather = _feather()
+        with os.fdopen(fd, "wb") as f:
+            if feather is not None:
+                import pyarrow as pa
+
+                table = pa.Table.from_pandas(frame, preserve_index=True)
+                metadata = dict(table.schema.metadata or {})
+                metadata[_REPORT_KEY] = _report_to_json(report).encode("utf-8")
+                feather.write_feather(table.replace_schema_metadata(metadata), f)
+            else:
+                pickle.dump((frame, _report_to_json(report)), f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def load(
+    cache_dir: Path, kind: str, list_name: str, digest: str
+) -> Optional[Tuple["pd.DataFrame", ValidationReport]]:
+    """(validated frame, report) cached for this digest, or None."""
+    path = entry_path(cache_dir, kind, list_name, digest)
+    try:
+        result = _read(path)
+    except FileNotFoundError:
+        _stats.add("misses")
+        return None
+    except Exception as e:
+        logger.warning("dropping unreadable cache entry %s: %s", path.name, e)
+        path.unlink(missing_ok=True)
+        _stats.add("misses")
+        return None
+    _stats.add("hits")
+    return result
+
+
+def store(
+    cache_dir: Path,
+    kind: str,
+    list_name: str,
+    digest: str,
+    frame: "pd.DataFrame",
+    report: ValidationReport,
+) -> bool:
+    """Cache a parsed source and drop older entries of the same list."""
+    path = entry_path(cache_dir, kind, list_name, digest)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write(path, frame, report)
+    except Exception as e:
+        logger.warning("could not cache %s: %s", path.name, e)
+        return False
+    for stale in _entries(cache_dir, kind, list_name):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+    _stats.add("stores")
+    return True
+
+
+def clear(cache_dir: Path) -> int:
+    """Delete every cache entry in `cache_dir`; returns how many."""
+    removed = 0
+    for path in Path(cache_dir).glob("*.feather"):
+        path.unlink(missing_ok=True)
+        removed += 1
+    for path in Path(cache_dir).glob("*.pkl"):
+        path.unlink(missing_ok=True)
+        removed += 1
+    return removed
@@ -0,0 +1,239 @@
+"""
+Ingest module for Tabu weds Mousumi application
+
+Knows where the source CSV files live and loads them into the database.
+CSVs are read in chunks of INGEST_CHUNK_ROWS rows and validated by a pool
+of parser workers; a single writer puts them in the database. Parsed CSVs
+are cached in data/.cache (core.csvcache) until their contents change.
+"""
+
+import contextlib
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Union,
+)
+
+from config import (
+    INGEST_CHUNK_ROWS,
+    INGEST_STREAM_MIN_BYTES,
+    INGEST_WORKERS,
+    INGREDIENT_LISTS,
+    INVITEE_LISTS,
+    PARSED_CACHE_DIR_NAME,
+    PARSED_CACHE_ENV_VAR,
+)
+from core import csvcache
+from core.log import get_logger
+from core.storage import LoadBatch
+from core.validation import SCHEMAS, ValidationReport, validate
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from core.storage import WeddingDatabase
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+INGREDIENT_CSV_FILES: Dict[str, Path] = {
+    name: DATA_DIR / "ingredients" / f"{name}.csv" for name in INGREDIENT_LISTS
+}
+INVITEE_CSV_FILES: Dict[str, Path] = {
+    name: DATA_DIR / "invitees" / f"{name}.csv" for name in INVITEE_LISTS
+}
+MENU_CSV: Path = DATA_DIR / "menus" / "Menus-List.csv"
+PARSED_CACHE_DIR: Path = DATA_DIR / PARSED_CACHE_DIR_NAME
+
+logger = get_logger("ingest")
+
+
+def read_csv(path: Path) -> "pd.DataFrame":
+    """Read a source CSV with header whitespace stripped (e.g. 'Travel By ')."""
+    import pandas as pd
+
+    df = pd.read_csv(path)
+    df.columns = df.columns.str.strip()
+    return df
+
+
+def read_csv_chunks(
+    path: "Union[Path, BinaryIO]",
+    chunksize: int = INGEST_CHUNK_ROWS,
+    progress: Optional[Callable[[float], None]] = None,
+) -> Iterator["pd.DataFrame"]:
+    """
+    Stream a source CSV (a path, or a binary file object such as an
+    upload) as DataFrames of at most `chunksize` rows, headers stripped as
+    in read_csv(). After each chunk has been consumed, progress(fraction
+    of the file read) is called, ending with 1.0.
+    """
+    import pandas as pd
+
+    with contextlib.ExitStack() as stack:
+        f = path if hasattr(path, "read") else stack.enter_context(open(path, "rb"))
+        start = f.tell()
+        size = (f.seek(0, os.SEEK_END) - start) or 1
+        f.seek(start)
+        done = 0.0
+        for chunk in pd.read_csv(f, chunksize=chunksize):
+            chunk.columns = chunk.columns.str.strip()
+            yield chunk
+            done = min((f.tell() - start) / size, 1.0)
+            if progress:
+                progress(done)
+    if progress and done < 1.0:
+        progress(1.0)
+
+
+def _log_error(path: Path, error: Exception) -> None:
+    logger.error(
+        "could not load %s: %s",
+        path,
+        error,
+        extra={"op": "load_csv", "outcome": "error", "error_class": type(error).__name__},
+    )
+
+
+def _log_report(list_name: str, report: ValidationReport) -> None:
+    if not report.ok:
+        logger.warning("rejected rows in %s", report.summary())
+
+
+class Source(NamedTuple):
+    """One source CSV: kind ("ingredients", "invitees" or "menus"), list, file."""
+
+    kind: str
+    list_name: str
+    path: Path
+
+
+def configured_sources(existing_only: bool = True) -> List[Source]:
+    """The configured CSVs (that exist), ingredient lists first."""
+    sources = [Source("ingredients", n, p) for n, p in INGREDIENT_CSV_FILES.items()]
+    sources += [Source("invitees", n, p) for n, p in INVITEE_CSV_FILES.items()]
+    sources.append(Source("menus", "menus", MENU_CSV))
+    return [s for s in sources if s.path.exists() or not existing_only]
+
+
+def parse_source(
+    source: Source, chunksize: int = INGEST_CHUNK_ROWS, cache_dir: Optional[Path] = None
+) -> LoadBatch:
+    """
+    Read and validate one source CSV (runs in a parser worker). With a
+    `cache_dir`, an unchanged CSV is read from its cached columns instead,
+    and a parsed one is cached.
+    """
+    import pandas as pd
+
+    schema = SCHEMAS[source.kind]
+    digest = None
+    if cache_dir is not None:
+        digest = csvcache.source_digest(source.path, schema)
+        cached = csvcache.load(cache_dir, source.kind, source.list_name, digest)
+        if cached is not None:
+            frame, report = cached
+            return LoadBatch(source.kind, source.list_name, [frame], report, validated=True)
+
+    report = ValidationReport(source.path.name, schema.name)
+    frames = [validate(chunk, schema, report) for chunk in read_csv_chunks(source.path, chunksize)]
+    # Not if the file changed while it was read: the digest would not match
+    if frames and digest is not None and digest == csvcache.source_digest(source.path, schema):
+        frame = frames[0] if len(frames) == 1 else pd.concat(frames)
+        csvcache.store(cache_dir, source.kind, source.list_name, digest, frame, report)
+    return LoadBatch(source.kind, source.list_name, frames, report, validated=True)
+
+
+def load_initial_data(
+    db: "WeddingDatabase",
+    on_error: Optional[Callable[[Path, Exception], None]] = None,
+    progress: Optional[Callable[[str, float], None]] = None,
+    chunksize: int = INGEST_CHUNK_ROWS,
+    on_report: Optional[Callable[[str, ValidationReport], None]] = None,
+    sources: Optional[List[Source]] = None,
+    workers: int = INGEST_WORKERS,
+    processes: bool = False,
+    cache_dir: Optional[Path] = PARSED_CACHE_DIR,
+) -> Dict[str, bool]:
+    """
+    Load every configured CSV (or `sources`) into the database, replacing
+    those lists. Missing files are skipped. Returns {list name: loaded ok}.
+
+    Files are parsed and validated by a pool of `workers` threads (or
+    processes) and written, in the order they finish, in one transaction:
+    total time follows the slowest file rather than the sum. Files of
+    INGEST_STREAM_MIN_BYTES or more are instead streamed in chunks
+    afterwards, each in its own transaction, so memory stays bounded.
+    Pooled files are cached parsed in `cache_dir` (None, or
+    WEDDING_PARSED_CACHE=0, always parses).
+
+    progress(list name, fraction) is called as lists are written and
+    on_report(list name, report) with the rows validation left out (by
+    default logged if there are any). Callbacks run on the calling thread.
+    """
+    on_error = on_error or _log_error
+    on_report = on_report or _log_report
+    results: Dict[str, bool] = {}
+    sources = configured_sources() if sources is None else sources
+    if os.environ.get(PARSED_CACHE_ENV_VAR) == "0":
+        cache_dir = None
+    small = [s for s in sources if s.path.stat().st_size < INGEST_STREAM_MIN_BYTES]
+    large = [s for s in sources if s not in small]
+
+    written: List[LoadBatch] = []
+    pool_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with pool_class(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(parse_source, s, chunksize, cache_dir): s for s in small}
+
+        def parsed() -> Iterator[LoadBatch]:
+            for future in as_completed(futures):
+                source = futures[future]
+                try:
+                    batch = future.result()
+                except Exception as e:
+                    results[source.list_name] = False
+                    on_error(source.path, e)
+                    continue
+                written.append(batch)
+                yield batch
+                if progress:
+                    progress(source.list_name, 1.0)
+
+        ok = db.load_batches(parsed()) if small else True
+    error = None if ok else db.pop_last_error()
+    for source in small:
+        if source.list_name not in results:
+            results[source.list_name] = ok
+            if error is not None:
+                on_error(source.path, error)
+    if ok:
+        for batch in written:
+            on_report(batch.list_name, batch.report)
+
+    for source in large:
+        on_progress = (lambda f, name=source.list_name: progress(name, f)) if progress else None
+        report = ValidationReport(source.path.name, SCHEMAS[source.kind].name)
+        batch = LoadBatch(
+            source.kind,
+            source.list_name,
+            read_csv_chunks(source.path, chunksize, on_progress),
+            report,
+        )
+        results[source.list_name] = db.load_batches([batch])
+        if results[source.list_name]:
+            on_report(source.list_name, report)
+        else:
+            # Read errors surface inside the loader, which swallows them
+            error = db.pop_last_error()
+            if error is not None:
+                on_error(source.path, error)
+
+    return results
@@ -0,0 +1,282 @@
+"""
+Database call instrumentation for Tabu weds Mousumi application
+
+InstrumentedDatabase wraps a WeddingDatabase and records, per method, call
+counts, a latency histogram, rows returned, swallowed errors and lock
+retries. Calls are also tallied per script rerun and per scope (a tab or
+an action, see set_scope), so the busiest part of the UI is easy to spot.
+
+Statistics live in a process-wide registry (like core.startup), shared by
+every session; snapshot() returns them as plain JSON-ready data.
+
+Example:
+    db = instrument(WeddingDatabase())
+    run = begin_run()
+    set_scope("Invitees tab")
+    db.get_invitees("Invitee-List-Poite-03.12.25")
+    end_run(run)
+    print(json.dumps(snapshot(), indent=2))
+"""
+
+import contextvars
+import json
+import threading
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional
+
+# Upper bounds of the latency histogram buckets, in ms
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, float("inf"))
+# Reruns per scope kept for the "recent" view
+RUN_HISTORY = 50
+
+OUTSIDE_RUN_SCOPE = "callbacks"
+
+
+class MethodStats:
+    """Counters for one WeddingDatabase method."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.rows = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS_MS)
+
+    def record(self, ms: float, rows: int, error: bool, retries: int) -> None:
+        self.calls += 1
+        self.errors += error
+        self.retries += retries
+        self.rows += rows
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                break
+
+    def quantile_ms(self, q: float) -> float:
+        """Upper bound of the bucket holding quantile q (0..1)."""
+        target = q * self.calls
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets):
+            seen += count
+            if count and seen >= target:
+                return self.max_ms if bound == float("inf") else bound
+        return 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "rows": self.rows,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "p50_ms": self.quantile_ms(0.50),
+            "p95_ms": self.quantile_ms(0.95),
+            "max_ms": round(self.max_ms, 3),
+            "histogram": {
+                ("inf" if b == float("inf") else f"<={b:g}ms"): n
+                for b, n in zip(LATENCY_BUCKETS_MS, self.buckets)
+            },
+        }
+
+
+class RunCalls:
+    """Database calls made during one script rerun, by (scope, method)."""
+
+    def __init__(self) -> None:
+        self.calls: Counter = Counter()
+        self.scope = "setup"
+        self.finished = False
+
+
+class Instrumentation:
+    """Thread-safe registry of method statistics and per-rerun scope tallies."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._methods: Dict[str, MethodStats] = {}
+        # scope -> recent per-rerun call counts (reruns where the scope was active)
+        self._scope_runs: Dict[str, Deque[int]] = {}
+        self._scope_methods: Dict[str, Counter] = {}
+        self._reruns = 0
+        self._run: contextvars.ContextVar = contextvars.ContextVar("db_run", default=None)
+        # Calls made by widget callbacks, which run before the script body
+        self._pending = threading.local()
+
+    # -- recording ---------------------------------------------------------
+    def record(self, method: str, ms: float, rows: int, error: bool, retries: int) -> None:
+        with self._lock:
+            stats = self._methods.get(method)
+            if stats is None:
+                stats = self._methods[method] = MethodStats()
+            stats.record(ms, rows, error, retries)
+        run = self._run.get()
+        if run is not None and not run.finished:
+            run.calls[(run.scope, method)] += 1
+        else:
+            pending = getattr(self._pending, "calls", None)
+            if pending is None:
+                pending = self._pending.calls = Counter()
+            pending[(OUTSIDE_RUN_SCOPE, method)] += 1
+
+    # -- reruns and scopes -------------------------------------------------
+    def begin_run(self, previous: Optional[RunCalls] = None) -> RunCalls:
+        """
+        Start counting a rerun in the current context. Pass the previous
+        run of the same session to close it if it never reached end_run
+        (e.g. it was cut short by st.rerun()).
+        """
+        if previous is not None:
+            self.end_run(previous)
+        run = RunCalls()
+        run.calls.update(getattr(self._pending, "calls", None) or {})
+        self._pending.calls = None
+        self._run.set(run)
+        return run
+
+    def set_scope(self, name: str) -> None:
+        """Attribute the following calls of this rerun to `name`."""
+        run = self._run.get()
+        if run is not None:
+            run.scope = name
+
+    def end_run(self, run: RunCalls) -> Dict[str, int]:
+        """Fold a finished rerun into the scope tallies; returns calls per scope."""
+        per_scope: Counter = Counter()
+        for (scope, _), count in run.calls.items():
+            per_scope[scope] += count
+        if run.finished:
+            return dict(per_scope)
+        run.finished = True
+        with self._lock:
+            self._reruns += 1
+            for scope, count in per_scope.items():
+                self._scope_runs.setdefault(scope, deque(maxlen=RUN_HISTORY)).append(count)
+            for (scope, method), count in run.calls.items():
+                self._scope_methods.setdefault(scope, Counter())[method] += count
+        return dict(per_scope)
+
+    # -- reporting ---------------------------------------------------------
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            methods = {name: s.as_dict() for name, s in sorted(self._methods.items())}
+            scopes = {}
+            for scope, runs in self._scope_runs.items():
+                scopes[scope] = {
+                    "reruns": len(runs),
+                    "last_calls": runs[-1],
+                    "mean_calls_per_rerun": round(sum(runs) / len(runs), 2),
+                    "max_calls_per_rerun": max(runs),
+                    "top_methods": dict(self._scope_methods[scope].most_common(5)),
+                }
+            reruns = self._reruns
+        return {
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "reruns": reruns,
+            "methods": methods,
+            "scopes": dict(
+                sorted(scopes.items(), key=lambda kv: -kv[1]["mean_calls_per_rerun"])
+            ),
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._methods.clear()
+            self._scope_runs.clear()
+            self._scope_methods.clear()
+            self._reruns = 0
+
+
+class InstrumentedDatabase:
+    """
+    Drop-in proxy for WeddingDatabase that times every public method call.
+    pop_last_error()/pop_retry_count() keep working: the proxy reads them
+    after each call and hands them on unchanged.
+    """
+
+    def __init__(self, db, registry: Optional[Instrumentation] = None) -> None:
+        self._db = db
+        self._registry = registry or _registry
+        self._local = threading.local()
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._db, name)
+        if name.startswith("_") or name == "get_connection" or not callable(attr):
+            return attr
+
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            result = None
+            raised = True
+            try:
+                result = attr(*args, **kwargs)
+                raised = False
+                return result
+            finally:
+                # Also for calls that raise: they count as errors
+                ms = (time.perf_counter() - start) * 1000.0
+                error = self._db.pop_last_error()
+                retries = self._db.pop_retry_count()
+                self._local.last_error = error
+                self._local.retries = getattr(self._local, "retries", 0) + retries
+                if isinstance(result, list):
+                    rows = len(result)
+                elif isinstance(result, dict):
+                    rows = 1
+                else:
+                    rows = 0
+                self._registry.record(name, ms, rows, raised or error is not None, retries)
+
+        timed.__name__ = name
+        timed.__doc__ = attr.__doc__
+        return timed
+
+    def pop_last_error(self) -> Optional[Exception]:
+        error = getattr(self._local, "last_error", None)
+        self._local.last_error = None
+        return error
+
+    def pop_retry_count(self) -> int:
+        retries = getattr(self._local, "retries", 0)
+        self._local.retries = 0
+        return retries
+
+
+_registry = Instrumentation()
+
+
+def instrument(db) -> InstrumentedDatabase:
+    """Wrap `db` so its calls are recorded in the process-wide registry."""
+    return InstrumentedDatabase(db, _registry)
+
+
+def begin_run(previous: Optional[RunCalls] = None) -> RunCalls:
+    return _registry.begin_run(previous)
+
+
+def set_scope(name: str) -> None:
+    _registry.set_scope(name)
+
+
+def end_run(run: RunCalls) -> Dict[str, int]:
+    return _registry.end_run(run)
+
+
+def snapshot() -> Dict[str, Any]:
+    """All statistics as JSON-ready data."""
+    return _registry.snapshot()
+
+
+def dump(path: Path) -> None:
+    """Write snapshot() to `path` as JSON."""
+    Path(path).write_text(json.dumps(snapshot(), indent=2))
+
+
+def reset() -> None:
+    _registry.reset()
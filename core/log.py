@@ -0,0 +1,166 @@
+"""
+Structured logging for Tabu weds Mousumi application
+
+Everything under the "wedding" logger can be written as JSON lines, one
+object per record:
+
+    {"ts": "2025-12-03T10:15:02.114", "level": "ERROR",
+     "logger": "wedding.storage", "msg": "getting ingredients failed: ...",
+     "op": "get_ingredients", "duration_ms": 30012.4, "outcome": "error",
+     "error_class": "OperationalError", "error": "database is locked"}
+
+setup() puts a QueueHandler on that logger and starts a QueueListener
+thread that does the formatting and I/O, so a log call on a hot path only
+costs a queue put. Until setup() is called, records propagate to the root
+logger as usual (warnings and errors still reach stderr).
+
+log_operation() is the one call for timed operations: successes are DEBUG
+records (skipped cheaply at the default level), failures are ERROR records
+and are counted per error class in a process-wide registry, whether or
+not logging is set up.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from config import LOG_FILE, LOG_LEVEL, LOG_LEVEL_ENV_VAR
+
+LOGGER_NAME = "wedding"
+# Record attributes (passed with extra=) copied into the JSON object
+FIELDS = ("op", "duration_ms", "outcome", "error_class", "error")
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created))
+            + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for field in FIELDS:
+            if hasattr(record, field):
+                entry[field] = getattr(record, field)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class ErrorCounters:
+    """Thread-safe failure counts by (operation, error class)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: Counter = Counter()
+
+    def add(self, op: str, error_class: str) -> None:
+        with self._lock:
+            self._counts[(op, error_class)] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """{error class: {operation: count}}"""
+        with self._lock:
+            counts = dict(self._counts)
+        by_class: Dict[str, Dict[str, int]] = {}
+        for (op, error_class), count in sorted(counts.items()):
+            by_class.setdefault(error_class, {})[op] = count
+        return by_class
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+_counters = ErrorCounters()
+_listener: Optional[logging.handlers.QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger `wedding.<name>`."""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+def log_operation(
+    logger: logging.Logger,
+    op: str,
+    duration_ms: float,
+    error: Optional[BaseException] = None,
+    message: str = "",
+) -> None:
+    """Record one finished operation; failures are also counted by class."""
+    if error is None:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "%s ok",
+                op,
+                extra={"op": op, "duration_ms": round(duration_ms, 3), "outcome": "ok"},
+            )
+        return
+    error_class = type(error).__name__
+    _counters.add(op, error_class)
+    logger.error(
+        "%s failed: %s",
+        message or op,
+        error,
+        extra={
+            "op": op,
+            "duration_ms": round(duration_ms, 3),
+            "outcome": "error",
+            "error_class": error_class,
+            "error": str(error),
+        },
+    )
+
+
+def error_counts() -> Dict[str, Dict[str, int]]:
+    """Failures since start (or reset_error_counts) by error class and operation."""
+    return _counters.snapshot()
+
+
+def reset_error_counts() -> None:
+    _counters.reset()
+
+
+def setup(
+    level: Optional[str] = None, path: Optional[str] = None, stream: Any = None
+) -> logging.handlers.QueueListener:
+    """
+    Send "wedding" records as JSON lines to `path` (LOG_FILE) or, if no
+    file is configured, to `stream` (stderr), via a background listener.
+    Safe to call more than once; later calls return the running listener.
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return _listener
+        level = level or os.environ.get(LOG_LEVEL_ENV_VAR) or LOG_LEVEL
+        path = path if path is not None else LOG_FILE
+        if path:
+            handler: logging.Handler = logging.FileHandler(path, encoding="utf-8")
+        else:
+            handler = logging.StreamHandler(stream or sys.stderr)
+        handler.setFormatter(JsonFormatter())
+
+        records: "queue.SimpleQueue" = queue.SimpleQueue()
+        logger = logging.getLogger(LOGGER_NAME)
+        logger.setLevel(level.upper())
+        logger.addHandler(logging.handlers.QueueHandler(records))
+        logger.propagate = False
+
+        _listener = logging.handlers.QueueListener(records, handler)
+        _listener.start()
+        atexit.register(_listener.stop)
+        return _listener
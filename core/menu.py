@@ -0,0 +1,202 @@
+"""
+Menu engine for Tabu weds Mousumi application
+
+Splits raw menu text into dishes and classifies every dish into a menu
+category and a veg / non-veg flag with one compiled keyword matcher.
+The keyword tables live in config.py.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Tuple
+
+from config import (
+    MENU_CACHE_SIZE,
+    MENU_CATEGORIES,
+    MENU_CATEGORY_KEYWORDS,
+    MENU_DEFAULT_CATEGORY,
+    NONVEG_KEYWORDS,
+)
+
+# Bump whenever the keyword tables or the matching rules change, so that
+# anything cached on classification results gets invalidated.
+CLASSIFIER_VERSION = 1
+
+_CATEGORY_ORDER = list(MENU_CATEGORY_KEYWORDS)
+_NO_CATEGORY = len(_CATEGORY_ORDER)
+
+
+def _build_keyword_table() -> Dict[str, Tuple[int, bool]]:
+    """Map each keyword to (best category priority, is non-veg)."""
+    table: Dict[str, Tuple[int, bool]] = {}
+    for priority, keywords in enumerate(MENU_CATEGORY_KEYWORDS.values()):
+        for keyword in keywords:
+            best, nonveg = table.get(keyword, (_NO_CATEGORY, False))
+            table[keyword] = (min(best, priority), nonveg)
+    for keyword in NONVEG_KEYWORDS:
+        best, _ = table.get(keyword, (_NO_CATEGORY, False))
+        table[keyword] = (best, True)
+
+    # The matcher reports only the longest keyword starting at a position,
+    # which hides any shorter keyword that is a prefix of it. Fold the
+    # attributes of those prefixes into the longer keyword.
+    merged = {}
+    for keyword, (best, nonveg) in table.items():
+        for other, (other_best, other_nonveg) in table.items():
+            if other != keyword and keyword.startswith(other):
+                best = min(best, other_best)
+                nonveg = nonveg or other_nonveg
+        merged[keyword] = (best, nonveg)
+    return merged
+
+
+_KEYWORDS = _build_keyword_table()
+
+# Zero-width lookahead so overlapping keywords are all seen in one scan;
+# longest alternatives first so the prefix folding above holds.
+_MATCHER = re.compile(
+    "(?=("
+    + "|".join(re.escape(k) for k in sorted(_KEYWORDS, key=len, reverse=True))
+    + "))"
+)
+
+
+def normalize_dish_name(item: str) -> str:
+    """Normalize a dish name for matching and caching."""
+    return str(item).strip().lower()
+
+
+@lru_cache(maxsize=4096)
+def _classify_normalized(name: str) -> Tuple[str, str]:
+    priority = _NO_CATEGORY
+    nonveg = False
+    for match in _MATCHER.finditer(name):
+        keyword_priority, keyword_nonveg = _KEYWORDS[match.group(1)]
+        priority = min(priority, keyword_priority)
+        nonveg = nonveg or keyword_nonveg
+        if priority == 0 and nonveg:
+            break
+    category = (
+        _CATEGORY_ORDER[priority] if priority < _NO_CATEGORY else MENU_DEFAULT_CATEGORY
+    )
+    return category, "non-veg" if nonveg else "veg"
+
+
+def classify_dish(item: str) -> Tuple[str, str]:
+    """Return (category, veg_flag) for one dish."""
+    return _classify_normalized(normalize_dish_name(item))
+
+
+def classify_menu_item(item: str) -> str:
+    """Return the menu category of a dish."""
+    return classify_dish(item)[0]
+
+
+def detect_veg_flag(item: str) -> str:
+    """Return "veg" or "non-veg" for a dish."""
+    return classify_dish(item)[1]
+
+
+def classify_menu(items: Iterable[str]) -> List[Dict[str, str]]:
+    """Classify a whole menu at once; repeated dishes are matched only once."""
+    results: Dict[str, Tuple[str, str]] = {}
+    classified = []
+    for item in items:
+        name = normalize_dish_name(item)
+        if name not in results:
+            results[name] = _classify_normalized(name)
+        category, veg_flag = results[name]
+        classified.append({"name": item, "category": category, "veg_flag": veg_flag})
+    return classified
+
+
+def split_menu_items(raw: str) -> List[str]:
+    """Split raw menu text (comma and/or newline separated) into dishes."""
+    if not raw:
+        return []
+    parts: List[str] = []
+    for line in str(raw).splitlines():
+        for piece in line.split(","):
+            item = piece.strip()
+            if item:
+                parts.append(item)
+    return parts
+
+
+class Dish(NamedTuple):
+    name: str
+    category: str
+    veg_flag: str
+
+
+class ParsedMenu(NamedTuple):
+    """Immutable, structured view of one raw menu text."""
+
+    items: Tuple[str, ...]
+    by_category: Mapping[str, Tuple[Dish, ...]]
+
+
+_menu_cache: "OrderedDict[Tuple[str, int], ParsedMenu]" = OrderedDict()
+_menu_cache_lock = threading.Lock()
+_menu_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _menu_key(raw: str) -> Tuple[str, int]:
+    digest = hashlib.sha1(str(raw or "").encode("utf-8")).hexdigest()
+    return digest, CLASSIFIER_VERSION
+
+
+def _parse_menu_uncached(raw: str) -> ParsedMenu:
+    items = split_menu_items(raw)
+    grouped: Dict[str, List[Dish]] = {c: [] for c in MENU_CATEGORIES}
+    for dish in classify_menu(items):
+        grouped.setdefault(dish["category"], []).append(Dish(**dish))
+    return ParsedMenu(
+        items=tuple(items),
+        by_category=MappingProxyType({c: tuple(d) for c, d in grouped.items()}),
+    )
+
+
+def parse_menu(raw: str) -> ParsedMenu:
+    """Split and classify a raw menu, memoized by menu text and classifier version."""
+    key = _menu_key(raw)
+    with _menu_cache_lock:
+        parsed = _menu_cache.get(key)
+        if parsed is not None:
+            _menu_cache.move_to_end(key)
+            _menu_cache_stats["hits"] += 1
+            return parsed
+        _menu_cache_stats["misses"] += 1
+
+    parsed = _parse_menu_uncached(raw)
+    with _menu_cache_lock:
+        _menu_cache[key] = parsed
+        while len(_menu_cache) > MENU_CACHE_SIZE:
+            _menu_cache.popitem(last=False)
+    return parsed
+
+
+def build_menu_structure(raw: str) -> Mapping[str, Tuple[Dish, ...]]:
+    """Group the dishes of a raw menu by category (read-only, memoized)."""
+    return parse_menu(raw).by_category
+
+
+def menu_cache_info() -> Dict[str, int]:
+    """Hit/miss counters and current size of the parsed-menu cache."""
+    with _menu_cache_lock:
+        return dict(_menu_cache_stats, size=len(_menu_cache), maxsize=MENU_CACHE_SIZE)
+
+
+def clear_menu_cache() -> None:
+    """Drop all parsed menus (e.g. after the keyword tables change)."""
+    with _menu_cache_lock:
+        _menu_cache.clear()
+
+
+def classifier_cache_info():
+    """Expose the per-dish memoization statistics."""
+    return _classify_normalized.cache_info()
@@ -0,0 +1,378 @@
+"""
+Prometheus metrics for Tabu weds Mousumi application
+
+Counters, gauges and histograms in the Prometheus text exposition format,
+exported either as a file (for node_exporter's textfile collector) or on a
+side port at /metrics.
+
+Hot paths only ever do a locked increment (e.g. one histogram observation
+per rerun). Everything else is gathered at scrape time by collectors that
+read numbers the app already keeps:
+
+- database_collector: per-method call counts, errors, retries and latency
+  histograms from core.instrumentation
+- error_collector: failed operations by error class from core.log
+- cache_collector: parsed-menu, dish-classifier and parsed-CSV cache
+  hits/misses
+- event_collector(db): items by delivery status and guests/headcount per
+  list, from WeddingDatabase and core.reports
+
+Example:
+    register_collector(event_collector(db))
+    start_http_server(9108)            # or start_file_writer("wedding.prom")
+"""
+
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from config import INGREDIENT_LISTS, INVITEE_LISTS, METRICS_FILE_INTERVAL_SECONDS, METRICS_HOST
+from core.log import get_logger
+
+logger = get_logger("metrics")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# (metric name, type, help, [(labels, value[, name suffix])])
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+Collector = Callable[[], Iterable[Family]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _value(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) and not v.is_integer() else str(int(v))
+
+
+# ---------------------------------------------------------------------
+# Metric types
+# ---------------------------------------------------------------------
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def collect(self) -> Family:
+        with self._lock:
+            values = list(self._values.items())
+        return (
+            self.name,
+            self.type,
+            self.help,
+            [(dict(zip(self.labelnames, key)), v) for key, v in values],
+        )
+
+
+class Counter(_Metric):
+    """Monotonic count; name should end in _total."""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    type = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts plus _sum and _count (no labels)."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Sequence[float]):
+        super().__init__(name, help)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._counts = [0] * len(self.buckets)
+        self._sum = 0.0
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._sum += value
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self._counts[i] += 1
+                    break
+
+    def collect(self) -> Family:
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+        return histogram_family(self.name, self.help, self.buckets, counts, total, {})
+
+
+def histogram_family(
+    name: str,
+    help: str,
+    bounds: Sequence[float],
+    counts: Sequence[int],
+    total: float,
+    labels: Dict[str, str],
+) -> Family:
+    """Histogram samples from per-bucket (non-cumulative) counts."""
+    samples = []
+    cumulative = 0
+    for bound, count in zip(bounds, counts):
+        cumulative += count
+        samples.append(({**labels, "le": _value(bound)}, cumulative, "_bucket"))
+    samples.append((labels, total, "_sum"))
+    samples.append((labels, cumulative, "_count"))
+    return (name, "histogram", help, samples)
+
+
+# ---------------------------------------------------------------------
+# Registry and exposition
+# ---------------------------------------------------------------------
+class Registry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Collector] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Collector) -> None:
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics, collectors = list(self._metrics), list(self._collectors)
+        families = [m.collect() for m in metrics]
+        for collector in collectors:
+            try:
+                families.extend(collector())
+            except Exception:
+                logger.exception("collecting metrics failed")
+        lines = []
+        for name, kind, help, samples in families:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample in samples:
+                labels, value = sample[0], sample[1]
+                suffix = sample[2] if len(sample) > 2 else ""
+                lines.append(f"{name}{suffix}{_labels(labels)} {_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+RERUN_SECONDS = REGISTRY.register(
+    Histogram(
+        "wedding_rerun_duration_seconds",
+        "Wall time of complete Streamlit reruns.",
+        (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10),
+    )
+)
+
+
+def register_collector(collector: Collector) -> None:
+    REGISTRY.register_collector(collector)
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+# ---------------------------------------------------------------------
+# Collectors
+# ---------------------------------------------------------------------
+def database_collector() -> List[Family]:
+    """Per-method database statistics recorded by core.instrumentation."""
+    from core import instrumentation
+
+    bounds = [b / 1000.0 for b in instrumentation.LATENCY_BUCKETS_MS]
+    calls, errors, retries, rows, latency = [], [], [], [], []
+    for method, s in instrumentation.snapshot()["methods"].items():
+        labels = {"method": method}
+        calls.append((labels, s["calls"]))
+        errors.append((labels, s["errors"]))
+        retries.append((labels, s["retries"]))
+        rows.append((labels, s["rows"]))
+        latency.extend(
+            histogram_family(
+                "", "", bounds, list(s["histogram"].values()), s["total_ms"] / 1000.0, labels
+            )[3]
+        )
+    return [
+        ("wedding_db_calls_total", "counter", "WeddingDatabase method calls.", calls),
+        ("wedding_db_errors_total", "counter", "Calls that raised or swallowed an error.", errors),
+        ("wedding_db_retries_total", "counter", "Database lock retries.", retries),
+        ("wedding_db_rows_total", "counter", "Rows returned by read methods.", rows),
+        ("wedding_db_call_duration_seconds", "histogram", "Method call latency.", latency),
+    ]
+
+
+def error_collector() -> List[Family]:
+    """Failed operations by error class, counted by core.log."""
+    from core import log
+
+    failures = [
+        ({"error_class": error_class, "op": op}, count)
+        for error_class, ops in log.error_counts().items()
+        for op, count in ops.items()
+    ]
+    return [("wedding_failures_total", "counter", "Failed operations by error class.", failures)]
+
+
+def cache_collector() -> List[Family]:
+    """Hit/miss counters of the menu caches and of core.csvcache."""
+    from core import csvcache, menu
+
+    parsed = menu.menu_cache_info()
+    dishes = menu.classifier_cache_info()
+    csvs = csvcache.cache_info()
+    return [
+        (
+            "wedding_cache_hits_total",
+            "counter",
+            "Cache hits.",
+            [
+                ({"cache": "parsed_menu"}, parsed["hits"]),
+                ({"cache": "dish_class"}, dishes.hits),
+                ({"cache": "parsed_csv"}, csvs["hits"]),
+            ],
+        ),
+        (
+            "wedding_cache_misses_total",
+            "counter",
+            "Cache misses.",
+            [
+                ({"cache": "parsed_menu"}, parsed["misses"]),
+                ({"cache": "dish_class"}, dishes.misses),
+                ({"cache": "parsed_csv"}, csvs["misses"]),
+            ],
+        ),
+        (
+            "wedding_cache_entries",
+            "gauge",
+            "Entries currently cached.",
+            [
+                ({"cache": "parsed_menu"}, parsed["size"]),
+                ({"cache": "dish_class"}, dishes.currsize),
+            ],
+        ),
+    ]
+
+
+def event_collector(db) -> Collector:
+    """Delivery and guest numbers per list, read from `db` at scrape time."""
+    from core import reports
+
+    def collect() -> List[Family]:
+        items, quantity, guests, headcount = [], [], [], []
+        for list_name in INGREDIENT_LISTS:
+            summary = reports.ingredient_summary(db.get_ingredients(list_name))
+            items.append(({"list": list_name, "status": "Completed"}, len(summary.completed)))
+            items.append(({"list": list_name, "status": "Incomplete"}, len(summary.incomplete)))
+            quantity.append(({"list": list_name, "status": "Completed"}, summary.completed_qty))
+            quantity.append(({"list": list_name, "status": "Incomplete"}, summary.incomplete_qty))
+        for list_name in INVITEE_LISTS:
+            guests.append(({"list": list_name}, len(db.get_invitees(list_name))))
+            headcount.append(({"list": list_name}, db.get_total_headcount(list_name)))
+        return [
+            ("wedding_ingredient_items", "gauge", "Ingredient items by delivery status.", items),
+            ("wedding_ingredient_quantity", "gauge", "Ingredient quantity by status.", quantity),
+            ("wedding_guests", "gauge", "Guest entries per invitee list.", guests),
+            ("wedding_headcount", "gauge", "Total lunch headcount per invitee list.", headcount),
+        ]
+
+    return collect
+
+
+register_collector(database_collector)
+register_collector(error_collector)
+register_collector(cache_collector)
+
+
+# ---------------------------------------------------------------------
+# Exporters
+# ---------------------------------------------------------------------
+def write_textfile(path: Path) -> None:
+    """Write render() to path atomically (temp file + rename)."""
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(render())
+    os.replace(tmp, path)
+
+
+def start_file_writer(
+    path: Path, interval: float = METRICS_FILE_INTERVAL_SECONDS
+) -> threading.Thread:
+    """Rewrite the metrics file every `interval` seconds on a daemon thread."""
+    stop = threading.Event()
+
+    def loop() -> None:
+        while not stop.is_set():
+            try:
+                write_textfile(path)
+            except OSError as e:
+                logger.error("writing metrics file failed: %s", e)
+            stop.wait(interval)
+
+    thread = threading.Thread(target=loop, name="metrics-file", daemon=True)
+    thread.start()
+    return thread
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.split("?")[0].rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        data = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args) -> None:
+        pass  # scrapes every few seconds would flood stderr
+
+
+def start_http_server(port: int, host: str = METRICS_HOST) -> ThreadingHTTPServer:
+    """Serve /metrics on host:port from a daemon thread."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
@@ -0,0 +1,207 @@
+"""
+Prebuilt database for Tabu weds Mousumi application
+
+Compiles every source CSV under data/ into one SQLite file, ready to open:
+loaded through the normal ingest path, then ANALYZEd (so the planner has
+statistics for the UNIQUE indexes every lookup uses) and VACUUMed into a
+single compact file without a WAL. A build_info table records a
+fingerprint of the sources it was built from.
+
+On start the app calls prepare():
+
+- "current"   - the working database already holds these sources (it was
+                installed or loaded from them earlier): nothing to load
+- "installed" - the prebuilt file matches the sources: it is copied into
+                the working database, nothing to load
+- "stale"     - neither matches: the app loads the CSVs as before and then
+                stamp()s the working database, so the next start is "current"
+
+The fingerprint hashes the CSV contents and schemas (not modification
+times, which a git checkout resets), so an edited CSV makes the prebuilt
+file stale until it is built again.
+
+Build:
+    python -m core.prebuilt [--out data/wedding_prebuilt.db] [--check]
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from config import DB_NAME, PREBUILT_DB_NAME
+from core import csvcache, ingest
+from core.log import get_logger
+from core.validation import SCHEMAS
+
+logger = get_logger("prebuilt")
+
+# Bump when the table layout changes, so older builds count as stale
+BUILD_FORMAT = 1
+PREBUILT_DB_PATH: Path = ingest.DATA_DIR / PREBUILT_DB_NAME
+# How long install() waits for other connections' writes to finish
+INSTALL_LOCK_TIMEOUT = 5.0
+
+
+class Prepared(NamedTuple):
+    state: str  # "current", "installed" or "stale"
+    fingerprint: str
+
+
+def source_fingerprint(
+    sources: Optional[List[ingest.Source]] = None, digests: Optional[Dict[Path, str]] = None
+) -> str:
+    """
+    Hash of the sources' lists, contents and schemas. `digests` supplies
+    known csvcache.source_digest() values by path instead of reading files.
+    """
+    sources = ingest.configured_sources() if sources is None else sources
+    digests = digests or {}
+    digest = hashlib.sha256(f"build {BUILD_FORMAT}\n".encode())
+    for source in sorted(sources, key=lambda s: (s.kind, s.list_name)):
+        content = digests.get(source.path) or csvcache.source_digest(
+            source.path, SCHEMAS[source.kind]
+        )
+        digest.update(f"{source.kind}\0{source.list_name}\0{content}\n".encode())
+    return digest.hexdigest()
+
+
+def read_build_info(db_path: Path) -> Dict[str, str]:
+    """The build_info of a database file; {} if it has none or is unreadable."""
+    if not Path(db_path).exists():
+        return {}
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            return dict(conn.execute("SELECT key, value FROM build_info").fetchall())
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return {}
+
+
+def stamp(db_path: Path, fingerprint: str, **info: str) -> None:
+    """Record that `db_path` holds the sources with this fingerprint."""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        conn.execute("CREATE TABLE IF NOT EXISTS build_info (key TEXT PRIMARY KEY, value TEXT)")
+        conn.executemany(
+            "INSERT OR REPLACE INTO build_info (key, value) VALUES (?, ?)",
+            [("fingerprint", fingerprint), *info.items()],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def build(
+    out: Path = PREBUILT_DB_PATH, sources: Optional[List[ingest.Source]] = None
+) -> Dict[str, str]:
+    """Build the prebuilt database at `out` (replaced atomically); returns its build_info."""
+    from core.storage import WeddingDatabase
+
+    out = Path(out)
+    sources = ingest.configured_sources() if sources is None else sources
+    fingerprint = source_fingerprint(sources)
+    errors: List[str] = []
+    fd, tmp = tempfile.mkstemp(dir=out.parent, prefix=f".{out.name}.", suffix=".db")
+    os.close(fd)
+    try:
+        results = ingest.load_initial_data(
+            WeddingDatabase(tmp),
+            on_error=lambda path, e: errors.append(f"{path}: {e}"),
+            sources=sources,
+        )
+        if not all(results.values()) or errors:
+            failed = errors or [name for name, ok in results.items() if not ok]
+            raise RuntimeError("could not load " + "; ".join(failed))
+        info = {
+            "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "sources": str(len(sources)),
+            "build_format": str(BUILD_FORMAT),
+            "sqlite_version": sqlite3.sqlite_version,
+        }
+        stamp(Path(tmp), fingerprint, **info)
+        conn = sqlite3.connect(tmp, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=DELETE")  # one self-contained file
+            conn.execute("ANALYZE")
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+        os.replace(tmp, out)
+    finally:
+        for leftover in (tmp, f"{tmp}-wal", f"{tmp}-shm"):
+            if os.path.exists(leftover):
+                os.unlink(leftover)
+    return {"fingerprint": fingerprint, **info}
+
+
+def install(artifact: Path, db_path: Path, timeout: float = INSTALL_LOCK_TIMEOUT) -> None:
+    """
+    Copy `artifact` into `db_path` with SQLite's backup API, which writes
+    under the database's own locks (and through its WAL): connections that
+    other processes hold open stay valid and see the new contents on their
+    next transaction. Raises sqlite3.OperationalError if another connection
+    keeps the database locked for `timeout` seconds.
+    """
+    source = sqlite3.connect(f"file:{artifact}?mode=ro", uri=True)
+    try:
+        target = sqlite3.connect(str(db_path), timeout=timeout, isolation_level=None)
+        try:
+            # backup() retries a locked database without limit; give up here instead
+            target.execute("BEGIN EXCLUSIVE")
+            target.execute("ROLLBACK")
+            source.backup(target)
+        finally:
+            target.close()
+    finally:
+        source.close()
+
+
+def prepare(
+    db_path: Path = Path(DB_NAME),
+    artifact: Path = PREBUILT_DB_PATH,
+    sources: Optional[List[ingest.Source]] = None,
+) -> Prepared:
+    """Bring the working database up to the sources the fastest way available."""
+    fingerprint = source_fingerprint(sources)
+    if read_build_info(db_path).get("fingerprint") == fingerprint:
+        return Prepared("current", fingerprint)
+    if read_build_info(artifact).get("fingerprint") == fingerprint:
+        try:
+            install(artifact, db_path)
+            return Prepared("installed", fingerprint)
+        except (OSError, sqlite3.Error) as e:
+            logger.error("installing %s failed: %s", artifact, e)
+    return Prepared("stale", fingerprint)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build the prebuilt wedding database")
+    parser.add_argument("--out", type=Path, default=PREBUILT_DB_PATH)
+    parser.add_argument(
+        "--check", action="store_true", help="exit 1 if --out is missing or stale, build nothing"
+    )
+    args = parser.parse_args(argv)
+
+    if args.check:
+        current = read_build_info(args.out).get("fingerprint") == source_fingerprint()
+        print(f"{args.out}: {'current' if current else 'stale'}")
+        return 0 if current else 1
+    start = time.perf_counter()
+    info = build(args.out)
+    print(
+        f"built {args.out} from {info['sources']} CSV files "
+        f"({args.out.stat().st_size / 1024:.0f} KiB) in {time.perf_counter() - start:.2f} s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Rerun profiler for Tabu weds Mousumi application
+
+Measures wall time and widget count of named sections (header, each tab,
+...) of every script rerun and keeps a rolling per-process history of
+finished reruns. A single rerun can also be captured with cProfile and
+exported in the .prof format read by pstats, snakeviz and friends.
+
+The widget count comes from a callable supplied by the UI, so this module
+stays free of Streamlit imports.
+
+Example:
+    run = begin_rerun(count_widgets)
+    with run.section("Header"):
+        render_header()
+    finish_rerun(run)
+    summary()   # {"Header": {"runs": 1, "mean_ms": ..., ...}}
+"""
+
+import cProfile
+import marshal
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from config import RERUN_PROFILE_HISTORY
+
+
+class RerunProfile:
+    """Section timings of one rerun, optionally with a cProfile capture."""
+
+    def __init__(
+        self, count_widgets: Optional[Callable[[], int]] = None, capture: bool = False
+    ):
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self._count_widgets = count_widgets or (lambda: 0)
+        self.sections: List[Dict[str, Any]] = []
+        self.total_ms = 0.0
+        self.finished = False
+        self.cprofile: Optional[cProfile.Profile] = None
+        if capture:
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        widgets_before = self._count_widgets()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sections.append(
+                {
+                    "name": name,
+                    "ms": (time.perf_counter() - start) * 1000.0,
+                    "widgets": self._count_widgets() - widgets_before,
+                }
+            )
+
+    def stop(self) -> None:
+        self.total_ms = (time.perf_counter() - self._t0) * 1000.0
+        self.finished = True
+        if self.cprofile is not None:
+            self.cprofile.disable()
+
+    def prof_bytes(self) -> Optional[bytes]:
+        """The cProfile capture as a .prof file (pstats marshal format)."""
+        if self.cprofile is None:
+            return None
+        self.cprofile.create_stats()
+        return marshal.dumps(self.cprofile.stats)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "started": self.started,
+            "total_ms": round(self.total_ms, 3),
+            "widgets": sum(s["widgets"] for s in self.sections),
+            "sections": [
+                {"name": s["name"], "ms": round(s["ms"], 3), "widgets": s["widgets"]}
+                for s in self.sections
+            ],
+        }
+
+
+class RerunProfiler:
+    """Rolling history of finished reruns, shared by all sessions."""
+
+    def __init__(self, size: int = RERUN_PROFILE_HISTORY):
+        self._history: Deque[Dict[str, Any]] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def begin(
+        self,
+        count_widgets: Optional[Callable[[], int]] = None,
+        capture: bool = False,
+        previous: Optional[RerunProfile] = None,
+    ) -> RerunProfile:
+        """
+        Start profiling a rerun. `previous` is the same session's last run:
+        if st.rerun() cut it short it is dropped (and its capture stopped),
+        since a partial rerun would skew the history.
+        """
+        if previous is not None and not previous.finished and previous.cprofile:
+            previous.cprofile.disable()
+        return RerunProfile(count_widgets, capture)
+
+    def finish(self, run: RerunProfile) -> None:
+        if run.finished:
+            return
+        run.stop()
+        with self._lock:
+            self._history.append(run.as_dict())
+
+    def history(self) -> List[Dict[str, Any]]:
+        """Finished reruns, oldest first."""
+        with self._lock:
+            return list(self._history)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per section: runs, mean/p95/max/last ms and mean widget count."""
+        per_section: Dict[str, List[Dict[str, Any]]] = {}
+        for run in self.history():
+            for s in run["sections"]:
+                per_section.setdefault(s["name"], []).append(s)
+        summary = {}
+        for name, samples in per_section.items():
+            times = sorted(s["ms"] for s in samples)
+            summary[name] = {
+                "runs": len(samples),
+                "mean_ms": round(sum(times) / len(times), 3),
+                "p95_ms": times[min(len(times) - 1, int(0.95 * len(times)))],
+                "max_ms": times[-1],
+                "last_ms": samples[-1]["ms"],
+                "mean_widgets": round(sum(s["widgets"] for s in samples) / len(samples), 1),
+            }
+        return summary
+
+    def clear(self) -> None:
+        with self._lock:
+            self._history.clear()
+
+
+_profiler = RerunProfiler()
+
+
+def begin_rerun(
+    count_widgets: Optional[Callable[[], int]] = None,
+    capture: bool = False,
+    previous: Optional[RerunProfile] = None,
+) -> RerunProfile:
+    return _profiler.begin(count_widgets, capture, previous)
+
+
+def finish_rerun(run: RerunProfile) -> None:
+    _profiler.finish(run)
+
+
+def history() -> List[Dict[str, Any]]:
+    return _profiler.history()
+
+
+def summary() -> Dict[str, Dict[str, float]]:
+    return _profiler.summary()
+
+
+def clear() -> None:
+    _profiler.clear()
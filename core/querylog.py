@@ -0,0 +1,276 @@
+"""
+Slow query log for Tabu weds Mousumi application
+
+WeddingDatabase opens its connections with a connection factory from this
+module. Every statement is timed (execute plus the fetch that follows it);
+statements slower than the threshold are recorded with the calling
+WeddingDatabase method, the shape of their parameters (types, never
+values), duration and EXPLAIN QUERY PLAN output. Plans that scan a whole
+table are flagged, so missing indexes show up from real traffic.
+
+Records go to an in-process ring buffer (entries()) and, if a table name is
+configured, to that table in the same database file. Table writes happen on
+a background thread: the slow statement's own transaction may still hold
+the write lock when it is recorded.
+"""
+
+import functools
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from config import DB_TIMEOUT, SLOW_QUERY_LOG_SIZE, SLOW_QUERY_MS, SLOW_QUERY_TABLE
+from core.log import get_logger
+
+logger = get_logger("querylog")
+
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "REPLACE")
+# Frames of core/storage.py that are not WeddingDatabase methods of their own
+_HELPERS = {"wrapper", "get_connection"}
+# Resolved path of core/storage.py (not core/async_storage.py)
+_STORAGE_FILE = os.path.normcase(
+    os.path.realpath(os.path.join(os.path.dirname(__file__), "storage.py"))
+)
+
+
+def params_shape(params: Any) -> Any:
+    """Parameter types without their values, e.g. ["str", "int"]."""
+    if isinstance(params, dict):
+        return {k: type(v).__name__ for k, v in params.items()}
+    if isinstance(params, (list, tuple)):
+        return [type(v).__name__ for v in params]
+    return type(params).__name__
+
+
+@functools.lru_cache(maxsize=None)
+def _is_storage(filename: str) -> bool:
+    return os.path.normcase(os.path.realpath(filename)) == _STORAGE_FILE
+
+
+def _caller() -> str:
+    """
+    Name of the nearest public WeddingDatabase method on the stack (private
+    helpers such as _versioned_update, the logging wrapper and
+    get_connection are skipped).
+    """
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        if (
+            _is_storage(code.co_filename)
+            and not code.co_name.startswith("_")
+            and code.co_name not in _HELPERS
+        ):
+            return code.co_name
+        frame = frame.f_back
+    return ""
+
+
+class SlowQueryLog:
+    """Thread-safe ring buffer (plus optional table) of slow statements."""
+
+    def __init__(
+        self,
+        threshold_ms: float = SLOW_QUERY_MS,
+        size: int = SLOW_QUERY_LOG_SIZE,
+        table: str = SLOW_QUERY_TABLE,
+    ):
+        self.threshold_ms = threshold_ms
+        self.table = table
+        self._entries: Deque[Dict[str, Any]] = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._connection_class = None
+        self._outbox: "queue.Queue" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+
+    @property
+    def connection_class(self) -> type:
+        """sqlite3.connect(factory=...) class that reports to this log."""
+        if self._connection_class is None:
+            self._connection_class = type(
+                "LoggedConnection", (TimedConnection,), {"slow_log": self}
+            )
+        return self._connection_class
+
+    def observe(
+        self, conn: "TimedConnection", sql: str, params: Any, duration_ms: float
+    ) -> None:
+        if duration_ms < self.threshold_ms:
+            return
+        plan = explain(conn, sql, params)
+        entry = {
+            "at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "method": _caller(),
+            "sql": " ".join(sql.split()),
+            "params": params_shape(params),
+            "duration_ms": round(duration_ms, 3),
+            "plan": plan,
+            "full_scan": any(line.startswith("SCAN ") for line in plan),
+        }
+        with self._lock:
+            self._entries.append(entry)
+            if self.table:
+                self._outbox.put((conn.database_path, entry))
+                if self._writer is None:
+                    self._writer = threading.Thread(
+                        target=self._write_forever, name="slow-query-log", daemon=True
+                    )
+                    self._writer.start()
+
+    def _write_forever(self) -> None:
+        while True:
+            db_path, entry = self._outbox.get()
+            self._persist(db_path, entry)
+            self._outbox.task_done()
+
+    def flush(self) -> None:
+        """Wait until queued entries are written to the table."""
+        self._outbox.join()
+
+    def _persist(self, db_path: str, entry: Dict[str, Any]) -> None:
+        # Own plain connection: never part of the caller's transaction
+        try:
+            conn = sqlite3.connect(db_path, timeout=DB_TIMEOUT)
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {self.table} (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    at TEXT, method TEXT, sql TEXT, params TEXT,
+                    duration_ms REAL, plan TEXT, full_scan INTEGER
+                )
+                """
+            )
+            conn.execute(
+                f"INSERT INTO {self.table} "
+                "(at, method, sql, params, duration_ms, plan, full_scan) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    entry["at"],
+                    entry["method"],
+                    entry["sql"],
+                    repr(entry["params"]),
+                    entry["duration_ms"],
+                    "\n".join(entry["plan"]),
+                    int(entry["full_scan"]),
+                ),
+            )
+            conn.commit()
+            conn.close()
+        except sqlite3.Error as e:
+            logger.error("recording slow query failed: %s", e)
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Recorded statements, oldest first."""
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def explain(conn: sqlite3.Connection, sql: str, params: Any) -> List[str]:
+    """EXPLAIN QUERY PLAN detail lines for sql, or [] if not applicable."""
+    if not sql.lstrip().upper().startswith(_EXPLAINABLE):
+        return []
+    try:
+        cur = sqlite3.Connection.cursor(conn, sqlite3.Cursor)
+        cur.execute("EXPLAIN QUERY PLAN " + sql, params)
+        plan = [row[3] for row in cur.fetchall()]
+        cur.close()
+        return plan
+    except sqlite3.Error as e:
+        return [f"(no plan: {e})"]
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that times each statement through to its fetch."""
+
+    _pending = None  # (sql, params, elapsed ms) of a statement with rows left
+
+    def execute(self, sql: str, parameters: Any = ()) -> "TimedCursor":
+        self._finish()
+        start = time.perf_counter()
+        super().execute(sql, parameters)
+        elapsed = (time.perf_counter() - start) * 1000.0
+        if self.description is None:
+            self.connection.slow_log.observe(self.connection, sql, parameters, elapsed)
+        else:
+            self._pending = (sql, parameters, elapsed)
+        return self
+
+    def executemany(self, sql: str, seq_of_parameters: Any) -> "TimedCursor":
+        self._finish()
+        rows = list(seq_of_parameters)
+        start = time.perf_counter()
+        super().executemany(sql, rows)
+        elapsed = (time.perf_counter() - start) * 1000.0
+        self.connection.slow_log.observe(
+            self.connection, sql, rows[0] if rows else (), elapsed
+        )
+        return self
+
+    def fetchone(self) -> Any:
+        return self._timed_fetch(super().fetchone)
+
+    def fetchmany(self, *args: Any) -> List[Any]:
+        return self._timed_fetch(super().fetchmany, *args)
+
+    def fetchall(self) -> List[Any]:
+        return self._timed_fetch(super().fetchall)
+
+    def close(self) -> None:
+        self._finish()
+        super().close()
+
+    def _timed_fetch(self, fetch, *args: Any) -> Any:
+        start = time.perf_counter()
+        result = fetch(*args)
+        if self._pending is not None:
+            sql, parameters, elapsed = self._pending
+            self._pending = (sql, parameters, elapsed + (time.perf_counter() - start) * 1000.0)
+            self._finish()
+        return result
+
+    def _finish(self) -> None:
+        if self._pending is not None:
+            sql, parameters, elapsed = self._pending
+            self._pending = None
+            self.connection.slow_log.observe(self.connection, sql, parameters, elapsed)
+
+
+class TimedConnection(sqlite3.Connection):
+    """Connection whose cursors report slow statements to `slow_log`."""
+
+    slow_log: SlowQueryLog
+
+    def __init__(self, database: str, *args: Any, **kwargs: Any):
+        super().__init__(database, *args, **kwargs)
+        self.database_path = database
+
+    def cursor(self, factory: type = TimedCursor) -> sqlite3.Cursor:
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters: Any = ()) -> sqlite3.Cursor:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any) -> sqlite3.Cursor:
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+_default_log: Optional[SlowQueryLog] = None
+_default_lock = threading.Lock()
+
+
+def default_log() -> SlowQueryLog:
+    """The process-wide log used by WeddingDatabase unless given another."""
+    global _default_log
+    with _default_lock:
+        if _default_log is None:
+            _default_log = SlowQueryLog()
+        return _default_log
@@ -0,0 +1,97 @@
+"""
+Reports module for Tabu weds Mousumi application
+
+Pure aggregations behind the dashboards: no Streamlit, no database access.
+"""
+
+from typing import Dict, List, NamedTuple, Tuple
+
+from config import INVITEE_LISTS
+
+
+class IngredientSummary(NamedTuple):
+    total_items: int
+    completed: List[Dict]
+    incomplete: List[Dict]
+    total_qty: float
+    completed_qty: float
+    incomplete_qty: float
+
+
+class InviteeSummary(NamedTuple):
+    total_guests: int
+    total_headcount: int
+    to_sakti: int
+    bus: int
+    car: int
+    unsure: int
+
+
+def ingredient_summary(ingredients: List[Dict]) -> IngredientSummary:
+    """Item counts and quantities by delivery status for one list."""
+    completed = [i for i in ingredients if i["status"] == "Completed"]
+    incomplete = [i for i in ingredients if i["status"] == "Incomplete"]
+    total_qty = sum(float(i["quantity"]) for i in ingredients)
+    incomplete_qty = sum(float(i.get("delivered_quantity") or 0.0) for i in incomplete)
+    return IngredientSummary(
+        total_items=len(ingredients),
+        completed=completed,
+        incomplete=incomplete,
+        total_qty=total_qty,
+        completed_qty=total_qty - incomplete_qty,
+        incomplete_qty=incomplete_qty,
+    )
+
+
+def split_by_status(ingredients: List[Dict]) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    """Return (incomplete, completed, other) ingredients, preserving order."""
+    incomplete = [i for i in ingredients if i["status"] == "Incomplete"]
+    completed = [i for i in ingredients if i["status"] == "Completed"]
+    other = [i for i in ingredients if i["status"] not in ("Incomplete", "Completed")]
+    return incomplete, completed, other
+
+
+def is_barati_list(list_name: str) -> bool:
+    """Barati lists carry the extra Sakti / travel columns."""
+    return "Barati" in list_name or "Barati" in INVITEE_LISTS.get(list_name, "")
+
+
+def invitee_summary(invitees: List[Dict], total_headcount: int) -> InviteeSummary:
+    """Guest counts and Sakti travel split for one list."""
+    to_sakti = sum(int(g.get("to_sakti") or 0) for g in invitees)
+    bus = sum(int(g.get("bus_sakti") or 0) for g in invitees)
+    car = sum(int(g.get("car_sakti") or 0) for g in invitees)
+    return InviteeSummary(
+        total_guests=len(invitees),
+        total_headcount=total_headcount,
+        to_sakti=to_sakti,
+        bus=bus,
+        car=car,
+        unsure=max(to_sakti - bus - car, 0),
+    )
+
+
+def filter_by_name(rows: List[Dict], term: str, key: str) -> List[Dict]:
+    """Case-insensitive substring filter on one column."""
+    if not term:
+        return rows
+    term = term.lower()
+    return [r for r in rows if term in str(r.get(key, "")).lower()]
+
+
+def group_by_list(rows: List[Dict]) -> Dict[str, List[Dict]]:
+    """Group search results by their list_name, keeping result order."""
+    grouped: Dict[str, List[Dict]] = {}
+    for row in rows:
+        grouped.setdefault(row["list_name"], []).append(row)
+    return grouped
+
+
+def menu_text(date: str, meal: str, menu_row: Dict) -> str:
+    """Plain-text menu for download."""
+    return (
+        f"Date: {date}\n"
+        f"Meal: {meal}\n"
+        f"Headcount: {menu_row['headcount']}\n\n"
+        f"Menu:\n{menu_row['menu_items']}"
+    )
@@ -0,0 +1,25 @@
+"""
+Startup timing for Tabu weds Mousumi application
+
+Records named milestones (imports done, first paint, ...) relative to the
+moment this module was first imported, once per process. Import it first
+in an entry point so the clock starts before the heavy imports.
+"""
+
+import time
+from typing import Dict
+
+_T0 = time.perf_counter()
+_marks: Dict[str, float] = {}
+
+
+def mark(name: str) -> float:
+    """Record milestone `name` (first call wins); return ms since start."""
+    if name not in _marks:
+        _marks[name] = (time.perf_counter() - _T0) * 1000.0
+    return _marks[name]
+
+
+def marks() -> Dict[str, float]:
+    """All recorded milestones in ms since start, in recording order."""
+    return dict(_marks)
@@ -0,0 +1,1016 @@
+"""
+Storage module for Tabu weds Mousumi application
+
+Handles all SQLite database operations for ingredients, invitees and menus.
+Optimised for Streamlit Cloud (WAL, timeouts, retries) and supports per-row reset.
+pandas is only imported by the CSV loaders, never at module import.
+"""
+
+import functools
+import sqlite3
+import threading
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Optional, Union
+import time
+
+from config import DB_NAME, DB_TIMEOUT
+from core.log import get_logger, log_operation
+from core.querylog import SlowQueryLog, default_log
+from core.validation import (
+    INGREDIENT_SCHEMA,
+    INVITEE_SCHEMA,
+    MENU_SCHEMA,
+    ValidationReport,
+    records,
+    validate,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Invitee counters that can be adjusted atomically, with the condition the
+# row must still satisfy after adding :delta (checked in the same UPDATE).
+INVITEE_COUNTER_BOUNDS = {
+    "lunch": "lunch + :delta >= 1",
+    "to_sakti": (
+        "COALESCE(to_sakti, 0) + :delta >= 0 AND "
+        "COALESCE(to_sakti, 0) + :delta >= "
+        "COALESCE(bus_sakti, 0) + COALESCE(car_sakti, 0)"
+    ),
+    "bus_sakti": (
+        "COALESCE(bus_sakti, 0) + :delta >= 0 AND "
+        "COALESCE(bus_sakti, 0) + :delta + COALESCE(car_sakti, 0) <= COALESCE(to_sakti, 0)"
+    ),
+    "car_sakti": (
+        "COALESCE(car_sakti, 0) + :delta >= 0 AND "
+        "COALESCE(bus_sakti, 0) + COALESCE(car_sakti, 0) + :delta <= COALESCE(to_sakti, 0)"
+    ),
+}
+
+
+class WriteResult(NamedTuple):
+    """
+    Outcome of a versioned write.
+
+    ok       - the row was written; `version` is its new version
+    conflict - the row exists but its version differs from the expected one;
+               `current` holds the row as stored now
+    neither  - the row does not exist or the write failed
+    """
+
+    ok: bool
+    version: Optional[int] = None
+    conflict: bool = False
+    current: Optional[Dict] = None
+
+
+class LoadBatch(NamedTuple):
+    """
+    Rows replacing one list, for WeddingDatabase.load_batches().
+
+    kind      - "ingredients", "invitees" or "menus"
+    list_name - list to replace (ignored for menus, which are replaced whole)
+    chunks    - a DataFrame, a list of them or an iterator of chunks
+    report    - receives rows rejected by validation
+    validated - chunks already passed core.validation.validate(), so they
+                are written as they are (and `report` is left alone)
+    """
+
+    kind: str
+    list_name: str
+    chunks: "Union[pd.DataFrame, Iterable[pd.DataFrame]]"
+    report: Optional[ValidationReport] = None
+    validated: bool = False
+
+
+def _write_ingredient_rows(cur: sqlite3.Cursor, list_name: str, clean: "pd.DataFrame") -> int:
+    """Insert validated ingredient rows; returns the number inserted."""
+    cur.executemany(
+        """
+        INSERT OR IGNORE INTO ingredients
+        (list_name, item_name, quantity, unit,
+         delivered_quantity, status, original_quantity)
+        VALUES (?, ?, ?, ?, 0, 'Not Started', ?)
+        """,
+        [
+            (list_name, item_name, quantity, unit, quantity)
+            for item_name, quantity, unit in records(clean, ["Item Name", "Quantity", "Unit"])
+        ],
+    )
+    return cur.rowcount
+
+
+def _write_invitee_rows(cur: sqlite3.Cursor, list_name: str, clean: "pd.DataFrame") -> int:
+    """Insert validated invitee rows; returns the number inserted."""
+    cur.executemany(
+        """
+        INSERT OR IGNORE INTO invitees
+        (list_name, name, lunch,
+         to_sakti, travel_by,
+         bus_sakti, car_sakti,
+         original_lunch, original_to_sakti,
+         original_travel_by,
+         original_bus_sakti, original_car_sakti)
+        VALUES (?, ?, ?, ?, ?, 0, 0, ?, ?, ?, 0, 0)
+        """,
+        [
+            (list_name, name, lunch, to_sakti, travel_by, lunch, to_sakti, travel_by)
+            for name, lunch, to_sakti, travel_by in records(
+                clean, ["Name", "Lunch", "To SAKTI", "Travel By"]
+            )
+        ],
+    )
+    return cur.rowcount
+
+
+def _write_menu_rows(cur: sqlite3.Cursor, list_name: str, clean: "pd.DataFrame") -> int:
+    """Insert validated menu rows; returns the number inserted."""
+    cur.executemany(
+        """
+        INSERT OR IGNORE INTO menus
+        (date, meal, headcount, menu_items)
+        VALUES (?, ?, ?, ?)
+        """,
+        records(clean, ["Date", "Meal", "Headcount", "Menu Items"]),
+    )
+    return cur.rowcount
+
+
+# kind -> (statement clearing the list, schema, row writer)
+_LIST_TABLES = {
+    "ingredients": (
+        "DELETE FROM ingredients WHERE list_name = :list_name",
+        INGREDIENT_SCHEMA,
+        _write_ingredient_rows,
+    ),
+    "invitees": (
+        "DELETE FROM invitees WHERE list_name = :list_name",
+        INVITEE_SCHEMA,
+        _write_invitee_rows,
+    ),
+    "menus": ("DELETE FROM menus", MENU_SCHEMA, _write_menu_rows),
+}
+
+
+logger = get_logger("storage")
+
+# Public methods that are not database operations (never logged)
+_UNLOGGED = {"get_connection", "pop_last_error", "pop_retry_count"}
+
+
+def _logged(method):
+    """Time one public method and log its outcome with core.log."""
+    op = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        local = self._local
+        outer = getattr(local, "call_error", None)
+        local.call_error = None
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        except Exception as e:
+            local.call_error = (e, "")
+            raise
+        finally:
+            error, action = local.call_error or (None, "")
+            local.call_error = outer
+            log_operation(logger, op, (time.perf_counter() - start) * 1000.0, error, action)
+
+    return wrapper
+
+
+def _log_operations(cls):
+    """Class decorator: wrap every public database method with _logged."""
+    for name, attr in list(vars(cls).items()):
+        if callable(attr) and not name.startswith("_") and name not in _UNLOGGED:
+            setattr(cls, name, _logged(attr))
+    return cls
+
+
+@_log_operations
+class WeddingDatabase:
+    """Main database class for managing wedding data with thread-safe operations"""
+
+    def __init__(
+        self,
+        db_path: str = DB_NAME,
+        timeout: float = DB_TIMEOUT,
+        slow_query_log: Optional[SlowQueryLog] = None,
+    ):
+        self.db_path = db_path
+        self.timeout = timeout
+        self.slow_query_log = slow_query_log or default_log()
+        # Per-thread record of swallowed errors and lock retries
+        self._local = threading.local()
+        self.init_database()
+
+    # ---------------------------------------------------------------------
+    # Core connection helpers
+    # ---------------------------------------------------------------------
+    def get_connection(self) -> sqlite3.Connection:
+        """Get database connection with proper timeout and isolation."""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            check_same_thread=False,
+            factory=self.slow_query_log.connection_class,
+        )
+        conn.row_factory = sqlite3.Row
+        # WAL mode reduces locking issues on Streamlit Cloud
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=10000")
+        return conn
+
+    def _report_error(self, action: str, error: Exception) -> None:
+        """Remember a swallowed error for pop_last_error() and the call's log record."""
+        self._local.last_error = error
+        self._local.call_error = (error, action)
+
+    def _note_retry(self) -> None:
+        self._local.retries = getattr(self._local, "retries", 0) + 1
+
+    def pop_last_error(self) -> Optional[Exception]:
+        """
+        The error swallowed by the most recent failing call on this thread
+        (methods return a default instead of raising), then forget it.
+        """
+        error = getattr(self._local, "last_error", None)
+        self._local.last_error = None
+        return error
+
+    def pop_retry_count(self) -> int:
+        """Lock retries made on this thread since the last call, then reset."""
+        retries = getattr(self._local, "retries", 0)
+        self._local.retries = 0
+        return retries
+
+    def _versioned_update(
+        self,
+        table: str,
+        values: Dict,
+        key: Dict,
+        expected_version: Optional[int],
+    ) -> WriteResult:
+        """UPDATE one row by key, bump its version, optionally compare-and-set."""
+        try:
+            conn = self.get_connection()
+            cur = conn.cursor()
+            where = " AND ".join(f"{column} = ?" for column in key)
+            params = list(values.values()) + list(key.values())
+            if expected_version is not None:
+                where += " AND version = ?"
+                params.append(expected_version)
+            cur.execute(
+                f"UPDATE {table} SET "
+                + ", ".join(f"{column} = ?" for column in values)
+                + ", version = version + 1"
+                + f" WHERE {where} RETURNING version",
+                tuple(params),
+            )
+            row = cur.fetchone()
+            if row is not None:
+                conn.commit()
+                conn.close()
+                return WriteResult(ok=True, version=row[0])
+
+            cur.execute(
+                f"SELECT * FROM {table} WHERE "
+                + " AND ".join(f"{column} = ?" for column in key),
+                tuple(key.values()),
+            )
+            current = cur.fetchone()
+            conn.commit()
+            conn.close()
+            if current is None:
+                return WriteResult(ok=False)
+            return WriteResult(ok=False, conflict=True, current=dict(current))
+        except Exception as e:
+            self._report_error(f"updating {table}", e)
+            return WriteResult(ok=False)
+
+    def _load_rows(self, action: str, batches: "Iterable[LoadBatch]") -> bool:
+        """
+        Replace each batch's list in one transaction, validating chunks
+        that are not validated yet. The write lock is taken up front
+        (BEGIN IMMEDIATE) so "database is locked" is retried before any
+        input is consumed; one-shot iterators are never retried once
+        reading has started.
+        """
+        import pandas as pd
+
+        replayable = isinstance(batches, list)
+        batches = batches if replayable else iter(batches)
+        retry_count = 0
+        while True:
+            conn = None
+            consumed = False
+            try:
+                conn = self.get_connection()
+                cur = conn.cursor()
+                cur.execute("BEGIN IMMEDIATE")
+                for batch in batches:
+                    consumed = True
+                    delete_sql, schema, write_rows = _LIST_TABLES[batch.kind]
+                    cur.execute(delete_sql, {"list_name": batch.list_name})
+                    chunks = batch.chunks
+                    if isinstance(chunks, pd.DataFrame):
+                        chunks = [chunks]
+                    elif not isinstance(chunks, list):
+                        replayable = False
+                    if not batch.validated and batch.report is not None:
+                        batch.report.reset()
+                    for chunk in chunks:
+                        if not batch.validated:
+                            chunk = validate(chunk, schema, batch.report)
+                        write_rows(cur, batch.list_name, chunk)
+                conn.commit()
+                conn.close()
+                return True
+            except sqlite3.OperationalError as e:
+                if conn is not None:
+                    conn.rollback()
+                    conn.close()
+                retry_count += 1
+                if retry_count >= 3 or (consumed and not replayable):
+                    self._report_error(action, e)
+                    return False
+                self._note_retry()
+                time.sleep(0.2)
+            except Exception as e:
+                if conn is not None:
+                    conn.rollback()
+                    conn.close()
+                self._report_error(action, e)
+                return False
+
+    def load_batches(self, batches: "Iterable[LoadBatch]") -> bool:
+        """
+        Replace several lists in a single transaction: either all of them
+        are replaced or, on failure, none. `batches` may be a generator,
+        e.g. fed by parser threads as files finish (core.ingest).
+        """
+        return self._load_rows("loading lists", batches)
+
+    def init_database(self) -> None:
+        """Initialize database tables (idempotent)."""
+        retry_count = 0
+        max_retries = 3
+
+        while retry_count < max_retries:
+            try:
+                conn = self.get_connection()
+                cursor = conn.cursor()
+
+                # Ingredients table
+                cursor.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS ingredients (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        list_name TEXT NOT NULL,
+                        item_name TEXT NOT NULL,
+                        quantity REAL NOT NULL,
+                        unit TEXT NOT NULL,
+                        delivered_quantity REAL DEFAULT 0,
+                        status TEXT DEFAULT 'Not Started',
+                        original_quantity REAL NOT NULL,
+                        version INTEGER NOT NULL DEFAULT 0,
+                        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                        UNIQUE(list_name, item_name)
+                    )
+                    """
+                )
+
+                # Invitees table
+                cursor.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS invitees (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        list_name TEXT NOT NULL,
+                        name TEXT NOT NULL,
+                        lunch INTEGER NOT NULL,
+                        to_sakti INTEGER,
+                        travel_by TEXT,
+                        bus_sakti INTEGER DEFAULT 0,
+                        car_sakti INTEGER DEFAULT 0,
+                        original_lunch INTEGER NOT NULL,
+                        original_to_sakti INTEGER,
+                        original_travel_by TEXT,
+                        original_bus_sakti INTEGER DEFAULT 0,
+                        original_car_sakti INTEGER DEFAULT 0,
+                        version INTEGER NOT NULL DEFAULT 0,
+                        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                        UNIQUE(list_name, name)
+                    )
+                    """
+                )
+
+                # Menus table
+                cursor.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS menus (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        date TEXT NOT NULL,
+                        meal TEXT NOT NULL,
+                        headcount INTEGER NOT NULL,
+                        menu_items TEXT NOT NULL,
+                        version INTEGER NOT NULL DEFAULT 0,
+                        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                        UNIQUE(date, meal)
+                    )
+                    """
+                )
+
+                # Databases created before row versions existed
+                for table in ("ingredients", "invitees", "menus"):
+                    columns = [r[1] for r in cursor.execute(f"PRAGMA table_info({table})")]
+                    if "version" not in columns:
+                        cursor.execute(
+                            f"ALTER TABLE {table} "
+                            "ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+                        )
+
+                conn.commit()
+                conn.close()
+                break
+            except sqlite3.OperationalError as e:
+                retry_count += 1
+                if retry_count >= max_retries:
+                    self._report_error("initializing database", e)
+                else:
+                    self._note_retry()
+                    time.sleep(0.2)
+
+    # ---------------------------------------------------------------------
+    # INGREDIENT OPERATIONS
+    # ---------------------------------------------------------------------
+    def load_ingredient_list(
+        self,
+        list_name: str,
+        df: "Union[pd.DataFrame, Iterable[pd.DataFrame]]",
+        report: Optional[ValidationReport] = None,
+    ) -> bool:
+        """
+        Load ingredient list from CSV into database, replacing that list.
+        `df` may also be an iterator of chunks (core.ingest.read_csv_chunks),
+        written one by one inside the same transaction. Rows failing
+        INGREDIENT_SCHEMA are left out and recorded in `report`.
+        """
+        report = report or ValidationReport(list_name, INGREDIENT_SCHEMA.name)
+        return self._load_rows(
+            "loading ingredient list", [LoadBatch("ingredients", list_name, df, report)]
+        )
+
+    def get_ingredients(self, list_name: str) -> List[Dict]:
+        """Get all ingredients for a list."""
+        try:
+            conn = self.get_connection()
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT * FROM ingredients
+                WHERE list_name = ?
+                ORDER BY item_name
+                """,
+                (list_name,),
+            )
+            rows = [dict(r) for r in cur.fetchall()]
+            conn.close()
+            return rows
+        except Exception as e:
+            self._report_error("getting ingredients", e)
+            return []
+
+    def update_ingredient_status(
+        self,
+        list_name: str,
+        item_name: str,
+        status: str,
+        delivered_qty: float = 0.0,
+    ) -> bool:
+        """
+        Update ingredient status and delivered quantity. Returns False if
+        the item does not exist or the update failed (see pop_last_error()).
+        """
+        try:
+            conn = self.get_connection()
+            cur = conn.cursor()
+            cur.execute(
+                """
+                UPDATE ingredients
+                SET status = ?, delivered_quantity = ?, version = version + 1
+                WHERE list_name = ? AND item_name = ?
+                """,
+                (status, delivered_qty, list_name, item_name),
+            )
+            updated = cur.rowcount > 0
+            conn.commit()
+            conn.close()
+            return updated
+        except Exception as e:
+            self._report_error("updating ingredient status", e)
+            return False
+
+    def add_ingredient(
+        self,
+        list_name: str,
+        item_name: str,
+        quantity: float,
+        unit: str,
+    ) -> bool:
+        """Add new ingredient, with original_quantity set to first value."""
+        try:
+            conn = self.get_connection()
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO ingredients
+                (list_name, item_name, quantity, unit,
+                 delivered_quantity, status, original_quantity)
+                VALUES (?, ?, ?, ?, 0, 'Not Started', ?)
+                """,
+                (list_name, item_name, quantity, unit, quantity),
+            )
+            conn.commit()
+            conn.close()
+            return True
+        except sqlite3.IntegrityError:
+            return False
+        except Exception as e:
+            self._report_error("adding ingredient", e)
+            return False
+
+    def update_ingredient(
+        self,
+        list_name: str,
+        item_name: str,
+        quantity: float,
+        unit: str,
+        expected_version: Optional[int] = None,
+    ) -> WriteResult:
+        """
+        Update quantity/unit, leaving original_quantity unchanged.
+        With `expected_version`, only writes if nobody changed the row since
+        that version was read; otherwise returns a conflict result.
+        """
+        return self._versioned_update(
+            "ingredients",
+            {"quantity": quantity, "unit": unit},
+            {"list_name": list_name, "item_name": item_name},
+            expected_version,
+        )
+
+    def delete_ingredient(self, list_name: str, item_name: str) -> bool:
+        """Delete ingredient from list."""
+        try:
+            conn = self.get_connection()
+            cur = conn.cursor()
+            cur.execute(
+                """
+                DELETE FROM ingredients
+                WHERE list_name = ? AND item_name = ?
+                """,
+                (list_name, item_name),
+            )
+            conn.commit()
+            conn.close()
+            return True
+        except Exception as e:
+            self._report_error("deleting ingredient", e)
+            return False
+
+    def reset_ingredient(self, list_name: str, item_name: str) -> None:
+        """Reset one ingredient to its original quantity and clear status."""
+        try:
+            conn = self.get_connection()
+            cur = conn.cursor()
+            cur.execute(
+                """
+                UPDATE ingredients
+                SET quantity = original_quantity,
+                    delivered_quantity = 0,
+                    status = 'Not Started',
+                    version = version + 1
+                WHERE list_name = ? AND item_name = ?
+                """,
+                (list_name, item_name),
+            )
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            self._report_error("resetting ingredient", e)
+
+    def search_ingredients(
+        self,
+        search_term: str,
+        list_name: Optional[str] = None,
+    ) -> List[Dict]:
+        """Search ingredients by name, optionally within one list."""
+        try:
+            conn = self.get_connection()
+            cur = conn.cursor()
+            pattern = f"%{search_term}%"
+            if list_name:
+                cur.execute(
+                    """
+                    SELECT * FROM ingredients
+                    WHERE list_name = ? AND item_name LIKE ?
+                    ORDER BY list_name, item_name
+                    """,
+                    (list_name, pattern),
+                )
+            else:
+                cur.execute(
+                    """
+                    SELECT * FROM ingredients
+                    WHERE item_name LIKE ?
+                    ORDER BY list_name, item_name
+                    """,
+                    (pattern,),
+                )
+            rows = [dict(r) for r in cur.fetchall()]
+            conn.close()
+            return rows
+        except Exception as e:
+            self._report_error("searching ingredients", e)
+            return []
+
+    # ---------------------------------------------------------------------
+    # INVITEE OPERATIONS
+    # ---------------------------------------------------------------------
+    def load_invitee_list(
+        self,
+        list_name: str,
+        df: "Union[pd.DataFrame, Iterable[pd.DataFrame]]",
+        report: Optional[ValidationReport] = None,
+    ) -> bool:
+        """
+        Load invitee list from CSV into database, replacing that list.
+        Skips header/separator/summary rows like '117 Total', and blank names.
+        `df` and `report` work as for load_ingredient_list.
+        """
+        report = report or ValidationReport(list_name, INVITEE_SCHEMA.name)
+        return self._load_rows(
+            "loading invitee list", [LoadBatch("invitees", list_name, df, report)]
+        )
+
+    def get_invitees(self, list_name: str) -> List[Dict]:
+        """Get all invitees for a list."""
+        try:
+            conn = self.get_connection()
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT * FROM invitees
+                WHERE list_name = ?
+                ORDER BY name
+                """,
+                (list_name,),
+            )
+            rows = [dict(r) for r in cur.fetchall()]
+            conn.close()
+            return rows
+        except Exception as e:
+            self._report_error("getting invitees", e)
+            return []
+
+    def get_invitee(self, list_name: str, name: str) -> Optional[Dict]:
+        """Get one invitee, or None if there is no such guest."""
+        try:
+            conn = self.get_connection()
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT * FROM invitees
+                WHERE list_name = ? AND name = ?
+                """,
+                (list_name, name),
+            )
+            row = cur.fetchone()
+            conn.close()
+            return dict(row) if row else None
+        except Exception as e:
+            self._report_error("getting invitee", e)
+            return None
+
+    def add_invitee(
+        self,
+        list_name: str,
+        name: str,
+        lunch: int,
+        to_sakti: Optional[int] = None,
+        travel_by: Optional[str] = None,
+        bus_sakti: int = 0,
+        car_sakti: int = 0,
+    ) -> bool:
+        """Add new invitee with original_* set to first values."""
+        try:
+            conn = self.get_connection()
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO invitees
+                (list_name, name, lunch,
+                 to_sakti, travel_by,
+                 bus_sakti, car_sakti,
+                 original_lunch, original_to_sakti,
+                 original_travel_by,
+                 original_bus_sakti, original_car_sakti)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    list_name,
+                    name,
+                    lunch,
+                    to_sakti,
+                    travel_by,
+                    bus_sakti,
+                    car_sakti,
+                    lunch,
+                    to_sakti,
+                    travel_by,
+                    bus_sakti,
+                    car_sakti,
+                ),
+            )
+            conn.commit()
+            conn.close()
+            return True
+        except sqlite3.IntegrityError:
+            return False
+        except Exception as e:
+            self._report_error("adding invitee", e)
+            return False
+
+    def update_invitee(
+        self,
+        list_name: str,
+        name: str,
+        lunch: int,
+        to_sakti: Optional[int] = None,
+        travel_by: Optional[str] = None,
+        bus_sakti: Optional[int] = None,
+        car_sakti: Optional[int] = None,
+        expected_version: Optional[int] = None,
+    ) -> WriteResult:
+        """
+        Update invitee info; original_* stay unchanged.
+        None values are left as they are. With `expected_version`, only
+        writes if nobody changed the row since that version was read.
+        """
+        values = {"lunch": lunch}
+        for column, value in (
+            ("to_sakti", to_sakti),
+            ("travel_by", travel_by),
+            ("bus_sakti", bus_sakti),
+            ("car_sakti", car_sakti),
+        ):
+            if value is not None:
+                values[column] = value
+        return self._versioned_update(
+            "invitees",
+            values,
+            {"list_name": list_name, "name": name},
+            expected_version,
+        )
+
+    def increment_invitee_count(
+        self,
+        list_name: str,
+        name: str,
+        field: str,
+        delta: int,
+    ) -> Optional[int]:
+        """
+        Atomically add `delta` to one invitee counter (lunch, to_sakti,
+        bus_sakti or car_sakti) and return the new value.
+
+        The bounds in INVITEE_COUNTER_BOUNDS are checked in the same UPDATE
+        (lunch >= 1, bus + car <= to_sakti, no negatives), so concurrent
+        clicks never lose updates. Returns None if the guest does not exist
+        or the change would break a bound. Needs SQLite >= 3.35 (RETURNING).
+        """
+        if field not in INVITEE_COUNTER_BOUNDS:
+            raise ValueError(f"Not an invitee counter: {field}")
+        try:
+            conn = self.get_connection()
+            cur = conn.cursor()
+            cur.execute(
+                f"""
+                UPDATE invitees
+                SET {field} = COALESCE({field}, 0) + :delta,
+                    version = version + 1
+                WHERE list_name = :list_name AND name = :name
+                  AND {INVITEE_COUNTER_BOUNDS[field]}
+                RETURNING {field}
+                """,
+                {"delta": int(delta), "list_name": list_name, "name": name},
+            )
+            row = cur.fetchone()
+            conn.commit()
+            conn.close()
+            return int(row[0]) if row else None
+        except Exception as e:
+            self._report_error(f"incrementing invitee {field}", e)
+            return None
+
+    def delete_invitee(self, list_name: str, name: str) -> bool:
+        """Delete invitee."""
+        try:
+            conn = self.get_connection()
+            cur = conn.cursor()
+            cur.execute(
+                """
+                DELETE FROM invitees
+                WHERE list_name = ? AND name = ?
+                """,
+                (list_name, name),
+            )
+            conn.commit()
+            conn.close()
+            return True
+        except Exception as e:
+            self._report_error("deleting invitee", e)
+            return False
+
+    def reset_invitee(self, list_name: str, name: str) -> None:
+        """
+        Reset invitee:
+        - lunch -> original_lunch
+        - to_sakti -> original_to_sakti (or 0 if NULL)
+        - travel_by -> original_travel_by
+        - bus_sakti -> original_bus_sakti
+        - car_sakti -> original_car_sakti
+        """
+        try:
+            conn = self.get_connection()
+            cur = conn.cursor()
+            cur.execute(
+                """
+                UPDATE invitees
+                SET lunch = original_lunch,
+                    to_sakti = COALESCE(original_to_sakti, 0),
+                    travel_by = original_travel_by,
+                    bus_sakti = COALESCE(original_bus_sakti, 0),
+                    car_sakti = COALESCE(original_car_sakti, 0),
+                    version = version + 1
+                WHERE list_name = ? AND name = ?
+                """,
+                (list_name, name),
+            )
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            self._report_error("resetting invitee", e)
+
+    def get_total_headcount(self, list_name: str) -> int:
+        """Sum lunch for a list."""
+        try:
+            conn = self.get_connection()
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT SUM(lunch) AS total
+                FROM invitees
+                WHERE list_name = ?
+                """,
+                (list_name,),
+            )
+            row = cur.fetchone()
+            conn.close()
+            return int(row["total"]) if row and row["total"] is not None else 0
+        except Exception as e:
+            self._report_error("getting headcount", e)
+            return 0
+
+    def search_invitees(
+        self,
+        search_term: str,
+        list_name: Optional[str] = None,
+    ) -> List[Dict]:
+        """Search invitees by name."""
+        try:
+            conn = self.get_connection()
+            cur = conn.cursor()
+            pattern = f"%{search_term}%"
+            if list_name:
+                cur.execute(
+                    """
+                    SELECT * FROM invitees
+                    WHERE list_name = ? AND name LIKE ?
+                    ORDER BY list_name, name
+                    """,
+                    (list_name, pattern),
+                )
+            else:
+                cur.execute(
+                    """
+                    SELECT * FROM invitees
+                    WHERE name LIKE ?
+                    ORDER BY list_name, name
+                    """,
+                    (pattern,),
+                )
+            rows = [dict(r) for r in cur.fetchall()]
+            conn.close()
+            return rows
+        except Exception as e:
+            self._report_error("searching invitees", e)
+            return []
+
+    # ---------------------------------------------------------------------
+    # MENU OPERATIONS
+    # ---------------------------------------------------------------------
+    def load_menu_data(
+        self,
+        df: "Union[pd.DataFrame, Iterable[pd.DataFrame]]",
+        report: Optional[ValidationReport] = None,
+    ) -> bool:
+        """Load menus from CSV (a DataFrame or an iterator of chunks), replacing all."""
+        report = report or ValidationReport("menus", MENU_SCHEMA.name)
+        return self._load_rows("loading menu data", [LoadBatch("menus", "", df, report)])
+
+    def update_menu_items(self, date: str, meal: str, menu_items: str) -> None:
+        """Replace the raw menu text for a date+meal."""
+        try:
+            conn = self.get_connection()
+            cur = conn.cursor()
+            cur.execute(
+                """
+                UPDATE menus
+                SET menu_items = ?, version = version + 1
+                WHERE date = ? AND meal = ?
+                """,
+                (menu_items, date, meal),
+            )
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            self._report_error("updating menu", e)
+
+    def get_menu(self, date: str, meal: str) -> Optional[Dict]:
+        """Get menu row for a date+meal."""
+        try:
+            conn = self.get_connection()
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT * FROM menus
+                WHERE date = ? AND meal = ?
+                """,
+                (date, meal),
+            )
+            row = cur.fetchone()
+            conn.close()
+            return dict(row) if row else None
+        except Exception as e:
+            self._report_error("getting menu", e)
+            return None
+
+    def get_all_dates(self) -> List[str]:
+        """Return all distinct menu dates."""
+        try:
+            conn = self.get_connection()
+            cur = conn.cursor()
+            cur.execute("SELECT DISTINCT date FROM menus ORDER BY date")
+            dates = [r[0] for r in cur.fetchall()]
+            conn.close()
+            return dates
+        except Exception as e:
+            self._report_error("getting dates", e)
+            return []
+
+    def get_meals_for_date(self, date: str) -> List[str]:
+        """Return meal types available on a date."""
+        try:
+            conn = self.get_connection()
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT DISTINCT meal FROM menus
+                WHERE date = ?
+                ORDER BY meal
+                """,
+                (date,),
+            )
+            meals = [r[0] for r in cur.fetchall()]
+            conn.close()
+            return meals
+        except Exception as e:
+            self._report_error("getting meals", e)
+            return []
+
+    def get_menus(self) -> List[Dict]:
+        """Get every menu row, by date and meal."""
+        try:
+            conn = self.get_connection()
+            cur = conn.cursor()
+            cur.execute("SELECT * FROM menus ORDER BY date, meal")
+            rows = [dict(r) for r in cur.fetchall()]
+            conn.close()
+            return rows
+        except Exception as e:
+            self._report_error("getting menus", e)
+            return []
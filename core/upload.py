@@ -0,0 +1,206 @@
+"""
+CSV upload for Tabu weds Mousumi application
+
+Replaces a list from an uploaded CSV in two steps, so the database is only
+locked while rows are written, never while a file is parsed:
+
+1. preview(db, kind, list_name, file) parses and validates the upload and
+   compares it with the list as stored: rows added, removed and changed.
+2. start_upload(db, preview) writes the validated rows on a background
+   thread, in one transaction (the list is replaced whole or not at all).
+   The returned UploadJob reports progress; the UI polls it, so neither
+   this session nor any other waits on the write.
+
+Like the CSV import, replacing a list resets what was tracked for it
+(deliveries, transport).
+"""
+
+import threading
+import time
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, List, NamedTuple, Optional, Tuple
+
+from config import INGEST_CHUNK_ROWS
+from core.ingest import read_csv_chunks
+from core.log import get_logger, log_operation
+from core.storage import LoadBatch
+from core.validation import SCHEMAS, ValidationReport, records, validate
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from core.storage import WeddingDatabase
+
+logger = get_logger("upload")
+
+# kind -> (database key columns, {database column: CSV column})
+_DIFF_COLUMNS: Dict[str, Tuple[Tuple[str, ...], Dict[str, str]]] = {
+    "ingredients": (
+        ("item_name",),
+        {"item_name": "Item Name", "quantity": "Quantity", "unit": "Unit"},
+    ),
+    "invitees": (
+        ("name",),
+        {"name": "Name", "lunch": "Lunch", "to_sakti": "To SAKTI", "travel_by": "Travel By"},
+    ),
+    "menus": (
+        ("date", "meal"),
+        {"date": "Date", "meal": "Meal", "headcount": "Headcount", "menu_items": "Menu Items"},
+    ),
+}
+
+
+class RowChange(NamedTuple):
+    key: str  # e.g. "Rice" or "03/12/25 / Lunch"
+    change: str  # "added", "removed" or "changed"
+    fields: Dict[str, Tuple[Any, Any]]  # column -> (stored, uploaded); changed rows only
+
+
+class UploadPreview(NamedTuple):
+    kind: str
+    list_name: str
+    frame: "pd.DataFrame"  # validated rows, as they will be written
+    report: ValidationReport
+    changes: List[RowChange]
+    unchanged: int
+
+    @property
+    def can_load(self) -> bool:
+        """False if a required column is missing (nothing would be loaded)."""
+        return not self.report.missing_columns
+
+    def counts(self) -> Dict[str, int]:
+        counts = {"added": 0, "removed": 0, "changed": 0}
+        for change in self.changes:
+            counts[change.change] += 1
+        counts["unchanged"] = self.unchanged
+        return counts
+
+
+def _stored_rows(db: "WeddingDatabase", kind: str, list_name: str) -> List[Dict]:
+    if kind == "ingredients":
+        return db.get_ingredients(list_name)
+    if kind == "invitees":
+        return db.get_invitees(list_name)
+    return db.get_menus()
+
+
+def diff(
+    kind: str, stored: List[Dict], frame: "pd.DataFrame"
+) -> Tuple[List[RowChange], int]:
+    """(changes, unchanged row count) going from `stored` rows to `frame`."""
+    key_columns, columns = _DIFF_COLUMNS[kind]
+    names = list(columns)
+    before = {
+        tuple(row[k] for k in key_columns): {c: row[c] for c in names} for row in stored
+    }
+    changes: List[RowChange] = []
+    unchanged = 0
+    seen = set()
+    for values in records(frame, list(columns.values())):
+        row = dict(zip(names, values))
+        key = tuple(row[k] for k in key_columns)
+        seen.add(key)
+        label = " / ".join(str(k) for k in key)
+        old = before.get(key)
+        if old is None:
+            changes.append(RowChange(label, "added", {}))
+            continue
+        fields = {c: (old[c], row[c]) for c in names if old[c] != row[c]}
+        if fields:
+            changes.append(RowChange(label, "changed", fields))
+        else:
+            unchanged += 1
+    for key in before:
+        if key not in seen:
+            changes.append(RowChange(" / ".join(str(k) for k in key), "removed", {}))
+    return changes, unchanged
+
+
+def preview(
+    db: "WeddingDatabase",
+    kind: str,
+    list_name: str,
+    file: BinaryIO,
+    source: str = "",
+    chunksize: int = INGEST_CHUNK_ROWS,
+) -> UploadPreview:
+    """Validate an uploaded CSV for `list_name` and diff it against the database."""
+    import pandas as pd
+
+    schema = SCHEMAS[kind]
+    report = ValidationReport(source or getattr(file, "name", ""), schema.name)
+    frames = [validate(chunk, schema, report) for chunk in read_csv_chunks(file, chunksize)]
+    frame = pd.concat(frames) if len(frames) > 1 else frames[0] if frames else None
+    if frame is None:
+        frame = pd.DataFrame(columns=[c.name for c in schema.columns])
+    changes, unchanged = diff(kind, _stored_rows(db, kind, list_name), frame)
+    return UploadPreview(kind, list_name, frame, report, changes, unchanged)
+
+
+class UploadJob:
+    """One background list replacement; read its fields from any thread."""
+
+    def __init__(self, preview: UploadPreview) -> None:
+        self.kind = preview.kind
+        self.list_name = preview.list_name
+        self.rows = len(preview.frame)
+        self.rows_written = 0
+        self.state = "running"  # then "done" or "failed"
+        self.error: Optional[Exception] = None
+        self.started = time.time()
+        self.finished: Optional[float] = None
+        self._preview: Optional[UploadPreview] = preview
+
+    @property
+    def done(self) -> bool:
+        return self.state != "running"
+
+    @property
+    def progress(self) -> float:
+        """Fraction of rows written (1.0 once finished)."""
+        if self.done:
+            return 1.0
+        return self.rows_written / self.rows if self.rows else 0.0
+
+    def _chunks(self, chunksize: int):
+        frame = self._preview.frame
+        for start in range(0, len(frame), chunksize):
+            chunk = frame.iloc[start:start + chunksize]
+            yield chunk
+            self.rows_written += len(chunk)
+
+    def run(self, db: "WeddingDatabase", chunksize: int = INGEST_CHUNK_ROWS) -> None:
+        start = time.perf_counter()
+        batch = LoadBatch(
+            self.kind,
+            self.list_name,
+            self._chunks(chunksize),
+            self._preview.report,
+            validated=True,
+        )
+        try:
+            if not db.load_batches([batch]):
+                self.error = db.pop_last_error() or RuntimeError(
+                    f"could not replace {self.list_name}"
+                )
+        except Exception as e:
+            self.error = e
+        self.state = "failed" if self.error else "done"
+        self.finished = time.time()
+        self._preview = None  # release the frame
+        log_operation(
+            logger,
+            "upload_csv",
+            (time.perf_counter() - start) * 1000.0,
+            self.error,
+            f"uploading {self.list_name}",
+        )
+
+
+def start_upload(db: "WeddingDatabase", preview: UploadPreview) -> UploadJob:
+    """Write a previewed upload on a daemon thread; returns its job."""
+    job = UploadJob(preview)
+    threading.Thread(
+        target=job.run, args=(db,), name=f"upload-{preview.list_name}", daemon=True
+    ).start()
+    return job
@@ -0,0 +1,358 @@
+"""
+CSV validation for Tabu weds Mousumi application
+
+Schemas for the three source CSV kinds, following
+md_files/CSV_SPECIFICATIONS.md. validate() normalizes a frame's headers
+("Sl No." -> "Index", "Travel By " -> "Travel By"), checks whole columns
+at once and returns only the rows that pass, typed and trimmed. Every
+rejected row is recorded in a ValidationReport with its reason, so a file
+can be checked (validate_file) or loaded (WeddingDatabase.load_*) with a
+report of what was left out and why.
+
+pandas is imported by the functions that need it, never at module import.
+"""
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from config import INGEST_CHUNK_ROWS, INGREDIENT_LISTS, INVITEE_LISTS
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Rejected rows kept per report with their values; the rest are only counted
+MAX_REJECTED_ROWS = 500
+
+
+class Column(NamedTuple):
+    """One CSV column: canonical name, type and accepted header spellings."""
+
+    name: str
+    kind: str  # "text", "number" or "integer"; numbers must be finite
+    required: bool = True
+    aliases: Tuple[str, ...] = ()
+
+
+class Schema(NamedTuple):
+    """
+    name    - schema name shown in reports
+    columns - expected columns; required ones must exist and be non-empty
+    key     - columns that identify a row; later duplicates are rejected
+    checks  - (reason, fn) pairs; fn(frame) returns a mask of rows to reject
+    """
+
+    name: str
+    columns: Tuple[Column, ...]
+    key: Tuple[str, ...]
+    checks: Tuple[Tuple[str, Callable[["pd.DataFrame"], "pd.Series"]], ...] = ()
+
+
+class RejectedRow(NamedTuple):
+    row: int  # 1-based data row (CSV line minus the header)
+    reason: str
+    values: Dict[str, Any]
+
+
+class ValidationReport:
+    """Outcome of validating one source, accumulated over its chunks."""
+
+    def __init__(self, source: str = "", schema: str = "") -> None:
+        self.source = source
+        self.schema = schema
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget everything but source and schema (e.g. before a retry)."""
+        self.rows_in = 0
+        self.rows_ok = 0
+        self.renamed: Dict[str, str] = {}
+        self.missing_columns: List[str] = []
+        self.unknown_columns: List[str] = []
+        self.reasons: Dict[str, int] = {}
+        self.rejected: List[RejectedRow] = []
+        self._seen_keys: Set[Tuple] = set()
+
+    @property
+    def rows_rejected(self) -> int:
+        return self.rows_in - self.rows_ok
+
+    @property
+    def ok(self) -> bool:
+        """True if no required column is missing and no row was rejected."""
+        return not self.missing_columns and not self.rows_rejected
+
+    def reject(self, rows: "pd.DataFrame", reason: str) -> None:
+        self.reasons[reason] = self.reasons.get(reason, 0) + len(rows)
+        room = MAX_REJECTED_ROWS - len(self.rejected)
+        for index, values in rows.head(max(room, 0)).iterrows():
+            self.rejected.append(
+                RejectedRow(
+                    int(index) + 1,
+                    reason,
+                    {k: (None if _isna(v) else v) for k, v in values.items()},
+                )
+            )
+
+    def summary(self) -> str:
+        """One line, e.g. 'Local-List.csv: 41 of 43 rows ok; 2 duplicate key'."""
+        text = f"{self.source or self.schema}: {self.rows_ok} of {self.rows_in} rows ok"
+        if self.missing_columns:
+            text += f"; missing columns {', '.join(self.missing_columns)}"
+        if self.reasons:
+            text += "; " + ", ".join(f"{n} {reason}" for reason, n in self.reasons.items())
+        return text
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "source": self.source,
+            "schema": self.schema,
+            "rows_in": self.rows_in,
+            "rows_ok": self.rows_ok,
+            "rows_rejected": self.rows_rejected,
+            "renamed": self.renamed,
+            "missing_columns": self.missing_columns,
+            "unknown_columns": self.unknown_columns,
+            "reasons": self.reasons,
+            "rejected": [r._asdict() for r in self.rejected],
+        }
+
+
+def _isna(value: Any) -> bool:
+    import pandas as pd
+
+    return not isinstance(value, (list, dict)) and bool(pd.isna(value))
+
+
+# ---------------------------------------------------------------------
+# Schemas
+# ---------------------------------------------------------------------
+def _summary_row(df: "pd.DataFrame") -> "pd.Series":
+    """Invitee header/summary rows such as 'Index' or '117 Total'."""
+    name = df["Name"].str.lower()
+    return name.str.startswith("index") | name.str.endswith("total")
+
+
+def _below(column: str, minimum: float, inclusive: bool = False):
+    """Check rejecting values of `column` under `minimum` (or equal to it)."""
+
+    def check(df: "pd.DataFrame") -> "pd.Series":
+        values = df[column].astype("Float64")
+        return values <= minimum if inclusive else values < minimum
+
+    return check
+
+
+def _not_in(column: str, allowed: Tuple[str, ...]):
+    """Check rejecting values of `column` outside `allowed`."""
+
+    def check(df: "pd.DataFrame") -> "pd.Series":
+        return df[column].notna() & ~df[column].isin(allowed)
+
+    return check
+
+
+MEALS = ("Breakfast", "Lunch", "Dinner")
+
+
+INGREDIENT_SCHEMA = Schema(
+    "ingredients",
+    (
+        Column("Index", "integer", required=False, aliases=("Sl No.", "Sl No", "S.No.")),
+        Column("Item Name", "text", aliases=("Item", "Items")),
+        Column("Quantity", "number", aliases=("Qty",)),
+        Column("Unit", "text", aliases=("Units",)),
+    ),
+    key=("Item Name",),
+    checks=(("Quantity not positive", _below("Quantity", 0, inclusive=True)),),
+)
+
+INVITEE_SCHEMA = Schema(
+    "invitees",
+    (
+        Column("Index", "integer", required=False, aliases=("Sl No.", "Sl No", "S.No.")),
+        Column("Name", "text"),
+        Column("Lunch", "integer"),
+        Column("To SAKTI", "integer", required=False, aliases=("To Sakti",)),
+        Column("Travel By", "text", required=False),
+    ),
+    key=("Name",),
+    checks=(
+        ("summary row", _summary_row),
+        ("Lunch below 1", _below("Lunch", 1)),
+        ("negative To SAKTI", _below("To SAKTI", 0)),
+    ),
+)
+
+MENU_SCHEMA = Schema(
+    "menus",
+    (
+        Column("Date", "text"),
+        Column("Meal", "text"),
+        Column("Headcount", "integer"),
+        Column("Menu Items", "text", aliases=("Menu",)),
+    ),
+    key=("Date", "Meal"),
+    checks=(
+        ("unknown Meal", _not_in("Meal", MEALS)),
+        ("Headcount below 1", _below("Headcount", 1)),
+    ),
+)
+
+
+SCHEMAS = {s.name: s for s in (INGREDIENT_SCHEMA, INVITEE_SCHEMA, MENU_SCHEMA)}
+
+
+def schema_for(list_name: str) -> Schema:
+    """Schema of a configured list name ("menus" for the menu CSV)."""
+    if list_name in INGREDIENT_LISTS:
+        return INGREDIENT_SCHEMA
+    if list_name in INVITEE_LISTS:
+        return INVITEE_SCHEMA
+    if list_name in ("menus", "Menus-List"):
+        return MENU_SCHEMA
+    raise KeyError(f"no schema for {list_name!r}")
+
+
+# ---------------------------------------------------------------------
+# Validation
+# ---------------------------------------------------------------------
+def _header_key(header: str) -> str:
+    return " ".join(str(header).split()).lower()
+
+
+def normalize_headers(df: "pd.DataFrame", schema: Schema) -> Tuple["pd.DataFrame", Dict[str, str]]:
+    """
+    Rename headers to the schema's canonical names, ignoring case and
+    stray whitespace and accepting aliases. Returns (frame, {old: new})
+    for the headers that changed.
+    """
+    exact = {_header_key(c.name): c.name for c in schema.columns}
+    alias = {_header_key(a): c.name for c in schema.columns for a in c.aliases}
+    renamed = {}
+    claimed = set()
+    taken = set()
+    # Canonical spellings first, so 'Index' beats 'Sl No.' if a file has both
+    for lookup in (exact, alias):
+        for header in df.columns:
+            canonical = lookup.get(_header_key(header))
+            if canonical is None or canonical in taken or header in claimed:
+                continue
+            claimed.add(header)
+            taken.add(canonical)
+            if header != canonical:
+                renamed[header] = canonical
+    return df.rename(columns=renamed), renamed
+
+
+def validate(
+    df: "pd.DataFrame", schema: Schema, report: Optional[ValidationReport] = None
+) -> "pd.DataFrame":
+    """
+    Rows of `df` that pass `schema`, with canonical headers, trimmed text
+    and numeric columns converted. Optional columns that are absent are
+    added as empty. Rejections are recorded in `report`, which may be
+    shared by the chunks of one file (duplicates are found across chunks).
+    """
+    import numpy as np
+    import pandas as pd
+
+    if report is None:
+        report = ValidationReport(schema=schema.name)
+    df, renamed = normalize_headers(df, schema)
+    report.renamed.update(renamed)
+    names = [c.name for c in schema.columns]
+    for header in df.columns:
+        if header not in names and str(header) not in report.unknown_columns:
+            report.unknown_columns.append(str(header))
+
+    report.rows_in += len(df)
+    missing = [c.name for c in schema.columns if c.required and c.name not in df.columns]
+    if missing:
+        for name in missing:
+            if name not in report.missing_columns:
+                report.missing_columns.append(name)
+        report.reasons["missing column"] = report.reasons.get("missing column", 0) + len(df)
+        return pd.DataFrame(columns=names)
+
+    # Trimmed text of non-numeric columns, and which cells are empty
+    text = {}
+    empty = pd.DataFrame(index=df.index)
+    for header in df.columns:
+        values = df[header]
+        if pd.api.types.is_numeric_dtype(values):
+            empty[header] = values.isna()
+        else:
+            text[header] = values.astype("string").str.strip()
+            empty[header] = text[header].isna() | (text[header] == "")
+    clean = pd.DataFrame(index=df.index)
+    # (reason, mask) in the order rows are checked; a row's first failure wins
+    failures: List[Tuple[str, "pd.Series"]] = [("blank row", empty.all(axis=1))]
+    for column in schema.columns:
+        if column.name not in df.columns:
+            clean[column.name] = pd.Series(pd.NA, index=df.index, dtype="object")
+            continue
+        absent = empty[column.name]
+        if column.required:
+            failures.append((f"missing {column.name}", absent))
+        values = text.get(column.name)
+        if column.kind == "text":
+            if values is None:
+                values = df[column.name].astype("string")
+            clean[column.name] = values
+            continue
+        if values is None:
+            number = df[column.name].astype("float64")
+        else:
+            number = pd.to_numeric(values, errors="coerce").astype("float64")
+        failures.append((f"non-numeric {column.name}", ~absent & number.isna()))
+        infinite = np.isinf(number)
+        failures.append((f"infinite {column.name}", infinite))
+        number = number.mask(infinite)
+        if column.kind == "integer":
+            fractional = number.notna() & (number != np.trunc(number))
+            failures.append((f"non-integer {column.name}", fractional))
+            number = number.mask(fractional).astype("Int64")
+        clean[column.name] = number
+    for reason, check in schema.checks:
+        failures.append((reason, check(clean).fillna(False).astype(bool)))
+
+    bad = pd.Series(False, index=df.index)
+    for reason, mask in failures:
+        mask = mask.fillna(False).astype(bool) & ~bad
+        if mask.any():
+            report.reject(df[mask], reason)
+            bad |= mask
+
+    # Duplicate keys, within this chunk and against the chunks before it
+    seen = report._seen_keys
+    keys = pd.Series(list(zip(*(clean.loc[~bad, k] for k in schema.key))), index=clean.index[~bad])
+    duplicate = keys.duplicated() | pd.Series([k in seen for k in keys], index=keys.index, dtype=bool)
+    seen.update(keys[~duplicate])
+    if duplicate.any():
+        report.reject(df.loc[duplicate.index[duplicate]], "duplicate " + "/".join(schema.key))
+        bad[duplicate.index[duplicate]] = True
+
+    report.rejected.sort(key=lambda r: r.row)
+    clean = clean[~bad]
+    report.rows_ok += len(clean)
+    return clean
+
+
+def records(clean: "pd.DataFrame", columns: List[str]) -> List[Tuple]:
+    """Rows of a validated frame as tuples of plain Python values (NA -> None)."""
+    frame = clean[columns].astype(object)
+    return list(frame.where(frame.notna(), None).itertuples(index=False, name=None))
+
+
+def validate_file(
+    path: Path, schema: Optional[Schema] = None, chunksize: int = INGEST_CHUNK_ROWS
+) -> ValidationReport:
+    """Validate a CSV in one streaming pass without loading it."""
+    from core.ingest import read_csv_chunks
+
+    path = Path(path)
+    schema = schema or schema_for(path.stem)
+    report = ValidationReport(path.name, schema.name)
+    for chunk in read_csv_chunks(path, chunksize):
+        validate(chunk, schema, report)
+    return report
@@ -0,0 +1,246 @@
+"""
+Data file watcher for Tabu weds Mousumi application
+
+Watches data/ingredients, data/invitees and data/menus and re-ingests a
+configured CSV when it changes, without a restart and without touching
+the other lists:
+
+- change detection: inotify (through watchdog, if installed) or else a
+  stat() poll every DATA_WATCH_POLL_SECONDS
+- a changed file is reloaded once it has been left alone for
+  DATA_WATCH_SETTLE_SECONDS (spreadsheet exports write in several steps)
+  and only if its contents really changed
+- the reload goes through core.ingest, which also replaces the file's
+  entry in the pre-parsed CSV cache; if the working database was in step
+  with data/ (core.prebuilt), its fingerprint is updated, so the next
+  start does not load everything again
+
+Parsed menus are cached by menu text, so they need no invalidation.
+
+Example:
+    watcher = DataWatcher(db).start()
+    ...
+    watcher.stop()
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from config import DATA_WATCH_POLL_SECONDS, DATA_WATCH_SETTLE_SECONDS
+from core import csvcache, ingest, prebuilt
+from core.log import get_logger, log_operation
+from core.validation import SCHEMAS
+
+if TYPE_CHECKING:
+    from core.storage import WeddingDatabase
+
+logger = get_logger("watcher")
+
+# (mtime in ns, size) of a file, or None if it does not exist
+Stat = Optional[Tuple[int, int]]
+
+
+def _stat(path: Path) -> Stat:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class DataWatcher:
+    """Re-ingests configured CSVs as they change; start() runs it in the background."""
+
+    def __init__(
+        self,
+        db: "WeddingDatabase",
+        sources: Optional[List[ingest.Source]] = None,
+        poll_interval: float = DATA_WATCH_POLL_SECONDS,
+        settle: float = DATA_WATCH_SETTLE_SECONDS,
+        use_inotify: bool = True,
+        on_reload: Optional[Callable[[str, bool], None]] = None,
+    ) -> None:
+        self.db = db
+        sources = ingest.configured_sources(existing_only=False) if sources is None else sources
+        resolved = [s._replace(path=s.path.resolve()) for s in sources]
+        self.sources = {s.path: s for s in resolved}
+        self.poll_interval = poll_interval
+        self.settle = settle
+        self.use_inotify = use_inotify
+        self.on_reload = on_reload
+        self.backend = "stopped"
+        self.reloads = 0
+        self.failures = 0
+        self.last_reload: Optional[Tuple[float, str, bool]] = None
+        self._lock = threading.Lock()
+        self._dirty: Dict[Path, float] = {}  # path -> time of the last change seen
+        self._stats: Dict[Path, Stat] = {}
+        self._digests: Dict[Path, str] = {}  # contents the database holds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._observer: Any = None
+
+    # -----------------------------------------------------------------
+    # Change detection
+    # -----------------------------------------------------------------
+    def mark(self, path: Path) -> None:
+        """Note that `path` changed (ignored unless it is a watched CSV)."""
+        path = Path(path).resolve()
+        if path in self.sources:
+            with self._lock:
+                self._dirty[path] = time.monotonic()
+
+    def poll(self) -> None:
+        """Mark the watched files whose mtime or size changed since the last poll."""
+        for path in self.sources:
+            stat = _stat(path)
+            if stat != self._stats.get(path):
+                self._stats[path] = stat
+                self.mark(path)
+
+    def _start_inotify(self) -> bool:
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return False
+
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event) -> None:
+                # Reads (ours included) are not changes
+                if event.is_directory or event.event_type in ("opened", "closed_no_write"):
+                    return
+                watcher.mark(event.src_path)
+                if getattr(event, "dest_path", ""):
+                    watcher.mark(event.dest_path)  # exports that write a temp file, then rename
+
+        observer = Observer()
+        try:
+            for directory in {p.parent for p in self.sources}:
+                if directory.is_dir():
+                    observer.schedule(Handler(), str(directory), recursive=False)
+            observer.start()
+        except OSError as e:  # e.g. out of inotify watches
+            logger.warning("inotify unavailable, polling instead: %s", e)
+            return False
+        self._observer = observer
+        self.backend = type(observer).__name__
+        return True
+
+    # -----------------------------------------------------------------
+    # Reloading
+    # -----------------------------------------------------------------
+    def _fingerprint(self) -> str:
+        sources = [s for p, s in self.sources.items() if p in self._digests]
+        return prebuilt.source_fingerprint(sources, self._digests)
+
+    def reload(self, path: Path) -> Optional[bool]:
+        """
+        Re-ingest one watched file if its contents changed. Returns True
+        if it was reloaded, False if that failed, None if there was
+        nothing to do (unchanged, or deleted: its list is kept).
+        """
+        source = self.sources[Path(path).resolve()]
+        try:
+            digest = csvcache.source_digest(source.path, SCHEMAS[source.kind])
+        except OSError:
+            return None
+        if digest == self._digests.get(source.path):
+            return None
+
+        start = time.perf_counter()
+        in_step = (
+            prebuilt.read_build_info(Path(self.db.db_path)).get("fingerprint")
+            == self._fingerprint()
+        )
+        errors: List[Exception] = []
+        results = ingest.load_initial_data(
+            self.db, on_error=lambda p, e: errors.append(e), sources=[source]
+        )
+        ok = bool(results.get(source.list_name)) and not errors
+        if ok:
+            self._digests[source.path] = digest
+            self.reloads += 1
+            if in_step:
+                prebuilt.stamp(Path(self.db.db_path), self._fingerprint())
+            logger.info("reloaded %s from %s", source.list_name, source.path.name)
+        else:
+            self.failures += 1
+            log_operation(
+                logger,
+                "reload_csv",
+                (time.perf_counter() - start) * 1000.0,
+                errors[0] if errors else RuntimeError("load failed"),
+                f"reloading {source.list_name}",
+            )
+        self.last_reload = (time.time(), source.list_name, ok)
+        if self.on_reload:
+            self.on_reload(source.list_name, ok)
+        return ok
+
+    def process(self, now: Optional[float] = None) -> List[str]:
+        """Reload the changed files that have settled; returns their list names."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            ready = [p for p, t in self._dirty.items() if now - t >= self.settle]
+            for path in ready:
+                del self._dirty[path]
+        reloaded = []
+        for path in ready:
+            if self.reload(path):
+                reloaded.append(self.sources[path].list_name)
+        return reloaded
+
+    # -----------------------------------------------------------------
+    # Lifecycle
+    # -----------------------------------------------------------------
+    def start(self) -> "DataWatcher":
+        """
+        Take the current files as what the database holds and watch them
+        on a daemon thread.
+        """
+        for path in self.sources:
+            self._stats[path] = _stat(path)
+            if self._stats[path] is not None:
+                source = self.sources[path]
+                self._digests[path] = csvcache.source_digest(path, SCHEMAS[source.kind])
+        if not (self.use_inotify and self._start_inotify()):
+            self.backend = "polling"
+        self._thread = threading.Thread(target=self._run, name="data-watcher", daemon=True)
+        self._thread.start()
+        logger.info("watching %d data files (%s)", len(self.sources), self.backend)
+        return self
+
+    def _run(self) -> None:
+        tick = self.poll_interval if self._observer is None else min(self.settle, 0.5)
+        while not self._stop.wait(tick):
+            try:
+                if self._observer is None:
+                    self.poll()
+                self.process()
+            except Exception:
+                logger.exception("data watcher iteration failed")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self._thread is not None:
+            self._thread.join()
+        self.backend = "stopped"
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "files": len(self.sources),
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "pending": len(self._dirty),
+            "last_reload": self.last_reload,
+        }
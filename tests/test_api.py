@@ -0,0 +1,65 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from core import api
+from core.storage import WeddingDatabase
+
+LIST = "Invitee-List-Poite-03.12.25"
+
+
+@pytest.fixture
+def server(tmp_path):
+    db = WeddingDatabase(str(tmp_path / "api.db"))
+    db.add_invitee(LIST, "Roy family", 3)
+    db.add_ingredient("Local-List", "Rice", 10, "kg")
+    srv = api.make_server(db, "127.0.0.1", 0)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+def post(base, path, body):
+    request = urllib.request.Request(
+        base + path, json.dumps(body).encode(), {"Content-Type": "application/json"}
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def lunch(base, name="Roy family", **body):
+    return post(base, "/api/invitees/lunch", {"list": LIST, "name": name, **body})
+
+
+def test_lunch_delta(server):
+    assert lunch(server, delta=2) == (200, {"list": LIST, "name": "Roy family", "lunch": 5})
+
+
+@pytest.mark.parametrize("delta", [10**30, -(10**30), 1001, 1.7, True, "1"])
+def test_lunch_rejects_bad_delta(server, delta):
+    status, body = lunch(server, delta=delta)
+    assert status == 400
+    assert "delta" in body["error"]
+
+
+def test_lunch_floor_and_unknown_guest(server):
+    assert lunch(server, delta=-3)[0] == 409
+    assert lunch(server, name="Nobody")[0] == 404
+
+
+@pytest.mark.parametrize("quantity", ["nan", "inf", -1, True])
+def test_status_rejects_bad_quantity(server, quantity):
+    body = {
+        "list": "Local-List",
+        "item": "Rice",
+        "status": "Incomplete",
+        "delivered_quantity": quantity,
+    }
+    assert post(server, "/api/ingredients/status", body)[0] == 400
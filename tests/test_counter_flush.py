@@ -0,0 +1,87 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from config import DB_NAME
+from core.coalesce import PendingDeltas
+
+st = pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+APP = Path(__file__).resolve().parents[1] / "app.py"
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the app's database lives in the working directory
+    monkeypatch.setenv("WEDDING_PARSED_CACHE", "0")
+    st.cache_resource.clear()  # the database handle and setup are per process
+    st.cache_data.clear()
+    at = AppTest.from_file(str(APP), default_timeout=60).run()
+    assert not at.exception
+    return at
+
+
+def first_guest(list_name):
+    conn = sqlite3.connect(DB_NAME)
+    try:
+        return conn.execute(
+            "SELECT name, lunch FROM invitees WHERE list_name = ? ORDER BY name LIMIT 1",
+            (list_name,),
+        ).fetchone()
+    finally:
+        conn.close()
+
+
+def queue(at, key, delta):
+    pending = PendingDeltas()
+    pending.add(key, delta, now=0.0)  # long idle: due on the next run
+    at.session_state["pending_counter_deltas"] = pending
+
+
+def alerts(at):
+    return " ".join(m.value for m in at.markdown)
+
+
+def test_refused_flush_from_fragment_shows_error(app, monkeypatch):
+    reruns = []
+    rerun = st.rerun
+
+    def spy(*args, **kwargs):
+        reruns.append(kwargs.get("scope"))
+        rerun(*args, **kwargs)
+
+    monkeypatch.setattr(st, "rerun", spy)
+    list_name = app.session_state["invitee_list_selector"]
+    name, lunch = first_guest(list_name)
+    queue(app, (list_name, name, "lunch"), -lunch - 5)
+
+    app.run()
+
+    assert not app.exception
+    assert reruns == ["app"]  # so the error and the stored value are shown
+    assert "would go out of range" in alerts(app)
+    assert len(app.session_state["pending_counter_deltas"]) == 0
+    assert first_guest(list_name) == (name, lunch)
+
+
+def test_refused_flush_for_missing_guest(app):
+    list_name = app.session_state["invitee_list_selector"]
+    queue(app, (list_name, "No Such Guest", "lunch"), 1)
+
+    app.run()
+
+    assert "no longer on this list" in alerts(app)
+    assert len(app.session_state["pending_counter_deltas"]) == 0
+
+
+def test_applied_flush(app):
+    list_name = app.session_state["invitee_list_selector"]
+    name, lunch = first_guest(list_name)
+    queue(app, (list_name, name, "lunch"), 2)
+
+    app.run()
+
+    assert "Could not apply" not in alerts(app)
+    assert first_guest(list_name) == (name, lunch + 2)
@@ -0,0 +1,102 @@
+import pandas as pd
+import pytest
+
+from core.validation import (
+    INGREDIENT_SCHEMA,
+    INVITEE_SCHEMA,
+    MENU_SCHEMA,
+    ValidationReport,
+    validate,
+)
+
+
+def check(schema, rows):
+    report = ValidationReport(schema=schema.name)
+    clean = validate(pd.DataFrame(rows), schema, report)
+    return clean, report
+
+
+def invitee(lunch="2", to_sakti="1"):
+    return {
+        "Index": "1",
+        "Name": "Roy family",
+        "Lunch": lunch,
+        "To SAKTI": to_sakti,
+        "Travel By": "Bus",
+    }
+
+
+def menu(meal="Lunch", headcount="100"):
+    return {"Date": "03/12/25", "Meal": meal, "Headcount": headcount, "Menu Items": "Rice"}
+
+
+def ingredient(quantity="2.5"):
+    return {"Index": "1", "Item Name": "Rice", "Quantity": quantity, "Unit": "kg"}
+
+
+@pytest.mark.parametrize(
+    "row, reason",
+    [
+        (invitee(lunch="-3"), "Lunch below 1"),
+        (invitee(lunch="0"), "Lunch below 1"),
+        (invitee(lunch="2.7"), "non-integer Lunch"),
+        (invitee(lunch="inf"), "infinite Lunch"),
+        (invitee(to_sakti="-1"), "negative To SAKTI"),
+        (invitee(to_sakti="1.5"), "non-integer To SAKTI"),
+    ],
+)
+def test_invitee_rejections(row, reason):
+    clean, report = check(INVITEE_SCHEMA, [row])
+    assert clean.empty
+    assert report.reasons == {reason: 1}
+
+
+@pytest.mark.parametrize(
+    "row, reason",
+    [
+        (menu(headcount="-5"), "Headcount below 1"),
+        (menu(headcount="0"), "Headcount below 1"),
+        (menu(headcount="10.5"), "non-integer Headcount"),
+        (menu(meal="Brunch"), "unknown Meal"),
+    ],
+)
+def test_menu_rejections(row, reason):
+    clean, report = check(MENU_SCHEMA, [row])
+    assert clean.empty
+    assert report.reasons == {reason: 1}
+
+
+@pytest.mark.parametrize(
+    "quantity, reason",
+    [("0", "Quantity not positive"), ("-1", "Quantity not positive"),
+     ("inf", "infinite Quantity"), ("-inf", "infinite Quantity")],
+)
+def test_ingredient_rejections(quantity, reason):
+    clean, report = check(INGREDIENT_SCHEMA, [ingredient(quantity)])
+    assert clean.empty
+    assert report.reasons == {reason: 1}
+
+
+def test_valid_rows_pass_typed():
+    clean, report = check(INVITEE_SCHEMA, [invitee(lunch="3.0", to_sakti="0")])
+    assert report.ok
+    assert clean["Lunch"].tolist() == [3]
+    assert clean["To SAKTI"].tolist() == [0]
+
+    clean, report = check(INVITEE_SCHEMA, [invitee(to_sakti="")])
+    assert report.ok and clean["To SAKTI"].isna().all()
+
+    clean, report = check(MENU_SCHEMA, [menu(meal=m) for m in ("Breakfast", "Lunch", "Dinner")])
+    assert report.ok and clean["Meal"].tolist() == ["Breakfast", "Lunch", "Dinner"]
+
+    clean, report = check(INGREDIENT_SCHEMA, [ingredient("0.25")])
+    assert report.ok and clean["Quantity"].tolist() == [0.25]
+
+
+def test_numeric_frame_columns():
+    # Columns already parsed as numbers by read_csv take the same checks
+    frame = pd.DataFrame({"Name": ["A", "B", "C"], "Lunch": [2.0, 2.5, 0.0]})
+    report = ValidationReport(schema="invitees")
+    clean = validate(frame, INVITEE_SCHEMA, report)
+    assert clean["Name"].tolist() == ["A"]
+    assert report.reasons == {"non-integer Lunch": 1, "Lunch below 1": 1}
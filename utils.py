@@ -3,13 +3,15 @@ Utility functions for Tabu weds Mousumi application
 """
 
 import streamlit as st
-import pandas as pd
-from io import BytesIO
+from typing import TYPE_CHECKING
 from config import COLORS, CUSTOM_CSS
-from PIL import Image
 from pathlib import Path
+from functools import lru_cache
 import base64
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 def _img_to_base64(img_path: Path) -> str:
     with img_path.open("rb") as f:
         return base64.b64encode(f.read()).decode("utf-8")
@@ -101,8 +103,10 @@ def render_summary_card(title: str, value: str, icon: str = ""):
         </div>
         """, unsafe_allow_html=True)
 
-def create_dataframe_from_dict_list(data: list) -> pd.DataFrame:
+def create_dataframe_from_dict_list(data: list) -> "pd.DataFrame":
     """Convert list of dictionaries to DataFrame"""
+    import pandas as pd
+
     if not data:
         return pd.DataFrame()
     return pd.DataFrame(data)
@@ -143,20 +147,33 @@ def confirm_action(action_text: str) -> bool:
     
     return False
 
+@lru_cache(maxsize=256)
+def _metrics_panel_html(metrics: tuple, columns: int) -> str:
+    """Build the HTML fragment for a metrics panel (cached per metric values)"""
+    boxes = "".join(
+        f'<div class="metric-box">'
+        f'<div class="metric-box-label">{icon} {label}</div>'
+        f'<div class="metric-box-value">{value}</div>'
+        f'</div>'
+        for label, value, icon in metrics
+    )
+    return f'<div class="metrics-panel" style="--metric-columns: {columns};">{boxes}</div>'
+
+def render_metrics_panel(metrics: list, columns: int = 0):
+    """Render a whole row/grid of metric boxes as a single markdown element.
+
+    `metrics` is a list of (label, value) or (label, value, icon) tuples.
+    `columns` defaults to one column per metric.
+    """
+    normalized = tuple(
+        (str(m[0]), str(m[1]), m[2] if len(m) > 2 else "📊") for m in metrics
+    )
+    html = _metrics_panel_html(normalized, columns or len(normalized))
+    st.markdown(html, unsafe_allow_html=True)
+
 def render_metric_box(label: str, value: str, icon: str = "📊"):
     """Render metric box"""
-    st.markdown(f"""
-    <div style="background: linear-gradient(135deg, #fdf5e6 0%, #fff9f0 100%);
-                padding: 15px; border-radius: 10px; text-align: center;
-                border-left: 4px solid #d4af37;">
-        <div style="font-size: 0.85em; color: #2c3e50; font-weight: 600; margin-bottom: 5px;">
-            {icon} {label}
-        </div>
-        <div style="font-size: 1.8em; color: #c41e3a; font-weight: bold;">
-            {value}
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    render_metrics_panel([(label, value, icon)])
 
 def render_alert(message: str, alert_type: str = "info"):
     """Render custom alert"""
@@ -182,7 +199,7 @@ def render_alert(message: str, alert_type: str = "info"):
     </div>
     """, unsafe_allow_html=True)
 
-def get_csv_download_link(df: pd.DataFrame, filename: str) -> bytes:
+def get_csv_download_link(df: "pd.DataFrame", filename: str) -> bytes:
     """Generate CSV download link"""
     csv = df.to_csv(index=False)
     return csv.encode()
@@ -222,16 +239,7 @@ def render_empty_state(message: str, icon: str = "📭"):
 
 def render_statistics_row(stat1: tuple, stat2: tuple, stat3: tuple):
     """Render statistics in a row"""
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        render_metric_box(stat1[0], stat1[1], stat1[2] if len(stat1) > 2 else "📊")
-    
-    with col2:
-        render_metric_box(stat2[0], stat2[1], stat2[2] if len(stat2) > 2 else "📊")
-    
-    with col3:
-        render_metric_box(stat3[0], stat3[1], stat3[2] if len(stat3) > 2 else "📊")
+    render_metrics_panel([stat1, stat2, stat3])
 
 def validate_ingredient_input(name: str, quantity: str, unit: str) -> tuple:
     """Validate ingredient input - returns (is_valid, error_message)"""